@@ -2,6 +2,7 @@ import { useEffect, useMemo, useRef, useState } from "react";
 import { io } from "socket.io-client";
 import GameCanvas from "./GameCanvas.jsx";
 import Joystick from "./Joystick.jsx";
+import { decodeWorldFrame } from "./msgpack.js";
 
 const SERVER_URL = import.meta.env.VITE_SERVER_URL || "http://localhost:5000";
 
@@ -154,6 +155,17 @@ const roomToWorld = (room) => {
   };
 };
 
+// Trails arrive as flat { stride, size, data } runs of x, y, color.
+const unpackTrails = (packed) => {
+  if (!packed || Array.isArray(packed)) return packed || [];
+  const { stride = 3, size = 16, data = [] } = packed;
+  const trails = [];
+  for (let i = 0; i < data.length; i += stride) {
+    trails.push({ x: data[i], y: data[i + 1], size, color: data[i + 2] });
+  }
+  return trails;
+};
+
 const mergeWorldWithRoom = (prevWorld, room) => {
   if (!room) return prevWorld;
   const base = prevWorld || roomToWorld(room);
@@ -215,6 +227,12 @@ export default function App() {
     const socket = io(SERVER_URL, { transports: ["websocket", "polling"] });
     socketRef.current = socket;
 
+    const showAnnouncement = (payload) => {
+      const message = payload?.message;
+      if (!message) return;
+      setAnnouncement({ message, duration: payload?.duration || 3 });
+    };
+
     socket.on("connect", () => setConnected(true));
     socket.on("disconnect", () => setConnected(false));
     socket.on("server_error", (payload) => {
@@ -230,10 +248,19 @@ export default function App() {
       setRoom(payload.room);
       setWorld((prev) => mergeWorldWithRoom(prev, payload.room));
     });
-    socket.on("world_state", (payload) => {
+    socket.on("world_state", (data) => {
+      const payload = data instanceof ArrayBuffer ? decodeWorldFrame(data) : data;
+      if (payload.announcements) payload.announcements.forEach(showAnnouncement);
       setWorld((prev) => {
-        const nextWorld = payload.world;
-        if (!nextWorld) return prev;
+        const incoming = payload.world;
+        if (!incoming) return prev;
+        const nextWorld = {
+          ...incoming,
+          walls: incoming.walls || prev?.walls || [],
+          decorations: incoming.decorations || prev?.decorations || [],
+          trails: unpackTrails(incoming.trails),
+          trailUpdates: unpackTrails(incoming.trailUpdates),
+        };
         const thinIce = nextWorld.thinIce;
         if (thinIce && thinIce.brokenFull === false) {
           const broken = prev?.thinIce?.broken ? [...prev.thinIce.broken] : [];
@@ -263,11 +290,26 @@ export default function App() {
         if (nextWorld.trailsFull === false) {
           const merged = prev?.trails ? [...prev.trails] : [];
           const updates = nextWorld.trailUpdates || [];
-          if (updates.length) {
+          // Flat x, y pairs of tiles the server evicted; applied before updates.
+          const removals = nextWorld.trailRemovals || [];
+          if (updates.length || removals.length) {
             const index = new Map();
             merged.forEach((trail, idx) => {
               index.set(`${trail.x}|${trail.y}`, idx);
             });
+            for (let i = 0; i < removals.length; i += 2) {
+              const key = `${removals[i]}|${removals[i + 1]}`;
+              const existing = index.get(key);
+              if (existing === undefined) continue;
+              const lastIndex = merged.length - 1;
+              if (existing !== lastIndex) {
+                const lastTrail = merged[lastIndex];
+                merged[existing] = lastTrail;
+                index.set(`${lastTrail.x}|${lastTrail.y}`, existing);
+              }
+              merged.pop();
+              index.delete(key);
+            }
             updates.forEach((trail) => {
               const key = `${trail.x}|${trail.y}`;
               const existing = index.get(key);
@@ -312,11 +354,7 @@ export default function App() {
     socket.on("game_over", (payload) => {
       setRoom(payload.room);
     });
-    socket.on("announcement", (payload) => {
-      const message = payload?.message;
-      if (!message) return;
-      setAnnouncement({ message, duration: payload?.duration || 3 });
-    });
+    socket.on("announcement", showAnnouncement);
     socket.on("store_data", (payload) => {
       setStoreData(payload || null);
       setStoreError("");
@@ -105,6 +105,25 @@ const roomToWorld = (room) => {
   };
 };
 
+// Monsters arrive as flat { stride, data } runs of x, y, id, facing, type,
+// sprite.
+const unpackMonsters = (packed) => {
+  if (!packed || Array.isArray(packed)) return packed || [];
+  const { stride = 6, data = [] } = packed;
+  const monsters = [];
+  for (let i = 0; i < data.length; i += stride) {
+    monsters.push({
+      x: data[i],
+      y: data[i + 1],
+      id: data[i + 2],
+      facing: data[i + 3],
+      type: data[i + 4],
+      sprite: data[i + 5]
+    });
+  }
+  return monsters;
+};
+
 const getSeed = (value) => {
   if (!value) return 0;
   let hash = 0;
@@ -191,6 +210,7 @@ export default function GameCanvas({ world, room, youId, roundType }) {
     const canvas = canvasRef.current;
     const snapshot = world && world.players ? world : roomToWorld(room);
     if (!canvas || !snapshot) return;
+    const monsters = unpackMonsters(snapshot.monsters);
     const nowMs = performance.now();
     const isMobile = navigator.maxTouchPoints > 0 || window.innerWidth < 900;
     const minFrame = isMobile ? 33 : 0;
@@ -366,72 +386,83 @@ export default function GameCanvas({ world, room, youId, roundType }) {
       });
     }
 
-    if (snapshot.hazards) {
-      snapshot.hazards.forEach((hazard) => {
-        if (hazard.type === "big_snowball") {
-          const size = (hazard.radius || 20) * 2;
+    const hazardData = snapshot.hazards?.data;
+    if (hazardData) {
+      const stride = snapshot.hazards.stride || 4;
+      for (let i = 0; i < hazardData.length; i += stride) {
+        const x = hazardData[i];
+        const y = hazardData[i + 1];
+        const radius = hazardData[i + 2];
+        if (radius > 0) {
+          const size = radius * 2;
           if (images?.snowball?.complete) {
-            const spin = now * 3 + (hazard.id || 0) * 0.35;
+            const spin = now * 3 + (hazardData[i + 3] || 0) * 0.35;
             ctx.save();
-            ctx.translate(hazard.x, hazard.y);
+            ctx.translate(x, y);
             ctx.rotate(spin);
             ctx.drawImage(images.snowball, -size / 2, -size / 2, size, size);
             ctx.restore();
           } else {
             ctx.fillStyle = "#ffffff";
             ctx.beginPath();
-            ctx.arc(hazard.x, hazard.y, hazard.radius || 20, 0, Math.PI * 2);
+            ctx.arc(x, y, radius, 0, Math.PI * 2);
             ctx.fill();
           }
           ctx.strokeStyle = "#1a1a1a";
           ctx.lineWidth = 3;
           ctx.beginPath();
-          ctx.arc(hazard.x, hazard.y, (hazard.radius || 20) - 1, 0, Math.PI * 2);
+          ctx.arc(x, y, radius - 1, 0, Math.PI * 2);
           ctx.stroke();
           ctx.fillStyle = "#1a1a1a";
           ctx.beginPath();
-          ctx.arc(hazard.x - 6, hazard.y - 4, 2, 0, Math.PI * 2);
-          ctx.arc(hazard.x + 5, hazard.y + 3, 2, 0, Math.PI * 2);
+          ctx.arc(x - 6, y - 4, 2, 0, Math.PI * 2);
+          ctx.arc(x + 5, y + 3, 2, 0, Math.PI * 2);
           ctx.fill();
-          return;
+          continue;
         }
-        if (!drawImage(images?.snowflake, hazard.x, hazard.y, 28)) {
+        if (!drawImage(images?.snowflake, x, y, 28)) {
           ctx.fillStyle = "#7ec8ff";
           ctx.beginPath();
-          ctx.arc(hazard.x, hazard.y, 12, 0, Math.PI * 2);
+          ctx.arc(x, y, 12, 0, Math.PI * 2);
           ctx.fill();
         }
-      });
+      }
     }
 
-    if (snapshot.projectiles) {
-      snapshot.projectiles.forEach((projectile) => {
-        const stroke = COLOR_HEX[projectile.color] || "#2a1a12";
-        if (!drawImage(images?.snowball, projectile.x, projectile.y, 18)) {
+    const projectileData = snapshot.projectiles?.data;
+    if (projectileData) {
+      const stride = snapshot.projectiles.stride || 3;
+      for (let i = 0; i < projectileData.length; i += stride) {
+        const x = projectileData[i];
+        const y = projectileData[i + 1];
+        const stroke = COLOR_HEX[projectileData[i + 2]] || "#2a1a12";
+        if (!drawImage(images?.snowball, x, y, 18)) {
           ctx.fillStyle = "#ffffff";
           ctx.beginPath();
-          ctx.arc(projectile.x, projectile.y, 6, 0, Math.PI * 2);
+          ctx.arc(x, y, 6, 0, Math.PI * 2);
           ctx.fill();
         }
         ctx.strokeStyle = stroke;
         ctx.lineWidth = 2;
         ctx.beginPath();
-        ctx.arc(projectile.x, projectile.y, 8, 0, Math.PI * 2);
+        ctx.arc(x, y, 8, 0, Math.PI * 2);
         ctx.stroke();
-      });
+      }
     }
 
-    if (snapshot.monsterProjectiles) {
-      snapshot.monsterProjectiles.forEach((projectile) => {
-        ctx.fillStyle = "#ff7043";
+    const monsterProjectileData = snapshot.monsterProjectiles?.data;
+    if (monsterProjectileData) {
+      const stride = snapshot.monsterProjectiles.stride || 2;
+      ctx.fillStyle = "#ff7043";
+      for (let i = 0; i < monsterProjectileData.length; i += stride) {
         ctx.beginPath();
-        ctx.arc(projectile.x, projectile.y, 7, 0, Math.PI * 2);
+        ctx.arc(monsterProjectileData[i], monsterProjectileData[i + 1], 7, 0, Math.PI * 2);
         ctx.fill();
-      });
+      }
     }
 
-    if (snapshot.monsters) {
-      snapshot.monsters.forEach((monster) => {
+    if (monsters.length) {
+      monsters.forEach((monster) => {
         const style = MONSTER_STYLE[monster.type] || MONSTER_STYLE.small;
         const spriteName = monster.sprite || monster.type;
         const img = images?.monsters?.[spriteName];
@@ -439,12 +470,7 @@ export default function GameCanvas({ world, room, youId, roundType }) {
         const size = isBoss ? 96 : 60;
         const bob = Math.sin(now * 2.2 + monster.id) * 2.5;
         const wobble = Math.sin(now * 3.1 + monster.id) * 0.04;
-        const facing = Number.isFinite(monster.vx)
-          ? monster.vx
-          : Number.isFinite(monster.dirX)
-          ? monster.dirX
-          : 1;
-        const flip = facing < -0.05 ? -1 : 1;
+        const flip = monster.facing < -0.05 ? -1 : 1;
         if (img && img.complete) {
           ctx.save();
           ctx.translate(monster.x, monster.y + bob);
@@ -471,14 +497,17 @@ export default function GameCanvas({ world, room, youId, roundType }) {
     }
 
     if (snapshot.decorations) {
+      // Ice trees arrive in track coordinates; iceScroll is 0 in other rounds.
+      const scroll = snapshot.iceScroll || 0;
       snapshot.decorations.forEach((deco) => {
         if (deco.type !== "tree") return;
         const sway = Math.sin(now * 1.4 + deco.id) * 2;
         const size = TREE_DRAW[deco.size] || TREE_DRAW.medium;
-        if (!drawImage(images?.tree, deco.x, deco.y + sway, size)) {
+        const y = deco.y - scroll;
+        if (!drawImage(images?.tree, deco.x, y + sway, size)) {
           ctx.fillStyle = "#2e7d32";
           const half = size * 0.25;
-          ctx.fillRect(deco.x - half, deco.y - half - 8 + sway, half * 2, half * 2);
+          ctx.fillRect(deco.x - half, y - half - 8 + sway, half * 2, half * 2);
         }
       });
     }
@@ -619,9 +648,9 @@ export default function GameCanvas({ world, room, youId, roundType }) {
       const toMapX = (x) => mapX + (x / worldWidth) * mapWidth;
       const toMapY = (y) => mapY + (y / worldHeight) * mapHeight;
 
-      if (snapshot.monsters) {
+      if (monsters.length) {
         ctx.fillStyle = "rgba(255, 107, 107, 0.8)";
-        snapshot.monsters.forEach((monster) => {
+        monsters.forEach((monster) => {
           ctx.beginPath();
           ctx.arc(toMapX(monster.x), toMapY(monster.y), 2.5, 0, Math.PI * 2);
           ctx.fill();
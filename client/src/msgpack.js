@@ -0,0 +1,138 @@
+// Decoders for binary world_state frames. The server sends MessagePack when
+// it has msgpack installed and pre-encoded orjson bytes otherwise. The
+// MessagePack decoder covers the types msgpack.packb produces (no ext types).
+const textDecoder = new TextDecoder();
+
+export function decodeMsgpack(buffer) {
+  const bytes = buffer instanceof Uint8Array ? buffer : new Uint8Array(buffer);
+  const view = new DataView(bytes.buffer, bytes.byteOffset, bytes.byteLength);
+  let offset = 0;
+
+  const readStr = (length) => {
+    const value = textDecoder.decode(bytes.subarray(offset, offset + length));
+    offset += length;
+    return value;
+  };
+  const readArray = (length) => {
+    const out = new Array(length);
+    for (let i = 0; i < length; i += 1) out[i] = read();
+    return out;
+  };
+  const readMap = (length) => {
+    const out = {};
+    for (let i = 0; i < length; i += 1) {
+      const key = read();
+      out[key] = read();
+    }
+    return out;
+  };
+  const readBin = (length) => {
+    const value = bytes.slice(offset, offset + length);
+    offset += length;
+    return value;
+  };
+
+  function read() {
+    const type = bytes[offset];
+    offset += 1;
+    if (type <= 0x7f) return type;
+    if (type <= 0x8f) return readMap(type & 0x0f);
+    if (type <= 0x9f) return readArray(type & 0x0f);
+    if (type <= 0xbf) return readStr(type & 0x1f);
+    if (type >= 0xe0) return type - 0x100;
+    let value;
+    switch (type) {
+      case 0xc0:
+        return null;
+      case 0xc2:
+        return false;
+      case 0xc3:
+        return true;
+      case 0xc4:
+        return readBin(bytes[offset++]);
+      case 0xc5:
+        value = view.getUint16(offset);
+        offset += 2;
+        return readBin(value);
+      case 0xc6:
+        value = view.getUint32(offset);
+        offset += 4;
+        return readBin(value);
+      case 0xca:
+        value = view.getFloat32(offset);
+        offset += 4;
+        return value;
+      case 0xcb:
+        value = view.getFloat64(offset);
+        offset += 8;
+        return value;
+      case 0xcc:
+        return bytes[offset++];
+      case 0xcd:
+        value = view.getUint16(offset);
+        offset += 2;
+        return value;
+      case 0xce:
+        value = view.getUint32(offset);
+        offset += 4;
+        return value;
+      case 0xcf:
+        value = Number(view.getBigUint64(offset));
+        offset += 8;
+        return value;
+      case 0xd0:
+        value = view.getInt8(offset);
+        offset += 1;
+        return value;
+      case 0xd1:
+        value = view.getInt16(offset);
+        offset += 2;
+        return value;
+      case 0xd2:
+        value = view.getInt32(offset);
+        offset += 4;
+        return value;
+      case 0xd3:
+        value = Number(view.getBigInt64(offset));
+        offset += 8;
+        return value;
+      case 0xd9:
+        return readStr(bytes[offset++]);
+      case 0xda:
+        value = view.getUint16(offset);
+        offset += 2;
+        return readStr(value);
+      case 0xdb:
+        value = view.getUint32(offset);
+        offset += 4;
+        return readStr(value);
+      case 0xdc:
+        value = view.getUint16(offset);
+        offset += 2;
+        return readArray(value);
+      case 0xdd:
+        value = view.getUint32(offset);
+        offset += 4;
+        return readArray(value);
+      case 0xde:
+        value = view.getUint16(offset);
+        offset += 2;
+        return readMap(value);
+      case 0xdf:
+        value = view.getUint32(offset);
+        offset += 4;
+        return readMap(value);
+      default:
+        throw new Error(`Unsupported msgpack type 0x${type.toString(16)}`);
+    }
+  }
+
+  return read();
+}
+
+export function decodeWorldFrame(buffer) {
+  const bytes = new Uint8Array(buffer);
+  // A MessagePack map never starts with "{", so that marks a JSON frame.
+  if (bytes[0] === 0x7b) return JSON.parse(textDecoder.decode(bytes));
+  return decodeMsgpack(bytes);
+}
@@ -1,17 +1,39 @@
+try:
+    import eventlet
+except Exception:  # pragma: no cover - optional dependency
+    eventlet = None
+else:
+    # Patch before anything imports socket, threading or time so socket
+    # handlers and the world loop run as cooperating greenlets.
+    eventlet.monkey_patch()
+
+import functools
+import json
 import math
 import os
-import random
 import threading
 import time
+from collections import deque
 
 from flask import Flask, jsonify, request
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 from flask_socketio import SocketIO, emit, join_room, leave_room
 
-from game_state import GameState
+try:
+    import orjson
+except Exception:  # pragma: no cover - optional dependency
+    orjson = None
+
+try:
+    import msgpack
+except Exception:  # pragma: no cover - optional dependency
+    msgpack = None
+
+from game_state import GameState, Monster, MonsterProjectile, Projectile, TrailTile
 from store import (
     add_account_name,
-    add_crowns,
+    add_crowns_many,
     auth_account,
     buy_item,
     create_account,
@@ -22,9 +44,40 @@ from store import (
     init_db,
 )
 
+
+class _OrjsonCodec:
+    """json-module shim so socket.io packets are encoded by orjson."""
+
+    @staticmethod
+    def dumps(obj, **_kwargs):
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+
+    @staticmethod
+    def loads(data, **_kwargs):
+        return orjson.loads(data)
+
+
+class _OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider so HTTP responses are encoded by orjson too."""
+
+    def dumps(self, obj, **_kwargs):
+        return orjson.dumps(obj, default=self.default, option=orjson.OPT_NON_STR_KEYS).decode()
+
+    def loads(self, s, **_kwargs):
+        return orjson.loads(s)
+
+
 app = Flask(__name__)
+if orjson:
+    app.json = _OrjsonProvider(app)
 CORS(app)
-socketio = SocketIO(app, cors_allowed_origins="*")
+socketio_options = {
+    "cors_allowed_origins": "*",
+    "async_mode": "eventlet" if eventlet else "threading",
+}
+if orjson:
+    socketio_options["json"] = _OrjsonCodec
+socketio = SocketIO(app, **socketio_options)
 state = GameState()
 init_db()
 
@@ -90,7 +143,7 @@ def me():
     crowns, items, names = get_account(account_id)
     return jsonify({"crowns": crowns, "items": list(items), "names": names})
 
-ROUND_SEQUENCE = ["snowball", "survival", "hunt", "thin_ice", "hill", "light", "ice"]
+ROUND_SEQUENCE = ("snowball", "survival", "hunt", "thin_ice", "hill", "light", "ice")
 ROUND_DURATIONS = {
     "survival": 65,
     "snowball": 120,
@@ -113,6 +166,14 @@ PROJECTILE_RADIUS = 6.0
 HAZARD_RADIUS = 14.0
 GIFT_RADIUS = 12.0
 FIREBALL_RADIUS = 7.0
+PROJECTILE_HIT_SQ = (PROJECTILE_RADIUS + PLAYER_RADIUS) ** 2
+HAZARD_HIT_SQ = (HAZARD_RADIUS + PLAYER_RADIUS) ** 2
+GIFT_HIT_SQ = (GIFT_RADIUS + PLAYER_RADIUS) ** 2
+FIREBALL_HIT_SQ = (FIREBALL_RADIUS + PLAYER_RADIUS) ** 2
+MAZE_MONSTER_RADIUS = 16
+MAZE_MONSTER_HIT_SQ = (MAZE_MONSTER_RADIUS + PLAYER_RADIUS) ** 2
+MAZE_MONSTER_SHOT_SQ = (PROJECTILE_RADIUS + MAZE_MONSTER_RADIUS) ** 2
+PLAYER_TOUCH_SQ = (PLAYER_RADIUS + PLAYER_RADIUS) ** 2
 FIREBALL_SPEED = 260.0
 FIREBALL_DAMAGE = 5.0
 ICE_ACCEL = 260.0
@@ -126,6 +187,8 @@ ICE_TREE_RAMP = 0.6
 ICE_TREE_RAMP_TIME = 180.0
 ICE_TREE_BUFFER = 160.0
 ICE_TREE_SAFE_RADIUS = 80.0
+ICE_FLAG_PLAYER_CLEAR_SQ = (GIFT_RADIUS + ICE_TREE_SAFE_RADIUS + PLAYER_RADIUS) ** 2
+ICE_FLAG_GIFT_CLEAR_SQ = (GIFT_RADIUS + 6 + GIFT_RADIUS) ** 2
 ICE_PLAYER_Y = 0.6
 ICE_FINISH_LEAD = 0.8
 ICE_FLAG_TARGET = 14
@@ -136,6 +199,10 @@ ICE_SNOWBALL_INTERVAL = 1.1
 LIGHT_HOLDER_POINTS = 5
 LIGHT_AURA_POINTS = 3
 LIGHT_AURA_RADIUS = 130.0
+LIGHT_AURA_SQ = (PLAYER_RADIUS + LIGHT_AURA_RADIUS) ** 2
+LIGHT_PICKUP_RADIUS = 16.0
+LIGHT_PICKUP_SQ = (PLAYER_RADIUS + LIGHT_PICKUP_RADIUS) ** 2
+LIGHT_SPAWN_CLEAR_SQ = (120 + PLAYER_RADIUS) ** 2
 LIGHT_PASS_RADIUS = 140.0
 LIGHT_HIT_BONUS = 20
 LIGHT_HOLD_DURATION = 20.0
@@ -161,7 +228,6 @@ HILL_SNOWBALL_INTERVAL = 0.7
 HILL_FALLING_INTERVAL = 0.5
 HILL_TREE_COUNT = 60
 THIN_ICE_TILE_SIZE = 32
-THIN_ICE_SYNC_TICKS = 8
 THIN_ICE_POINTS_PER_SECOND = 2
 THIN_ICE_DASH_DISTANCE = 160.0
 THIN_ICE_DASH_COOLDOWN = 4.0
@@ -172,16 +238,21 @@ TRAIL_TILE_SIZE = 16.0
 TRAIL_TILE_POINTS = 1
 TRAIL_START_BUFFER = 2.0
 TRAIL_MAX_POINTS = 100000
-TRAIL_SYNC_TICKS = 5
 TREE_RADIUS = 22.0
+GRID_CELL_SIZE = 64.0
+GRID_QUERY_PAD = 32.0
 TREE_SIZES = {
     "small": {"draw": 32, "radius": 16},
     "medium": {"draw": 48, "radius": 22},
     "large": {"draw": 64, "radius": 28},
 }
+TREE_MAX_RADIUS = max(size["radius"] for size in TREE_SIZES.values())
+# (size, radius) pairs so spawn retries pick both in one draw.
+TREE_SIZE_CHOICES = tuple((name, size["radius"]) for name, size in TREE_SIZES.items())
 
 AI_WANDER_INTERVAL = (0.7, 1.9)
 AI_TARGET_INTERVAL = (1.0, 2.2)
+AI_RETARGET_INTERVAL = 0.25
 AI_ACTION_COOLDOWNS = {
     "snowball": (0.9, 1.6),
     "maze": (1.0, 1.7),
@@ -193,6 +264,9 @@ AI_ACTION_COOLDOWNS = {
 AI_SNOWBALL_RANGE = 420.0
 AI_LIGHT_SHOT_RANGE = 380.0
 AI_MAZE_SHOT_RANGE = 300.0
+AI_SNOWBALL_RANGE_SQ = AI_SNOWBALL_RANGE * AI_SNOWBALL_RANGE
+AI_LIGHT_SHOT_RANGE_SQ = AI_LIGHT_SHOT_RANGE * AI_LIGHT_SHOT_RANGE
+AI_MAZE_SHOT_RANGE_SQ = AI_MAZE_SHOT_RANGE * AI_MAZE_SHOT_RANGE
 AI_IDLE_CHANCE = 0.06
 AI_IDLE_DURATION = (0.2, 0.45)
 AI_WANDER_CHANCE = 0.25
@@ -218,6 +292,9 @@ MONSTER_TYPES = {
     "medium": {"hp": 2, "speed": 85.0, "points": 6},
     "big": {"hp": 4, "speed": 70.0, "points": 10},
 }
+# Flattened for the maze hit path. Points are kept off the monster dicts
+# because those dicts go out in every world_state frame.
+MONSTER_POINTS = {mtype: cfg["points"] for mtype, cfg in MONSTER_TYPES.items()}
 
 MONSTER_SPRITES = [
     "monster1",
@@ -240,6 +317,27 @@ SNOWBALL_BOSS_HP = 18
 SNOWBALL_BOSS_ATTACK_INTERVAL = 1.2
 SNOWBALL_BOSS_PROJECTILES = 14
 SNOWBALL_BOSS_PROJECTILE_SPEED = 360.0
+SNOWBALL_BOSS_VOLLEY = tuple(
+    (
+        math.cos(idx * (math.tau / SNOWBALL_BOSS_PROJECTILES)) * SNOWBALL_BOSS_PROJECTILE_SPEED,
+        math.sin(idx * (math.tau / SNOWBALL_BOSS_PROJECTILES)) * SNOWBALL_BOSS_PROJECTILE_SPEED,
+    )
+    for idx in range(SNOWBALL_BOSS_PROJECTILES)
+)
+WORLD_EMIT_INTERVAL = 1.0 / 30.0
+WORLD_EMIT_SYNC_PLAYERS = 2
+PROJECTILE_WIRE_STRIDE = 3
+MONSTER_PROJECTILE_WIRE_STRIDE = 2
+HAZARD_WIRE_STRIDE = 4
+MONSTER_WIRE_STRIDE = 6
+TRAIL_WIRE_STRIDE = 3
+STATIC_SYNC_PAYLOADS = 150
+WORLD_KEYFRAME_PAYLOADS = 30
+IDLE_STATUSES = {"lobby", "between_rounds", "finished"}
+WORLD_EMIT_YIELD_ROOMS = 50
+WORLD_TICK_RATE = 1.0 / 60.0
+WORLD_MAX_CATCHUP_STEPS = 2
+WORLD_LOOP_MAX_LAG = 0.25
 
 world_task_started = False
 world_task_lock = threading.Lock()
@@ -252,11 +350,13 @@ def _safe_name(raw_name):
     return name[:16]
 
 
-def _apply_store_profile(player, account_id):
+def _apply_store_profile(room, player, account_id):
     crowns, items, _names = get_account(account_id)
     player.crowns = crowns
     player.items = set(items)
+    player.speed_scale = None
     player.account_id = account_id
+    room.room_payload = None
 
 
 def _is_holly_player(player):
@@ -264,44 +364,113 @@ def _is_holly_player(player):
 
 
 def _player_speed_multiplier(player):
-    speed = HOLLY_SPEED_MULTIPLIER if _is_holly_player(player) else 1.0
-    if "boost_speed" in getattr(player, "items", set()):
-        speed *= 1.08
+    # Read by every movement step; the cache is reset where items change.
+    speed = player.speed_scale
+    if speed is None:
+        speed = HOLLY_SPEED_MULTIPLIER if _is_holly_player(player) else 1.0
+        if "boost_speed" in getattr(player, "items", set()):
+            speed *= 1.08
+        player.speed_scale = speed
     return speed
 
 
 def _hill_respawn_position(room):
     margin = 60
-    x = random.uniform(margin, room.width - margin)
+    x = room.rng.uniform(margin, room.width - margin)
     y = room.height * HILL_RESPAWN_Y_OFFSET
     return x, y
 
 
 def _next_round_type(room):
-    order = room.round_order or list(ROUND_SEQUENCE)
+    order = room.round_order or ROUND_SEQUENCE
     if room.current_round >= len(order):
         return ""
     return order[room.current_round]
 
 
 def _room_payload(room):
+    # Reused until the next tick or until a handler changes the room, so
+    # bursts of room_update emits (reconnects, ready toggles) serialize once.
+    cached = room.room_payload
+    if cached is not None and room.room_payload_tick == room.tick:
+        return cached
     payload = state.serialize_room(room)
     payload["nextRoundType"] = _next_round_type(room)
-    return {"room": payload}
-
-
-def _world_payload(room):
+    cached = {"room": payload}
+    room.room_payload = cached
+    room.room_payload_tick = room.tick
+    return cached
+
+
+def _pack_projectiles(projectiles):
+    data = []
+    extend = data.extend
+    for projectile in projectiles:
+        extend((projectile.x, projectile.y, projectile.color))
+    return {"stride": PROJECTILE_WIRE_STRIDE, "data": data}
+
+
+def _pack_monster_projectiles(projectiles):
+    data = []
+    extend = data.extend
+    for projectile in projectiles:
+        extend((projectile.x, projectile.y))
+    return {"stride": MONSTER_PROJECTILE_WIRE_STRIDE, "data": data}
+
+
+def _pack_hazards(hazards):
+    # x, y, radius, id; radius 0 marks a falling snowflake, anything else is
+    # a rolling big snowball.
+    data = []
+    extend = data.extend
+    for hazard in hazards:
+        radius = hazard.get("radius", 0) if hazard.get("type") == "big_snowball" else 0
+        extend((hazard["x"], hazard["y"], radius, hazard["id"]))
+    return {"stride": HAZARD_WIRE_STRIDE, "data": data}
+
+
+def _pack_monsters(monsters):
+    # x, y, id, facing, type, sprite. Facing is the horizontal heading the
+    # client flips sprites by: velocity for movers, the wander/chase
+    # direction for maze monsters.
+    data = []
+    extend = data.extend
+    for monster in monsters:
+        extend((monster.x, monster.y, monster.id, monster.vx or monster.dir_x, monster.type, monster.sprite))
+    return {"stride": MONSTER_WIRE_STRIDE, "data": data}
+
+
+def _pack_trails(tiles):
+    # Tiles share one size and the owner never leaves the server, so a full
+    # resync of a painted map is a flat x, y, color run instead of dicts.
+    data = []
+    extend = data.extend
+    for tile in tiles:
+        extend((tile.x, tile.y, tile.color))
+    return {"stride": TRAIL_WIRE_STRIDE, "size": TRAIL_TILE_SIZE, "data": data}
+
+
+def _world_snapshot(room):
+    room.world_seq += 1
+    # Walls, decorations, trails and broken thin ice are sent in full only on
+    # a resync (join, request_state, round setup) or every
+    # STATIC_SYNC_PAYLOADS; in between clients merge the per-tick updates.
+    static_full = room.static_dirty or room.world_seq % STATIC_SYNC_PAYLOADS == 0
+    room.static_dirty = False
     trails_full = True
-    trails = list(room.trails)
     if room.round_type == "trails":
-        trails_full = room.tick % TRAIL_SYNC_TICKS == 0 or not room.trails
-        if not trails_full:
-            trails = []
-    trail_updates = list(room.trails_dirty) if room.round_type == "trails" else []
+        trails_full = static_full or not room.trails
+    trails = _pack_trails(room.trails if trails_full else ())
+    if room.round_type == "trails":
+        trail_updates = _pack_trails([tile for tile in room.trails_dirty if tile.owner is not None])
+    else:
+        trail_updates = _pack_trails(())
+    trail_removals = [] if trails_full else room.trails_removed
     room.trails_dirty = []
+    room.trails_removed = []
     thin_ice = {}
     if room.round_type == "thin_ice":
-        thin_full = room.tick % THIN_ICE_SYNC_TICKS == 0 or not room.thin_ice_broken
+        thin_full = static_full or not room.thin_ice_broken
         if thin_full:
             broken = [[tx, ty] for (tx, ty) in room.thin_ice_broken]
         else:
@@ -314,29 +483,38 @@ def _world_payload(room):
             "brokenUpdates": updates,
             "brokenFull": thin_full,
         }
+    # Player rows are copied as tuples here and written into each player's
+    # payload_row by _expand_world_snapshot, which the world loop runs after
+    # releasing the room lock.
     players = []
     for player in room.players.values():
-        players.append(
-            {
+        if player.payload_static is None:
+            static = {
                 "id": player.sid,
                 "name": player.name,
                 "color": player.color,
-                "x": player.x,
-                "y": player.y,
-                "alive": player.alive,
                 "team": player.team,
-                "hasLight": player.has_light,
-                "fx": player.facing_x,
-                "fy": player.facing_y,
-                "moving": abs(player.input_x) > 0.1 or abs(player.input_y) > 0.1,
-                "score": player.score,
-                "roundScore": player.round_score,
-                "ringsLeft": player.rings_left,
-                "crowns": player.crowns,
-                "items": list(player.items),
                 "isBot": player.is_bot,
-                "dashReadyAt": player.dash_ready_ts,
             }
+            player.payload_static = static
+            player.payload_row = dict(static)
+        players.append(
+            (
+                player.payload_row,
+                player.x,
+                player.y,
+                player.alive,
+                player.has_light,
+                player.facing_x,
+                player.facing_y,
+                abs(player.input_x) > 0.1 or abs(player.input_y) > 0.1,
+                player.score,
+                player.round_score,
+                player.rings_left,
+                player.crowns,
+                list(player.items),
+                player.dash_ready_ts,
+            )
         )
     payload = {
         "room": {
@@ -353,21 +531,71 @@ def _world_payload(room):
             "width": room.width,
             "height": room.height,
             "players": players,
-            "projectiles": list(room.projectiles),
-            "monsterProjectiles": list(room.monster_projectiles),
-            "monsters": list(room.monsters),
-            "decorations": list(room.decorations),
-            "hazards": list(room.hazards),
-            "gifts": list(room.gifts),
-            "walls": list(room.walls),
+            "projectiles": _pack_projectiles(room.projectiles),
+            "monsterProjectiles": _pack_monster_projectiles(room.monster_projectiles),
+            "monsters": _pack_monsters(room.monsters),
+            "hazards": _pack_hazards(room.hazards),
+            # Entity lists are only mutated by the world loop, which emits
+            # this payload before stepping the room again, so no copies.
+            "gifts": room.gifts,
             "trails": trails,
             "trailsFull": trails_full,
             "trailUpdates": trail_updates,
+            "trailRemovals": trail_removals,
             "thinIce": thin_ice,
+            "iceScroll": room.ice_scroll,
             "light": dict(room.light) if room.light else {},
             "hill": dict(room.hill) if room.hill else {},
         },
     }
+    # Ice trees sit in track coordinates and clients subtract iceScroll, so
+    # the list is only resent when trees spawn or scroll off.
+    world = payload["world"]
+    if static_full:
+        world["walls"] = room.walls
+    if static_full or room.decorations_dirty:
+        world["decorations"] = room.decorations
+    room.decorations_dirty = False
+    return payload
+
+
+def _expand_world_snapshot(payload):
+    # Rows are reused across ticks; the previous frame was encoded before
+    # this one is filled, so overwriting them in place is safe.
+    world = payload["world"]
+    players = []
+    append = players.append
+    for (
+        row,
+        x,
+        y,
+        alive,
+        has_light,
+        fx,
+        fy,
+        moving,
+        score,
+        round_score,
+        rings_left,
+        crowns,
+        items,
+        dash_ready_at,
+    ) in world["players"]:
+        row["x"] = x
+        row["y"] = y
+        row["alive"] = alive
+        row["hasLight"] = has_light
+        row["fx"] = fx
+        row["fy"] = fy
+        row["moving"] = moving
+        row["score"] = score
+        row["roundScore"] = round_score
+        row["ringsLeft"] = rings_left
+        row["crowns"] = crowns
+        row["items"] = items
+        row["dashReadyAt"] = dash_ready_at
+        append(row)
+    world["players"] = players
     return payload
 
 
@@ -384,17 +612,11 @@ def _random_spawn(room, index=0):
 
 def _random_light_position(room):
     for _ in range(12):
-        x = random.uniform(60, room.width - 60)
-        y = random.uniform(60, room.height - 60)
-        if room.decorations and any(
-            deco.get("type") == "tree"
-            and _circle_hit(x, y, 16, deco["x"], deco["y"], _tree_radius(deco))
-            for deco in room.decorations
-        ):
+        x = room.rng.uniform(60, room.width - 60)
+        y = room.rng.uniform(60, room.height - 60)
+        if _trees_hit(room, x, y, 16):
             continue
-        if room.players and any(
-            _circle_hit(x, y, 120, player.x, player.y, PLAYER_RADIUS) for player in room.players.values()
-        ):
+        if _players_within(room.players.values(), x, y, LIGHT_SPAWN_CLEAR_SQ):
             continue
         return x, y
     return room.width / 2, room.height / 2
@@ -410,27 +632,94 @@ def _edge_spawns(room, players, start_angle=0.0, end_angle=2 * math.pi):
     center_y = room.height / 2
     arc = end_angle - start_angle
     step = arc / max(1, count)
-    offset = random.uniform(0.0, step)
+    offset = room.rng.uniform(0.0, step)
     for idx, player in enumerate(players):
         angle = start_angle + offset + idx * step
         player.x = center_x + math.cos(angle) * radius
         player.y = center_y + math.sin(angle) * radius
 
 
-def _tree_radius(deco):
-    size = deco.get("size") or "medium"
-    return TREE_SIZES.get(size, TREE_SIZES["medium"])["radius"]
+def _kill_player(room, player):
+    # Every death goes through here so room.alive_count stays exact.
+    if player.alive:
+        player.alive = False
+        room.alive_count -= 1
+
+
+def _alive_players(room):
+    # alive_count is exact, so while nobody is down the per-player test is
+    # skipped and the values are copied in one call.
+    players = room.players
+    if room.alive_count == len(players):
+        return list(players.values())
+    return [player for player in players.values() if player.alive]
 
 
 def _circle_hit(ax, ay, ar, bx, by, br):
+    # Most pairs miss; rejecting on the x gap alone skips the squared sum.
+    reach = ar + br
+    dx = ax - bx
+    if dx > reach or dx < -reach:
+        return False
+    dy = ay - by
+    return dx * dx + dy * dy <= reach * reach
+
+
+def _hit_sq(ax, ay, bx, by, reach_sq):
     dx = ax - bx
     dy = ay - by
-    return dx * dx + dy * dy <= (ar + br) ** 2
+    return dx * dx + dy * dy <= reach_sq
+
+
+# Spawn retries test each candidate against every player or gift; plain
+# loops short-circuit without building a generator per candidate.
+def _players_within(players, x, y, reach_sq):
+    for player in players:
+        dx = x - player.x
+        dy = y - player.y
+        if dx * dx + dy * dy <= reach_sq:
+            return True
+    return False
+
+
+def _gifts_within(gifts, x, y, reach_sq):
+    for gift in gifts:
+        dx = x - gift["x"]
+        dy = y - gift["y"]
+        if dx * dx + dy * dy <= reach_sq:
+            return True
+    return False
+
+
+def _nearest_player(players, x, y):
+    target = None
+    best_sq = 0.0
+    for player in players:
+        if not player.alive:
+            continue
+        dx = player.x - x
+        dy = player.y - y
+        dist_sq = dx * dx + dy * dy
+        if target is None or dist_sq < best_sq:
+            best_sq = dist_sq
+            target = player
+    if target is None:
+        return None, 1e18
+    return target, best_sq
 
 
 def _player_bounds(room, x, y):
-    x = _clamp(x, PLAYER_RADIUS, room.width - PLAYER_RADIUS)
-    y = _clamp(y, PLAYER_RADIUS, room.height - PLAYER_RADIUS)
+    # Inlined _clamp (same tie-breaking); called for every player move.
+    max_x = room.width - PLAYER_RADIUS
+    max_y = room.height - PLAYER_RADIUS
+    if x >= max_x:
+        x = max_x
+    if x <= PLAYER_RADIUS:
+        x = PLAYER_RADIUS
+    if y >= max_y:
+        y = max_y
+    if y <= PLAYER_RADIUS:
+        y = PLAYER_RADIUS
     return x, y
 
 
@@ -453,44 +742,55 @@ def _set_bot_input(player, dx, dy, speed_scale=1.0):
         player.facing_y = dy
 
 
-def _ai_ready_action(player, now, cooldown):
+def _ai_ready_action(room, player, now, cooldown):
     if now < player.ai_next_action_ts:
         return False
-    player.ai_next_action_ts = now + random.uniform(*cooldown)
+    player.ai_next_action_ts = now + room.rng.uniform(*cooldown)
     return True
 
 
-def _ai_maybe_idle(player, now):
+def _ai_maybe_idle(room, player, now):
     if now < player.ai_idle_until:
         player.input_x = 0.0
         player.input_y = 0.0
         return True
-    if random.random() < AI_IDLE_CHANCE:
-        player.ai_idle_until = now + random.uniform(*AI_IDLE_DURATION)
+    if room.rng.random() < AI_IDLE_CHANCE:
+        player.ai_idle_until = now + room.rng.uniform(*AI_IDLE_DURATION)
         player.input_x = 0.0
         player.input_y = 0.0
         return True
     return False
 
 
-def _ai_aim_noise(dx, dy, amount):
-    return dx + random.uniform(-amount, amount), dy + random.uniform(-amount, amount)
+def _ai_fire(room, player, now, aim_dx, aim_dy):
+    # Jitter the aim, face it and shoot.
+    uniform = room.rng.uniform
+    dx = aim_dx + uniform(-AI_AIM_JITTER, AI_AIM_JITTER)
+    dy = aim_dy + uniform(-AI_AIM_JITTER, AI_AIM_JITTER)
+    mag = math.hypot(dx, dy)
+    if mag > 1.0:
+        dx /= mag
+        dy /= mag
+    if abs(dx) > 0.05 or abs(dy) > 0.05:
+        player.facing_x = dx
+        player.facing_y = dy
+    _perform_action(room, player, now)
 
 
 def _ai_wander(room, player, now, speed=0.65):
     if now >= player.ai_next_decision_ts:
-        angle = random.uniform(0.0, math.tau)
+        angle = room.rng.uniform(0.0, math.tau)
         player.ai_dir_x = math.cos(angle)
         player.ai_dir_y = math.sin(angle)
-        player.ai_next_decision_ts = now + random.uniform(*AI_WANDER_INTERVAL)
+        player.ai_next_decision_ts = now + room.rng.uniform(*AI_WANDER_INTERVAL)
     _set_bot_input(player, player.ai_dir_x, player.ai_dir_y, speed_scale=speed)
 
 
 def _ai_target_point(room, player, now, margin=80.0, speed=0.75):
     if now >= player.ai_next_decision_ts or player.ai_target_x <= 0.0:
-        player.ai_target_x = random.uniform(margin, room.width - margin)
-        player.ai_target_y = random.uniform(margin, room.height - margin)
-        player.ai_next_decision_ts = now + random.uniform(*AI_TARGET_INTERVAL)
+        player.ai_target_x = room.rng.uniform(margin, room.width - margin)
+        player.ai_target_y = room.rng.uniform(margin, room.height - margin)
+        player.ai_next_decision_ts = now + room.rng.uniform(*AI_TARGET_INTERVAL)
     dx = player.ai_target_x - player.x
     dy = player.ai_target_y - player.y
     if abs(dx) < 25 and abs(dy) < 25:
@@ -498,15 +798,241 @@ def _ai_target_point(room, player, now, margin=80.0, speed=0.75):
     _set_bot_input(player, dx, dy, speed_scale=speed)
 
 
-def _rect_collides_circle(rect, cx, cy, radius):
-    return (
-        rect["x"] - radius <= cx <= rect["x"] + rect["w"] + radius
-        and rect["y"] - radius <= cy <= rect["y"] + rect["h"] + radius
-    )
+def _ai_player_target(room, player, candidates, now, enemies_only=False):
+    # The nearest pick is held for AI_RETARGET_INTERVAL while it stays alive;
+    # callers still steer toward its current position every tick.
+    if now < player.ai_retarget_ts:
+        target = room.players.get(player.ai_target_sid)
+        if target is not None and target.alive:
+            return target
+    target = None
+    best_sq = 1e18
+    for other in candidates:
+        if other is player or (enemies_only and other.team == player.team):
+            continue
+        dx = other.x - player.x
+        dy = other.y - player.y
+        dist_sq = dx * dx + dy * dy
+        if dist_sq < best_sq:
+            best_sq = dist_sq
+            target = other
+    player.ai_target_sid = target.sid if target else ""
+    player.ai_retarget_ts = now + AI_RETARGET_INTERVAL
+    return target
+
+
+def _ai_monster_target(room, player, monsters_by_id, now):
+    if now < player.ai_retarget_ts:
+        target = monsters_by_id.get(player.ai_target_monster)
+        if target is not None:
+            return target
+    target = None
+    best_sq = 1e18
+    for monster in room.monsters:
+        dx = monster.x - player.x
+        dy = monster.y - player.y
+        dist_sq = dx * dx + dy * dy
+        if dist_sq < best_sq:
+            best_sq = dist_sq
+            target = monster
+    player.ai_target_monster = target.id if target else None
+    player.ai_retarget_ts = now + AI_RETARGET_INTERVAL
+    return target
+
+
+def _grid_insert(grid, item, x0, y0, x1, y1):
+    # Cell ranges are walked inline rather than through a generator; this is
+    # the hottest broad-phase path and most extents cover one to four cells.
+    size = GRID_CELL_SIZE
+    cy0 = int(y0 // size)
+    cy1 = int(y1 // size) + 1
+    for cx in range(int(x0 // size), int(x1 // size) + 1):
+        for cy in range(cy0, cy1):
+            bucket = grid.get((cx, cy))
+            if bucket is None:
+                grid[(cx, cy)] = [item]
+            else:
+                bucket.append(item)
+
+
+def _grid_query(grid, x0, y0, x1, y1):
+    # Items spanning several cells can be returned more than once; callers only
+    # use this for "any overlap" tests so duplicates are harmless. A query
+    # inside one cell hands back that bucket itself, so callers must not
+    # change the grid while iterating.
+    size = GRID_CELL_SIZE
+    cx0 = int(x0 // size)
+    cx1 = int(x1 // size)
+    cy0 = int(y0 // size)
+    cy1 = int(y1 // size)
+    if cx0 == cx1 and cy0 == cy1:
+        return grid.get((cx0, cy0)) or ()
+    found = []
+    for cx in range(cx0, cx1 + 1):
+        for cy in range(cy0, cy1 + 1):
+            bucket = grid.get((cx, cy))
+            if bucket:
+                found.extend(bucket)
+    return found
+
+
+def _rebuild_wall_grid(room):
+    room.wall_grid = {}
+    room.wall_bounds = ()
+    room.wall_grids_inflated = {}
+    for wall in room.walls:
+        x0 = wall["x"]
+        y0 = wall["y"]
+        x1 = x0 + wall["w"]
+        y1 = y0 + wall["h"]
+        # Padding the inserted extent lets small-radius queries read only the
+        # single cell holding the point.
+        _grid_insert(
+            room.wall_grid,
+            (x0, y0, x1, y1),
+            x0 - GRID_QUERY_PAD,
+            y0 - GRID_QUERY_PAD,
+            x1 + GRID_QUERY_PAD,
+            y1 + GRID_QUERY_PAD,
+        )
+        if room.wall_bounds:
+            bx0, by0, bx1, by1 = room.wall_bounds
+            room.wall_bounds = (min(bx0, x0), min(by0, y0), max(bx1, x1), max(by1, y1))
+        else:
+            room.wall_bounds = (x0, y0, x1, y1)
+
+
+def _grid_insert_tree(room, deco):
+    # Tree y is in track coordinates (screen y + room.ice_scroll, which is 0
+    # outside ice rounds), so ice rounds scroll without touching trees.
+    x = deco["x"]
+    y = deco["y"]
+    radius = deco["radius"]
+    reach = radius + GRID_QUERY_PAD
+    _grid_insert(room.deco_grid, (x, y, radius), x - reach, y - reach, x + reach, y + reach)
+
+
+def _rebuild_deco_grid(room):
+    room.deco_grid = {}
+    for deco in room.decorations:
+        if deco.get("type") != "tree":
+            continue
+        _grid_insert_tree(room, deco)
+
+
+def _prune_ice_deco_grid(room):
+    # Drop grid rows that only hold trees already culled off the top.
+    limit = int((room.ice_scroll - ICE_TREE_BUFFER - TREE_MAX_RADIUS - GRID_QUERY_PAD) // GRID_CELL_SIZE)
+    if limit <= room.ice_grid_row:
+        return
+    columns = int(room.width // GRID_CELL_SIZE) + 1
+    grid = room.deco_grid
+    for row in range(room.ice_grid_row, limit):
+        for column in range(-1, columns + 1):
+            grid.pop((column, row), None)
+    room.ice_grid_row = limit
+
+
+def _rebuild_player_grid(room, players):
+    room.player_grid = {}
+    for player in players:
+        x = player.x
+        y = player.y
+        _grid_insert(
+            room.player_grid,
+            player,
+            x - PLAYER_RADIUS,
+            y - PLAYER_RADIUS,
+            x + PLAYER_RADIUS,
+            y + PLAYER_RADIUS,
+        )
+
+
+def _players_near(room, cx, cy, radius):
+    # Only valid while players hold the positions the grid was built from;
+    # a player straddling cells may come back twice.
+    return _grid_query(room.player_grid, cx - radius, cy - radius, cx + radius, cy + radius)
 
 
-def _pick_monster_sprite():
-    return random.choice(MONSTER_SPRITES)
+def _inflated_wall_grid(room, radius):
+    # Walls are fixed for a round and only a handful of probe radii exist, so
+    # each radius gets its grown boxes once instead of on every probe.
+    grid = room.wall_grids_inflated.get(radius)
+    if grid is None:
+        grid = {
+            key: tuple((x0 - radius, y0 - radius, x1 + radius, y1 + radius) for x0, y0, x1, y1 in bucket)
+            for key, bucket in room.wall_grid.items()
+        }
+        room.wall_grids_inflated[radius] = grid
+    return grid
+
+
+def _walls_hit(room, cx, cy, radius):
+    grid = room.wall_grid
+    if not grid:
+        return False
+    bx0, by0, bx1, by1 = room.wall_bounds
+    if cx < bx0 - radius or cx > bx1 + radius or cy < by0 - radius or cy > by1 + radius:
+        return False
+    if radius <= GRID_QUERY_PAD:
+        bucket = _inflated_wall_grid(room, radius).get((int(cx // GRID_CELL_SIZE), int(cy // GRID_CELL_SIZE)))
+        if bucket:
+            for x0, y0, x1, y1 in bucket:
+                if x0 <= cx <= x1 and y0 <= cy <= y1:
+                    return True
+        return False
+    # Inlined _grid_query: this runs for every moving entity every tick.
+    cy0 = int((cy - radius) // GRID_CELL_SIZE)
+    cy1 = int((cy + radius) // GRID_CELL_SIZE) + 1
+    for cell_x in range(int((cx - radius) // GRID_CELL_SIZE), int((cx + radius) // GRID_CELL_SIZE) + 1):
+        for cell_y in range(cy0, cy1):
+            bucket = grid.get((cell_x, cell_y))
+            if not bucket:
+                continue
+            for x0, y0, x1, y1 in bucket:
+                if x0 - radius <= cx <= x1 + radius and y0 - radius <= cy <= y1 + radius:
+                    return True
+    return False
+
+
+def _trees_hit(room, cx, cy, radius):
+    grid = room.deco_grid
+    if not grid:
+        return False
+    cy += room.ice_scroll
+    if radius <= GRID_QUERY_PAD:
+        bucket = grid.get((int(cx // GRID_CELL_SIZE), int(cy // GRID_CELL_SIZE)))
+        if bucket:
+            for tx, ty, tree_radius in bucket:
+                dx = cx - tx
+                dy = cy - ty
+                if dx * dx + dy * dy <= (radius + tree_radius) ** 2:
+                    return True
+        return False
+    for tx, ty, tree_radius in _grid_query(grid, cx - radius, cy - radius, cx + radius, cy + radius):
+        dx = cx - tx
+        dy = cy - ty
+        if dx * dx + dy * dy <= (radius + tree_radius) ** 2:
+            return True
+    return False
+
+
+def _ice_spot_blocked(room, cx, cy, radius):
+    # Ice spawns keep radius + 2 * tree radius + 6 of clearance from every tree.
+    if not room.deco_grid:
+        return False
+    cy += room.ice_scroll
+    reach = radius + 2 * TREE_MAX_RADIUS + 6
+    for tx, ty, tree_radius in _grid_query(room.deco_grid, cx - reach, cy - reach, cx + reach, cy + reach):
+        dx = cx - tx
+        dy = cy - ty
+        if dx * dx + dy * dy <= (radius + 2 * tree_radius + 6) ** 2:
+            return True
+    return False
+
+
+def _pick_monster_sprite(room):
+    return room.rng.choice(MONSTER_SPRITES)
 
 
 def _announce(room, message, duration=4.0):
@@ -515,29 +1041,33 @@ def _announce(room, message, duration=4.0):
 
 def _spawn_roaming_monsters(room, count, speed_range=HAZARD_MONSTER_SPEED):
     room.monsters = []
+    room.snowball_boss = None
+    # room.rng.uniform(a, b) is a + (b - a) * random(); spelled out with the
+    # spans hoisted, the retry loop skips a Python-level call per sample.
+    rand = room.rng.random
+    span_x = (room.width - 80) - 80
+    span_y = (room.height - 80) - 80
+    speed_min, speed_max = speed_range
+    speed_span = speed_max - speed_min
     for _ in range(count):
         for _ in range(10):
-            x = random.uniform(80, room.width - 80)
-            y = random.uniform(80, room.height - 80)
-            if room.decorations and any(
-                deco.get("type") == "tree"
-                and _circle_hit(x, y, HAZARD_MONSTER_RADIUS + 6, deco["x"], deco["y"], _tree_radius(deco))
-                for deco in room.decorations
-            ):
+            x = 80 + span_x * rand()
+            y = 80 + span_y * rand()
+            if _trees_hit(room, x, y, HAZARD_MONSTER_RADIUS + 6):
                 continue
-            angle = random.uniform(0.0, math.tau)
-            speed = random.uniform(*speed_range)
+            angle = math.tau * rand()
+            speed = speed_min + speed_span * rand()
             room.monsters.append(
-                {
-                    "id": room.next_monster_id,
-                    "type": "hazard",
-                    "sprite": _pick_monster_sprite(),
-                    "x": x,
-                    "y": y,
-                    "vx": math.cos(angle) * speed,
-                    "vy": math.sin(angle) * speed,
-                    "radius": HAZARD_MONSTER_RADIUS,
-                }
+                Monster(
+                    id=room.next_monster_id,
+                    type="hazard",
+                    sprite=_pick_monster_sprite(room),
+                    x=x,
+                    y=y,
+                    vx=math.cos(angle) * speed,
+                    vy=math.sin(angle) * speed,
+                    radius=HAZARD_MONSTER_RADIUS,
+                )
             )
             room.next_monster_id += 1
             break
@@ -546,61 +1076,106 @@ def _spawn_roaming_monsters(room, count, speed_range=HAZARD_MONSTER_SPEED):
 def _update_roaming_monsters(room, dt):
     if not room.monsters:
         return
+    width = room.width
+    height = room.height
     for monster in room.monsters:
-        if monster.get("type") != "hazard":
+        if monster.type != "hazard":
             continue
-        monster["x"] += monster.get("vx", 0.0) * dt
-        monster["y"] += monster.get("vy", 0.0) * dt
-        radius = monster.get("radius", HAZARD_MONSTER_RADIUS)
-        if monster["x"] <= radius or monster["x"] >= room.width - radius:
-            monster["vx"] = -monster.get("vx", 0.0)
-        if monster["y"] <= radius or monster["y"] >= room.height - radius:
-            monster["vy"] = -monster.get("vy", 0.0)
-        monster["x"] = _clamp(monster["x"], radius, room.width - radius)
-        monster["y"] = _clamp(monster["y"], radius, room.height - radius)
+        vx = monster.vx
+        vy = monster.vy
+        x = monster.x + vx * dt
+        y = monster.y + vy * dt
+        radius = monster.radius
+        max_x = width - radius
+        max_y = height - radius
+        if x <= radius or x >= max_x:
+            monster.vx = -vx
+        if y <= radius or y >= max_y:
+            monster.vy = -vy
+        # Same tie-breaking as _clamp, so edge positions keep their type.
+        if x >= max_x:
+            x = max_x
+        if x <= radius:
+            x = radius
+        if y >= max_y:
+            y = max_y
+        if y <= radius:
+            y = radius
+        monster.x = x
+        monster.y = y
 
 
 def _handle_projectiles_on_hazard_monsters(room):
     if not room.projectiles or not room.monsters:
         return
+    # Bucket monsters by every cell their projectile reach overlaps so each
+    # projectile reads just its own cell; buckets keep room.monsters order,
+    # so the first monster hit is the same one the full scan would find.
+    grid = {}
+    for monster in room.monsters:
+        if monster.type not in {"hazard", "ice"}:
+            continue
+        reach = monster.radius + PROJECTILE_RADIUS
+        mx = monster.x
+        my = monster.y
+        _grid_insert(grid, monster, mx - reach, my - reach, mx + reach, my + reach)
+    if not grid:
+        return
     removed_ids = set()
-    remaining_projectiles = []
-    for projectile in room.projectiles:
+    projectiles = room.projectiles
+    kept = 0
+    for projectile in projectiles:
         hit = False
-        for monster in room.monsters:
-            if monster.get("type") not in {"hazard", "ice"}:
-                continue
-            if monster.get("id") in removed_ids:
-                continue
-            radius = monster.get("radius", HAZARD_MONSTER_RADIUS)
-            if _circle_hit(projectile["x"], projectile["y"], PROJECTILE_RADIUS, monster["x"], monster["y"], radius):
-                removed_ids.add(monster.get("id"))
-                hit = True
-                break
+        x = projectile.x
+        y = projectile.y
+        bucket = grid.get((int(x // GRID_CELL_SIZE), int(y // GRID_CELL_SIZE)))
+        if bucket:
+            for monster in bucket:
+                if monster.id in removed_ids:
+                    continue
+                radius = monster.radius
+                if _circle_hit(x, y, PROJECTILE_RADIUS, monster.x, monster.y, radius):
+                    removed_ids.add(monster.id)
+                    hit = True
+                    break
         if not hit:
-            remaining_projectiles.append(projectile)
+            projectiles[kept] = projectile
+            kept += 1
+    del projectiles[kept:]
     if removed_ids:
-        room.monsters = [monster for monster in room.monsters if monster.get("id") not in removed_ids]
-    room.projectiles = remaining_projectiles
+        # Compact in place like the projectiles rather than building a new list.
+        monsters = room.monsters
+        kept = 0
+        for monster in monsters:
+            if monster.id not in removed_ids:
+                monsters[kept] = monster
+                kept += 1
+        del monsters[kept:]
 
 
 def _spawn_ice_monsters(room, count=ICE_MONSTER_COUNT):
     room.monsters = []
+    room.snowball_boss = None
+    rand = room.rng.random
+    choice = room.rng.choice
+    span_x = (room.width - 60) - 60
+    min_y = -room.height * 0.4
+    span_y = room.height * 0.4 - min_y
     for _ in range(count):
-        direction = random.choice([-1.0, 1.0])
-        x = random.uniform(60, room.width - 60)
-        y = random.uniform(-room.height * 0.4, room.height * 0.4)
+        direction = choice((-1.0, 1.0))
+        x = 60 + span_x * rand()
+        y = min_y + span_y * rand()
         room.monsters.append(
-            {
-                "id": room.next_monster_id,
-                "type": "ice",
-                "sprite": ICE_MONSTER_SPRITE,
-                "x": x,
-                "y": y,
-                "vx": direction * ICE_MONSTER_SPEED,
-                "vy": ICE_MONSTER_SPEED,
-                "radius": ICE_MONSTER_RADIUS,
-            }
+            Monster(
+                id=room.next_monster_id,
+                type="ice",
+                sprite=ICE_MONSTER_SPRITE,
+                x=x,
+                y=y,
+                vx=direction * ICE_MONSTER_SPEED,
+                vy=ICE_MONSTER_SPEED,
+                radius=ICE_MONSTER_RADIUS,
+            )
         )
         room.next_monster_id += 1
 
@@ -608,52 +1183,80 @@ def _spawn_ice_monsters(room, count=ICE_MONSTER_COUNT):
 def _update_ice_monsters(room, dt):
     if not room.monsters:
         return
+    width = room.width
+    height = room.height
     for monster in room.monsters:
-        if monster.get("type") != "ice":
+        if monster.type != "ice":
             continue
-        monster["x"] += monster.get("vx", 0.0) * dt
-        monster["y"] += monster.get("vy", 0.0) * dt
-        radius = monster.get("radius", ICE_MONSTER_RADIUS)
-        if monster["x"] < -radius or monster["x"] > room.width + radius:
-            monster["vx"] = -monster.get("vx", 0.0)
-        if monster["y"] > room.height + radius:
-            monster["y"] = -radius * 2
-            monster["x"] = random.uniform(60, room.width - 60)
-
-
-def _handle_monster_collisions(room, radius_key="radius"):
+        vx = monster.vx
+        x = monster.x + vx * dt
+        y = monster.y + monster.vy * dt
+        radius = monster.radius
+        if x < -radius or x > width + radius:
+            monster.vx = -vx
+        if y > height + radius:
+            y = -radius * 2
+            x = room.rng.uniform(60, width - 60)
+        monster.x = x
+        monster.y = y
+
+
+def _handle_monster_collisions(room, players=None):
     if not room.monsters:
         return
+    if players is None:
+        players = _alive_players(room)
+    if not players:
+        return
+    # Monsters go into a local grid grown by their contact reach, so each
+    # player probes the one cell under its centre and sees every monster that
+    # can touch it exactly once, in room.monsters order.
+    grid = {}
     for monster in room.monsters:
-        if monster.get("type") not in {"hazard", "ice", "boss"}:
+        if monster.type not in {"hazard", "ice", "boss"}:
             continue
-        radius = monster.get(radius_key, HAZARD_MONSTER_RADIUS)
-        for player in room.players.values():
-            if not player.alive:
+        reach = monster.radius + PLAYER_RADIUS
+        mx = monster.x
+        my = monster.y
+        _grid_insert(grid, monster, mx - reach, my - reach, mx + reach, my + reach)
+    if not grid:
+        return
+    uses_rings = room.round_type == "snowball"
+    for player in players:
+        if not player.alive:
+            continue
+        px = player.x
+        py = player.y
+        for monster in _grid_query(grid, px, py, px, py):
+            reach = monster.radius + PLAYER_RADIUS
+            dx = monster.x - px
+            if dx > reach or dx < -reach:
                 continue
-            if _circle_hit(monster["x"], monster["y"], radius, player.x, player.y, PLAYER_RADIUS):
-                if room.round_type == "snowball":
+            dy = monster.y - py
+            if dx * dx + dy * dy <= reach * reach:
+                if uses_rings:
                     player.rings_left = max(0, player.rings_left - 1)
                     if player.rings_left == 0:
-                        player.alive = False
+                        _kill_player(room, player)
                 else:
-                    player.alive = False
+                    _kill_player(room, player)
+                if not player.alive:
+                    break
 
 
 def _spawn_snowball_boss(room, now):
-    boss = {
-        "id": room.next_monster_id,
-        "type": "boss",
-        "sprite": "monster10",
-        "x": room.width / 2,
-        "y": room.height / 2,
-        "radius": 34.0,
-        "hp": SNOWBALL_BOSS_HP,
-        "maxHp": SNOWBALL_BOSS_HP,
-        "lastBurst": 0.0,
-    }
+    boss = Monster(
+        id=room.next_monster_id,
+        type="boss",
+        sprite="monster10",
+        x=room.width / 2,
+        y=room.height / 2,
+        radius=34.0,
+        hp=SNOWBALL_BOSS_HP,
+    )
     room.next_monster_id += 1
     room.monsters.append(boss)
+    room.snowball_boss = boss
     room.snowball_boss_active = True
     room.snowball_boss_hp = SNOWBALL_BOSS_HP
     room.snowball_boss_max_hp = SNOWBALL_BOSS_HP
@@ -663,30 +1266,28 @@ def _spawn_snowball_boss(room, now):
 
 
 def _spawn_boss_volley(room, boss, now):
-    count = SNOWBALL_BOSS_PROJECTILES
-    angle_offset = (boss.get("lastBurst", 0.0) * 0.7) % (math.tau)
-    for idx in range(count):
-        angle = angle_offset + idx * (math.tau / count)
-        room.projectiles.append(
-            {
-                "id": room.next_projectile_id,
-                "x": boss["x"],
-                "y": boss["y"],
-                "vx": math.cos(angle) * SNOWBALL_BOSS_PROJECTILE_SPEED,
-                "vy": math.sin(angle) * SNOWBALL_BOSS_PROJECTILE_SPEED,
-                "color": "white",
-                "owner": "boss",
-                "life": 0.0,
-            }
+    angle_offset = (boss.last_burst * 0.7) % (math.tau)
+    # Rotate the precomputed ring by the burst offset: one cos/sin pair per
+    # volley instead of one per snowball.
+    cos_off = math.cos(angle_offset)
+    sin_off = math.sin(angle_offset)
+    x = boss.x
+    y = boss.y
+    next_id = room.next_projectile_id
+    room.projectiles.extend(
+        Projectile(
+            next_id + idx, x, y, vx * cos_off - vy * sin_off, vx * sin_off + vy * cos_off, "white", "boss", 0.0
         )
-        room.next_projectile_id += 1
-    boss["lastBurst"] = now
+        for idx, (vx, vy) in enumerate(SNOWBALL_BOSS_VOLLEY)
+    )
+    room.next_projectile_id = next_id + len(SNOWBALL_BOSS_VOLLEY)
+    boss.last_burst = now
 
 
 def _update_snowball_boss(room, now):
     if not room.snowball_boss_active:
         return
-    boss = next((m for m in room.monsters if m.get("type") == "boss"), None)
+    boss = room.snowball_boss
     if not boss:
         room.snowball_boss_active = False
         return
@@ -702,56 +1303,53 @@ def _maybe_spawn_snowball_boss(room, now, dt):
         return
     if now < room.snowball_boss_cooldown_until:
         return
-    if random.random() < SNOWBALL_BOSS_CHANCE * max(0.0, dt):
+    if room.rng.random() < SNOWBALL_BOSS_CHANCE * max(0.0, dt):
         _spawn_snowball_boss(room, now)
 
 def _move_with_walls(room, player, dt, speed):
-    speed *= _player_speed_multiplier(player)
+    # Hot fields are read into locals once and written back once.
+    x = player.x
+    y = player.y
     dx = player.input_x
     dy = player.input_y
-    new_x = player.x + dx * speed * dt
-    new_y = player.y + dy * speed * dt
+    if not dx and not dy:
+        # Standing still can't enter a wall; only the bounds clamp applies.
+        player.x, player.y = _player_bounds(room, x, y)
+        return
+    speed *= _player_speed_multiplier(player)
+    new_x = x + dx * speed * dt
+    new_y = y + dy * speed * dt
 
     if room.walls:
-        test_x = new_x
-        if any(_rect_collides_circle(wall, test_x, player.y, PLAYER_RADIUS) for wall in room.walls):
-            test_x = player.x
-        test_y = new_y
-        if any(_rect_collides_circle(wall, test_x, test_y, PLAYER_RADIUS) for wall in room.walls):
-            test_y = player.y
-        new_x, new_y = test_x, test_y
+        blocked_x = _walls_hit(room, new_x, y, PLAYER_RADIUS)
+        if blocked_x:
+            new_x = x
+        # With the x move accepted and no y motion, the second probe would
+        # repeat the first one exactly.
+        if (blocked_x or new_y != y) and _walls_hit(room, new_x, new_y, PLAYER_RADIUS):
+            new_y = y
 
-    new_x, new_y = _player_bounds(room, new_x, new_y)
-    player.x = new_x
-    player.y = new_y
+    player.x, player.y = _player_bounds(room, new_x, new_y)
 
 
 def _move_with_trees(room, player, dt, speed):
     speed *= _player_speed_multiplier(player)
-    dx = player.input_x
-    dy = player.input_y
-    new_x = player.x + dx * speed * dt
-    new_y = player.y + dy * speed * dt
+    x = player.x
+    y = player.y
+    new_x = x + player.input_x * speed * dt
+    new_y = y + player.input_y * speed * dt
 
     if room.walls:
-        test_x = new_x
-        if any(_rect_collides_circle(wall, test_x, player.y, PLAYER_RADIUS) for wall in room.walls):
-            test_x = player.x
-        test_y = new_y
-        if any(_rect_collides_circle(wall, test_x, test_y, PLAYER_RADIUS) for wall in room.walls):
-            test_y = player.y
-        new_x, new_y = test_x, test_y
+        blocked_x = _walls_hit(room, new_x, y, PLAYER_RADIUS)
+        if blocked_x:
+            new_x = x
+        if (blocked_x or new_y != y) and _walls_hit(room, new_x, new_y, PLAYER_RADIUS):
+            new_y = y
 
-    if room.decorations and any(
-        deco.get("type") == "tree"
-        and _circle_hit(new_x, new_y, PLAYER_RADIUS, deco["x"], deco["y"], _tree_radius(deco))
-        for deco in room.decorations
-    ):
-        new_x, new_y = player.x, player.y
+    if _trees_hit(room, new_x, new_y, PLAYER_RADIUS):
+        new_x, new_y = x, y
 
-    new_x, new_y = _player_bounds(room, new_x, new_y)
-    player.x = new_x
-    player.y = new_y
+    player.x, player.y = _player_bounds(room, new_x, new_y)
 
 
 def _move_entity(room, x, y, dx, dy, speed, dt, radius):
@@ -759,19 +1357,27 @@ def _move_entity(room, x, y, dx, dy, speed, dt, radius):
     new_y = y + dy * speed * dt
     if room.walls:
         test_x = new_x
-        if any(_rect_collides_circle(wall, test_x, y, radius) for wall in room.walls):
+        blocked_x = _walls_hit(room, test_x, y, radius)
+        if blocked_x:
             test_x = x
         test_y = new_y
-        if any(_rect_collides_circle(wall, test_x, test_y, radius) for wall in room.walls):
+        if (blocked_x or test_y != y) and _walls_hit(room, test_x, test_y, radius):
             test_y = y
         new_x, new_y = test_x, test_y
-    new_x = _clamp(new_x, radius, room.width - radius)
-    new_y = _clamp(new_y, radius, room.height - radius)
+    max_x = room.width - radius
+    max_y = room.height - radius
+    if new_x >= max_x:
+        new_x = max_x
+    if new_x <= radius:
+        new_x = radius
+    if new_y >= max_y:
+        new_y = max_y
+    if new_y <= radius:
+        new_y = radius
     return new_x, new_y
 
 
-def _dash_player(room, player, distance, cooldown):
-    now = time.time()
+def _dash_player(room, player, distance, cooldown, now):
     if now < player.dash_ready_ts:
         return
     dx = player.input_x
@@ -792,8 +1398,7 @@ def _dash_player(room, player, distance, cooldown):
     )
 
 
-def _spawn_snowball(room, player):
-    now = time.time()
+def _spawn_snowball(room, player, now):
     if now - player.last_action_ts < 0.25:
         return
     player.last_action_ts = now
@@ -801,46 +1406,45 @@ def _spawn_snowball(room, player):
     dy = player.facing_y
     if abs(dx) < 0.1 and abs(dy) < 0.1:
         dx, dy = 1.0, 0.0
-    mag = math.hypot(dx, dy)
-    if mag == 0:
-        dx, dy = 1.0, 0.0
-        mag = 1.0
-    dx /= mag
-    dy /= mag
-    projectile = {
-        "id": room.next_projectile_id,
-        "x": player.x + dx * (PLAYER_RADIUS + 6),
-        "y": player.y + dy * (PLAYER_RADIUS + 6),
-        "vx": dx * PROJECTILE_SPEED,
-        "vy": dy * PROJECTILE_SPEED,
-        "color": player.color,
-        "owner": player.sid,
-        "life": 0.0,
-    }
+    elif dx * dx + dy * dy != 1.0:
+        mag = math.hypot(dx, dy)
+        dx /= mag
+        dy /= mag
+    projectile = Projectile(
+        room.next_projectile_id,
+        player.x + dx * (PLAYER_RADIUS + 6),
+        player.y + dy * (PLAYER_RADIUS + 6),
+        dx * PROJECTILE_SPEED,
+        dy * PROJECTILE_SPEED,
+        player.color,
+        player.sid,
+        0.0,
+    )
     room.next_projectile_id += 1
     room.projectiles.append(projectile)
 
 
-def _spawn_snowball_dir(room, player, dx, dy):
+def _spawn_snowball_dir(room, player, dx, dy, now):
     player.facing_x = dx
     player.facing_y = dy
-    _spawn_snowball(room, player)
+    _spawn_snowball(room, player, now)
 
 
-def _perform_action(room, player):
+def _perform_action(room, player, now=None):
+    if now is None:
+        now = time.time()
     if room.status in {"lobby", "between_rounds"}:
-        _spawn_snowball(room, player)
+        _spawn_snowball(room, player, now)
         return
     if room.status != "in_round":
         return
     if room.round_type == "snowball":
-        _spawn_snowball(room, player)
+        _spawn_snowball(room, player, now)
     elif room.round_type in {"hunt", "hill"}:
-        _spawn_snowball(room, player)
+        _spawn_snowball(room, player, now)
     elif room.round_type in {"survival", "ice"}:
-        _spawn_snowball_dir(room, player, 0.0, -1.0)
+        _spawn_snowball_dir(room, player, 0.0, -1.0, now)
     elif room.round_type == "bonus":
-        now = time.time()
         if now - player.last_action_ts < 0.15:
             return
         player.last_action_ts = now
@@ -851,7 +1455,7 @@ def _perform_action(room, player):
         holder_id = light.get("holder") if light else ""
         if holder_id == player.sid:
             target = None
-            best_dist = 1e9
+            best_sq = 1e18
             for other in room.players.values():
                 if other.sid == player.sid:
                     continue
@@ -859,9 +1463,9 @@ def _perform_action(room, player):
                     continue
                 dx = other.x - player.x
                 dy = other.y - player.y
-                dist = math.hypot(dx, dy)
-                if dist <= LIGHT_PASS_RADIUS and dist < best_dist:
-                    best_dist = dist
+                dist_sq = dx * dx + dy * dy
+                if dist_sq <= LIGHT_PASS_RADIUS * LIGHT_PASS_RADIUS and dist_sq < best_sq:
+                    best_sq = dist_sq
                     target = other
             if target:
                 player.has_light = False
@@ -871,22 +1475,22 @@ def _perform_action(room, player):
                 light["x"] = target.x
                 light["y"] = target.y
         else:
-            _spawn_snowball(room, player)
+            _spawn_snowball(room, player, now)
     elif room.round_type == "thin_ice":
-        _dash_player(room, player, THIN_ICE_DASH_DISTANCE, THIN_ICE_DASH_COOLDOWN)
+        _dash_player(room, player, THIN_ICE_DASH_DISTANCE, THIN_ICE_DASH_COOLDOWN, now)
     elif room.round_type == "trails":
-        _splash_trail(room, player)
+        _splash_trail(room, player, now)
     elif room.round_type == "maze":
-        _spawn_snowball(room, player)
+        _spawn_snowball(room, player, now)
 
 
 def _spawn_hazard(room):
     room.hazards.append(
         {
             "id": room.next_item_id,
-            "x": random.uniform(40, room.width - 40),
+            "x": room.rng.uniform(40, room.width - 40),
             "y": -20,
-            "vy": random.uniform(140, 220),
+            "vy": room.rng.uniform(140, 220),
         }
     )
     room.next_item_id += 1
@@ -896,10 +1500,10 @@ def _spawn_falling_gift(room):
     room.gifts.append(
         {
             "id": room.next_item_id,
-            "x": random.uniform(40, room.width - 40),
+            "x": room.rng.uniform(40, room.width - 40),
             "y": -20,
-            "vy": random.uniform(110, 180),
-            "type": random.choice(["candy", "present"]),
+            "vy": room.rng.uniform(110, 180),
+            "type": room.rng.choice(["candy", "present"]),
         }
     )
     room.next_item_id += 1
@@ -907,24 +1511,24 @@ def _spawn_falling_gift(room):
 
 def _spawn_big_snowball(room):
     radius = SNOWBALL_HAZARD_RADIUS
-    side = random.choice(["top", "bottom", "left", "right"])
+    side = room.rng.choice(["top", "bottom", "left", "right"])
     if side == "top":
-        x = random.uniform(40, room.width - 40)
+        x = room.rng.uniform(40, room.width - 40)
         y = -radius
-        angle = random.uniform(math.radians(25), math.radians(155))
+        angle = room.rng.uniform(math.radians(25), math.radians(155))
     elif side == "bottom":
-        x = random.uniform(40, room.width - 40)
+        x = room.rng.uniform(40, room.width - 40)
         y = room.height + radius
-        angle = random.uniform(math.radians(-155), math.radians(-25))
+        angle = room.rng.uniform(math.radians(-155), math.radians(-25))
     elif side == "left":
         x = -radius
-        y = random.uniform(40, room.height - 40)
-        angle = random.uniform(math.radians(-60), math.radians(60))
+        y = room.rng.uniform(40, room.height - 40)
+        angle = room.rng.uniform(math.radians(-60), math.radians(60))
     else:
         x = room.width + radius
-        y = random.uniform(40, room.height - 40)
-        angle = random.uniform(math.radians(120), math.radians(240))
-    speed = random.uniform(0.85, 1.15) * SNOWBALL_HAZARD_SPEED
+        y = room.rng.uniform(40, room.height - 40)
+        angle = room.rng.uniform(math.radians(120), math.radians(240))
+    speed = room.rng.uniform(0.85, 1.15) * SNOWBALL_HAZARD_SPEED
     room.hazards.append(
         {
             "id": room.next_item_id,
@@ -941,9 +1545,9 @@ def _spawn_big_snowball(room):
 
 def _spawn_maze_gift(room):
     for _ in range(6):
-        x = random.uniform(60, room.width - 60)
-        y = random.uniform(60, room.height - 60)
-        if any(_rect_collides_circle(wall, x, y, GIFT_RADIUS) for wall in room.walls):
+        x = room.rng.uniform(60, room.width - 60)
+        y = room.rng.uniform(60, room.height - 60)
+        if _walls_hit(room, x, y, GIFT_RADIUS):
             continue
         room.gifts.append(
             {
@@ -951,49 +1555,54 @@ def _spawn_maze_gift(room):
                 "x": x,
                 "y": y,
                 "vy": 0.0,
-                "type": random.choice(["candy", "present"]),
+                "type": room.rng.choice(["candy", "present"]),
             }
         )
         room.next_item_id += 1
         break
 
 
-def _spawn_monsters(room):
+def _spawn_monsters(room, now):
     room.monsters = []
+    room.snowball_boss = None
     count = max(6, min(12, len(room.players) * 2))
     types = ["small", "medium", "big"]
+    uniform = room.rng.uniform
+    max_x = room.width - 80
+    max_y = room.height - 80
+    center_x = room.width / 2
+    center_y = room.height / 2
     for idx in range(count):
         mtype = types[idx % len(types)]
         cfg = MONSTER_TYPES[mtype]
         for _ in range(8):
-            x = random.uniform(80, room.width - 80)
-            y = random.uniform(80, room.height - 80)
-            if any(_rect_collides_circle(wall, x, y, 18) for wall in room.walls):
+            x = uniform(80, max_x)
+            y = uniform(80, max_y)
+            if abs(x - center_x) < 120 and abs(y - center_y) < 120:
                 continue
-            if abs(x - room.width / 2) < 120 and abs(y - room.height / 2) < 120:
+            if _walls_hit(room, x, y, 18):
                 continue
             room.monsters.append(
-                {
-                    "id": room.next_monster_id,
-                    "type": mtype,
-                    "sprite": _pick_monster_sprite(),
-                    "x": x,
-                    "y": y,
-                    "hp": cfg["hp"],
-                    "maxHp": cfg["hp"],
-                    "speed": cfg["speed"],
-                    "dirX": random.uniform(-1, 1),
-                    "dirY": random.uniform(-1, 1),
-                    "wanderUntil": time.time() + random.uniform(1.0, 3.0),
-                    "lastShot": 0.0,
-                }
+                Monster(
+                    id=room.next_monster_id,
+                    type=mtype,
+                    sprite=_pick_monster_sprite(room),
+                    x=x,
+                    y=y,
+                    radius=MAZE_MONSTER_RADIUS,
+                    hp=cfg["hp"],
+                    speed=cfg["speed"],
+                    dir_x=uniform(-1, 1),
+                    dir_y=uniform(-1, 1),
+                    wander_until=now + uniform(1.0, 3.0),
+                )
             )
             room.next_monster_id += 1
             break
 
 
-def _pick_hunt_type(difficulty):
-    roll = random.random()
+def _pick_hunt_type(room, difficulty):
+    roll = room.rng.random()
     small_cut = max(0.35, 0.65 - 0.3 * difficulty)
     medium_cut = min(0.9, small_cut + 0.3)
     if roll < small_cut:
@@ -1004,41 +1613,40 @@ def _pick_hunt_type(difficulty):
 
 
 def _spawn_hunt_monster(room, difficulty, target_x, target_y):
-    side = random.choice(["top", "bottom", "left", "right"])
+    side = room.rng.choice(["top", "bottom", "left", "right"])
     margin = 40
     if side == "top":
-        x = random.uniform(margin, room.width - margin)
+        x = room.rng.uniform(margin, room.width - margin)
         y = -margin
     elif side == "bottom":
-        x = random.uniform(margin, room.width - margin)
+        x = room.rng.uniform(margin, room.width - margin)
         y = room.height + margin
     elif side == "left":
         x = -margin
-        y = random.uniform(margin, room.height - margin)
+        y = room.rng.uniform(margin, room.height - margin)
     else:
         x = room.width + margin
-        y = random.uniform(margin, room.height - margin)
+        y = room.rng.uniform(margin, room.height - margin)
 
-    mtype = _pick_hunt_type(difficulty)
+    mtype = _pick_hunt_type(room, difficulty)
     cfg = MONSTER_TYPES[mtype]
     dx = target_x - x
     dy = target_y - y
-    angle = math.atan2(dy, dx) + random.uniform(-0.35, 0.35)
+    angle = math.atan2(dy, dx) + room.rng.uniform(-0.35, 0.35)
     speed = cfg["speed"] * (1.0 + HUNT_MONSTER_SPEED_SCALE * difficulty)
     radius = 14 if mtype == "small" else 18 if mtype == "medium" else 22
     room.monsters.append(
-        {
-            "id": room.next_monster_id,
-            "type": mtype,
-            "sprite": _pick_monster_sprite(),
-            "x": x,
-            "y": y,
-            "vx": math.cos(angle) * speed,
-            "vy": math.sin(angle) * speed,
-            "hp": cfg["hp"],
-            "maxHp": cfg["hp"],
-            "radius": radius,
-        }
+        Monster(
+            id=room.next_monster_id,
+            type=mtype,
+            sprite=_pick_monster_sprite(room),
+            x=x,
+            y=y,
+            vx=math.cos(angle) * speed,
+            vy=math.sin(angle) * speed,
+            radius=radius,
+            hp=cfg["hp"],
+        )
     )
     room.next_monster_id += 1
 
@@ -1046,67 +1654,112 @@ def _spawn_hunt_monster(room, difficulty, target_x, target_y):
 def _update_hunt_monsters(room, dt):
     if not room.monsters:
         return
+    width = room.width
+    height = room.height
+    # Each field is read once and written back once, like the roaming pass;
+    # velocities are only stored when they flip so the boss never gains them.
     for monster in room.monsters:
-        monster["x"] += monster.get("vx", 0.0) * dt
-        monster["y"] += monster.get("vy", 0.0) * dt
-        radius = monster.get("radius", 16)
-        if monster["x"] <= radius or monster["x"] >= room.width - radius:
-            monster["vx"] = -monster.get("vx", 0.0)
-        if monster["y"] <= radius or monster["y"] >= room.height - radius:
-            monster["vy"] = -monster.get("vy", 0.0)
-        monster["x"] = _clamp(monster["x"], radius, room.width - radius)
-        monster["y"] = _clamp(monster["y"], radius, room.height - radius)
-
-        if room.decorations and any(
-            deco.get("type") == "tree"
-            and _circle_hit(monster["x"], monster["y"], radius + 6, deco["x"], deco["y"], _tree_radius(deco))
-            for deco in room.decorations
-        ):
-            monster["vx"] = -monster.get("vx", 0.0)
-            monster["vy"] = -monster.get("vy", 0.0)
+        vx = monster.vx
+        vy = monster.vy
+        x = monster.x + vx * dt
+        y = monster.y + vy * dt
+        radius = monster.radius
+        max_x = width - radius
+        max_y = height - radius
+        if x <= radius or x >= max_x:
+            vx = -vx
+            monster.vx = vx
+        if y <= radius or y >= max_y:
+            vy = -vy
+            monster.vy = vy
+        # Same tie-breaking as _clamp.
+        if x >= max_x:
+            x = max_x
+        if x <= radius:
+            x = radius
+        if y >= max_y:
+            y = max_y
+        if y <= radius:
+            y = radius
+        monster.x = x
+        monster.y = y
+
+        if _trees_hit(room, x, y, radius + 6):
+            monster.vx = -vx
+            monster.vy = -vy
 
 
 def _handle_projectiles_on_hunt_monsters(room, hit_points):
     if not room.projectiles or not room.monsters:
         return
-    remaining_projectiles = []
-    for projectile in room.projectiles:
+    # Same broad phase as _handle_projectiles_on_hazard_monsters: monsters are
+    # bucketed with their hit reach, so each projectile reads a single cell
+    # whose bucket keeps room.monsters order.
+    boss = room.snowball_boss
+    grid = {}
+    for monster in room.monsters:
+        if monster is boss:
+            continue
+        reach = monster.radius + PROJECTILE_RADIUS
+        mx = monster.x
+        my = monster.y
+        _grid_insert(grid, monster, mx - reach, my - reach, mx + reach, my + reach)
+    if not grid:
+        return
+    projectiles = room.projectiles
+    kept = 0
+    for projectile in projectiles:
         hit = False
-        for monster in room.monsters:
-            if monster.get("type") == "boss":
+        px = projectile.x
+        py = projectile.y
+        bucket = grid.get((int(px // GRID_CELL_SIZE), int(py // GRID_CELL_SIZE)))
+        for monster in bucket or ():
+            reach = PROJECTILE_RADIUS + monster.radius
+            dx = px - monster.x
+            if dx > reach or dx < -reach:
                 continue
-            radius = monster.get("radius", 16)
-            if _circle_hit(projectile["x"], projectile["y"], PROJECTILE_RADIUS, monster["x"], monster["y"], radius):
-                monster["hp"] = monster.get("hp", 1) - 1
-                shooter = room.players.get(projectile.get("owner"))
+            dy = py - monster.y
+            if dx * dx + dy * dy <= reach * reach:
+                monster.hp -= 1
+                shooter = room.players.get(projectile.owner)
                 if shooter:
                     shooter.score += hit_points
                     shooter.round_score += hit_points
                 hit = True
                 break
         if not hit:
-            remaining_projectiles.append(projectile)
-    room.projectiles = remaining_projectiles
-    room.monsters = [monster for monster in room.monsters if monster.get("hp", 1) > 0]
+            projectiles[kept] = projectile
+            kept += 1
+    if kept == len(projectiles):
+        return
+    del projectiles[kept:]
+    # Only hits lower hp, so the cull can wait for one and compact in place.
+    monsters = room.monsters
+    kept = 0
+    for monster in monsters:
+        if monster.hp > 0:
+            monsters[kept] = monster
+            kept += 1
+    del monsters[kept:]
 
 
 def _spawn_fireball(room, monster, target_x, target_y):
-    dx = target_x - monster["x"]
-    dy = target_y - monster["y"]
+    dx = target_x - monster.x
+    dy = target_y - monster.y
     mag = math.hypot(dx, dy)
     if mag == 0:
         return
     dx /= mag
     dy /= mag
     room.monster_projectiles.append(
-        {
-            "id": room.next_monster_projectile_id,
-            "x": monster["x"],
-            "y": monster["y"],
-            "vx": dx * FIREBALL_SPEED,
-            "vy": dy * FIREBALL_SPEED,
-            "life": 0.0,
-        }
+        MonsterProjectile(
+            id=room.next_monster_projectile_id,
+            x=monster.x,
+            y=monster.y,
+            vx=dx * FIREBALL_SPEED,
+            vy=dy * FIREBALL_SPEED,
+            life=0.0,
+        )
     )
     room.next_monster_projectile_id += 1
 
@@ -1114,19 +1767,24 @@ def _spawn_fireball(room, monster, target_x, target_y):
 def _spawn_trees(room, count, avoid_players=None):
     room.decorations = []
     avoid_players = avoid_players or []
+    uniform = room.rng.uniform
+    choice = room.rng.choice
+    max_x = room.width - 80
+    max_y = room.height - 80
+    center_x = room.width / 2
+    center_y = room.height / 2
     for _ in range(count):
         for _ in range(8):
-            x = random.uniform(80, room.width - 80)
-            y = random.uniform(80, room.height - 80)
-            size = random.choice(["small", "medium", "large"])
-            radius = TREE_SIZES[size]["radius"]
-            if any(_rect_collides_circle(wall, x, y, radius) for wall in room.walls):
+            x = uniform(80, max_x)
+            y = uniform(80, max_y)
+            size, radius = choice(TREE_SIZE_CHOICES)
+            if abs(x - center_x) < 120 and abs(y - center_y) < 120:
                 continue
-            if avoid_players and any(
-                _circle_hit(x, y, radius + 40, player.x, player.y, PLAYER_RADIUS) for player in avoid_players
-            ):
+            if _walls_hit(room, x, y, radius):
                 continue
-            if abs(x - room.width / 2) < 120 and abs(y - room.height / 2) < 120:
+            if avoid_players and _players_within(
+                avoid_players, x, y, (radius + 40 + PLAYER_RADIUS) ** 2
+            ):
                 continue
             room.decorations.append(
                 {
@@ -1135,6 +1793,7 @@ def _spawn_trees(room, count, avoid_players=None):
                     "x": x,
                     "y": y,
                     "size": size,
+                    "radius": radius,
                 }
             )
             room.next_decoration_id += 1
@@ -1155,55 +1814,47 @@ def _ice_flag_target(room):
     return max(10, min(40, int(ICE_FLAG_TARGET * area_factor)))
 
 
-def _spawn_ice_tree(room, min_y, max_y):
-    alive_players = [player for player in room.players.values() if player.alive]
+def _spawn_ice_tree(room, min_y, max_y, alive_players=None):
+    if alive_players is None:
+        alive_players = _alive_players(room)
+    uniform = room.rng.uniform
+    max_x = room.width - 60
     for _ in range(12):
-        x = random.uniform(60, room.width - 60)
-        y = random.uniform(min_y, max_y)
-        size = random.choice(["small", "medium", "large"])
-        radius = TREE_SIZES[size]["radius"]
-        if alive_players and any(
-            _circle_hit(x, y, radius + ICE_TREE_SAFE_RADIUS, player.x, player.y, PLAYER_RADIUS)
-            for player in alive_players
-        ):
+        x = uniform(60, max_x)
+        y = uniform(min_y, max_y)
+        size, radius = room.rng.choice(TREE_SIZE_CHOICES)
+        if _players_within(alive_players, x, y, (radius + ICE_TREE_SAFE_RADIUS + PLAYER_RADIUS) ** 2):
             continue
-        if any(
-            _circle_hit(x, y, radius + _tree_radius(deco) + 6, deco["x"], deco["y"], _tree_radius(deco))
-            for deco in room.decorations
-        ):
+        if _ice_spot_blocked(room, x, y, radius):
             continue
-        room.decorations.append(
-            {
-                "id": room.next_decoration_id,
-                "type": "tree",
-                "x": x,
-                "y": y,
-                "size": size,
-            }
-        )
+        deco = {
+            "id": room.next_decoration_id,
+            "type": "tree",
+            "x": x,
+            "y": y + room.ice_scroll,
+            "size": size,
+            "radius": radius,
+        }
+        room.decorations.append(deco)
+        room.decorations_dirty = True
+        _grid_insert_tree(room, deco)
         room.next_decoration_id += 1
         break
 
 
-def _spawn_ice_flag(room, min_y, max_y):
-    alive_players = [player for player in room.players.values() if player.alive]
+def _spawn_ice_flag(room, min_y, max_y, alive_players=None):
+    if alive_players is None:
+        alive_players = _alive_players(room)
+    uniform = room.rng.uniform
+    max_x = room.width - 60
     for _ in range(12):
-        x = random.uniform(60, room.width - 60)
-        y = random.uniform(min_y, max_y)
-        if alive_players and any(
-            _circle_hit(x, y, GIFT_RADIUS + ICE_TREE_SAFE_RADIUS, player.x, player.y, PLAYER_RADIUS)
-            for player in alive_players
-        ):
+        x = uniform(60, max_x)
+        y = uniform(min_y, max_y)
+        if _players_within(alive_players, x, y, ICE_FLAG_PLAYER_CLEAR_SQ):
             continue
-        if any(
-            _circle_hit(x, y, GIFT_RADIUS + _tree_radius(deco) + 6, deco["x"], deco["y"], _tree_radius(deco))
-            for deco in room.decorations
-        ):
+        if _ice_spot_blocked(room, x, y, GIFT_RADIUS):
             continue
-        if any(
-            _circle_hit(x, y, GIFT_RADIUS + 6, gift["x"], gift["y"], GIFT_RADIUS)
-            for gift in room.gifts
-        ):
+        if _gifts_within(room.gifts, x, y, ICE_FLAG_GIFT_CLEAR_SQ):
             continue
         room.gifts.append(
             {
@@ -1226,27 +1877,28 @@ def _ice_difficulty(room):
 def _spawn_ice_finish_line(room):
     radius = TREE_SIZES["large"]["radius"]
     spacing = radius * 1.6
-    y = _ice_player_y(room)
+    y = _ice_player_y(room) + room.ice_scroll
     x = radius
+    room.decorations_dirty = True
     while x < room.width - radius:
-        room.decorations.append(
-            {
-                "id": room.next_decoration_id,
-                "type": "tree",
-                "x": x,
-                "y": y,
-                "size": "large",
-            }
-        )
+        deco = {
+            "id": room.next_decoration_id,
+            "type": "tree",
+            "x": x,
+            "y": y,
+            "size": "large",
+            "radius": radius,
+        }
+        room.decorations.append(deco)
+        _grid_insert_tree(room, deco)
         room.next_decoration_id += 1
         x += spacing
     room.ice_finish_line_spawned = True
 
 
-def _maze_walls(room):
-    width = room.width
-    height = room.height
-    walls = [
+@functools.lru_cache(maxsize=8)
+def _maze_wall_layout(width, height):
+    return (
         {"x": width * 0.08, "y": height * 0.08, "w": 18, "h": height * 0.8},
         {"x": width * 0.2, "y": height * 0.15, "w": 18, "h": height * 0.7},
         {"x": width * 0.32, "y": height * 0.05, "w": 18, "h": height * 0.75},
@@ -1262,11 +1914,19 @@ def _maze_walls(room):
         {"x": width * 0.52, "y": height * 0.78, "w": width * 0.22, "h": 18},
         {"x": width * 0.36, "y": height * 0.22, "w": width * 0.22, "h": 18},
         {"x": width * 0.58, "y": height * 0.28, "w": width * 0.22, "h": 18},
-    ]
-    return walls
+    )
 
 
-def _setup_round(room, round_type):
+def _maze_walls(room):
+    # Walls are never mutated, so rooms share the cached layout's dicts.
+    return list(_maze_wall_layout(room.width, room.height))
+
+
+def _setup_round(room, round_type, now=None):
+    if now is None:
+        now = time.time()
+    room.static_dirty = True
+    room.room_payload = None
     room.projectiles = []
     room.monster_projectiles = []
     room.monsters = []
@@ -1274,11 +1934,20 @@ def _setup_round(room, round_type):
     room.hazards = []
     room.gifts = []
     room.walls = []
+    room.wall_grid = {}
+    room.wall_bounds = ()
+    room.wall_grids_inflated = {}
+    room.deco_grid = {}
+    room.player_grid = {}
+    room.ice_scroll = 0.0
+    room.ice_grid_row = 0
     room.light = {}
     room.hill = {}
-    room.trails = []
+    room.trails = deque()
     room.trail_map = {}
+    room.trail_cells = []
     room.trails_dirty = []
+    room.trails_removed = []
     room.hazard_accum = 0.0
     room.gift_accum = 0.0
     room.hill_snow_accum = 0.0
@@ -1291,6 +1960,7 @@ def _setup_round(room, round_type):
     room.ice_finish_line_spawned = False
     room.ice_buffer_until = 0.0
     room.round_type = round_type
+    room.snowball_boss = None
     room.snowball_boss_active = False
     room.snowball_boss_hp = 0
     room.snowball_boss_max_hp = 0
@@ -1315,25 +1985,32 @@ def _setup_round(room, round_type):
         room.height = BASE_HEIGHT
 
     players = list(room.players.values())
-
-    if round_type == "snowball":
-        split = max(1, math.ceil(len(players) / 2))
-        for idx, player in enumerate(players):
-            player.team = 0 if idx < split else 1
-    else:
-        for player in players:
-            player.team = 0
-
+    player_count = len(players)
+    snowball = round_type == "snowball"
+    split = max(1, math.ceil(player_count / 2))
+    blue_team = []
+    red_team = []
+
+    room.alive_count = player_count
+    # One pass resets every per-round field; teams are collected on the way
+    # for the snowball edge spawns below.
     for idx, player in enumerate(players):
+        player.payload_static = None
         player.alive = True
         player.has_light = False
         player.round_score = 0
         player.score_accum = 0.0
         player.energy = 0.0
-        if round_type == "snowball":
-            base_rings = 4 if _is_holly_player(player) else 3
-            player.rings_left = base_rings
+        if snowball:
+            if idx < split:
+                player.team = 0
+                blue_team.append(player)
+            else:
+                player.team = 1
+                red_team.append(player)
+            player.rings_left = 4 if _is_holly_player(player) else 3
         else:
+            player.team = 0
             player.rings_left = 0
         player.input_x = 0.0
         player.input_y = 0.0
@@ -1354,9 +2031,12 @@ def _setup_round(room, round_type):
             player.ai_dir_x = 0.0
             player.ai_dir_y = 0.0
             player.ai_idle_until = 0.0
+            player.ai_retarget_ts = 0.0
+            player.ai_target_sid = ""
+            player.ai_target_monster = None
 
         if round_type == "survival":
-            spacing = room.width / (len(players) + 1)
+            spacing = room.width / (player_count + 1)
             player.x = spacing * (idx + 1)
             player.y = room.height - 50
         else:
@@ -1372,9 +2052,7 @@ def _setup_round(room, round_type):
         elif round_type == "hill":
             player.x, player.y = _hill_respawn_position(room)
 
-    if round_type == "snowball":
-        blue_team = [player for player in players if player.team == 0]
-        red_team = [player for player in players if player.team == 1]
+    if snowball:
         _edge_spawns(room, blue_team, start_angle=math.pi / 2, end_angle=3 * math.pi / 2)
         _edge_spawns(room, red_team, start_angle=-math.pi / 2, end_angle=math.pi / 2)
     elif round_type in {"light", "trails", "hunt", "hill", "thin_ice"}:
@@ -1389,14 +2067,15 @@ def _setup_round(room, round_type):
 
     if round_type == "hunt":
         _spawn_trees(room, HUNT_TREE_COUNT)
-        _spawn_snowball_boss(room, time.time())
+        _spawn_snowball_boss(room, now)
     elif round_type == "hill":
         _spawn_trees(room, HILL_TREE_COUNT)
     elif round_type == "maze":
         room.walls = _maze_walls(room)
-        _spawn_monsters(room)
+        _rebuild_wall_grid(room)
+        _spawn_monsters(room, now)
     if round_type == "ice":
-        room.ice_buffer_until = time.time() + ICE_START_BUFFER
+        room.ice_buffer_until = now + ICE_START_BUFFER
         flag_target = _ice_flag_target(room)
         for _ in range(flag_target):
             _spawn_ice_flag(room, 0.0, room.height + ICE_TREE_BUFFER)
@@ -1405,63 +2084,94 @@ def _setup_round(room, round_type):
         area_factor = (room.width * room.height) / (BASE_WIDTH * BASE_HEIGHT)
         count = max(24, min(140, int(32 * area_factor)))
         _spawn_trees(room, count)
+    _rebuild_deco_grid(room)
     if round_type == "light":
         room.light = {"x": room.width / 2, "y": room.height / 2, "holder": "", "heldFor": 0.0}
     if round_type in {"survival", "light", "trails", "bonus", "hunt"}:
-        base = max(2, min(8, len(players) + 1))
+        base = max(2, min(8, player_count + 1))
         speed_range = BONUS_MONSTER_SPEED if round_type == "bonus" else HAZARD_MONSTER_SPEED
         _spawn_roaming_monsters(room, base, speed_range=speed_range)
 
 
-def _update_projectiles(room, dt):
-    alive_projectiles = []
-    for projectile in room.projectiles:
-        projectile["x"] += projectile["vx"] * dt
-        projectile["y"] += projectile["vy"] * dt
-        projectile["life"] += dt
-        if (
-            projectile["life"] > PROJECTILE_LIFETIME
-            or projectile["x"] < -20
-            or projectile["x"] > room.width + 20
-            or projectile["y"] < -20
-            or projectile["y"] > room.height + 20
-        ):
-            continue
-        if room.walls and any(
-            _rect_collides_circle(wall, projectile["x"], projectile["y"], PROJECTILE_RADIUS)
-            for wall in room.walls
-        ):
+def _update_projectiles(room, dt, collide=None):
+    # collide(room, projectile) runs on each survivor in the same pass; a true
+    # return consumes the projectile.
+    projectiles = room.projectiles
+    if not projectiles:
+        return
+    max_x = room.width + 20
+    max_y = room.height + 20
+    radius = PROJECTILE_RADIUS
+    cell = GRID_CELL_SIZE
+    # Inlined single-cell probes of _walls_hit/_trees_hit; they are exact
+    # because the projectile radius is within GRID_QUERY_PAD.
+    wall_grid = room.wall_grid
+    if wall_grid:
+        wall_grid = _inflated_wall_grid(room, radius)
+        bx0, by0, bx1, by1 = room.wall_bounds
+        bx0 -= radius
+        by0 -= radius
+        bx1 += radius
+        by1 += radius
+    deco_grid = room.deco_grid
+    scroll = room.ice_scroll
+    kept = 0
+    # Integrate, cull and collide in a single pass, compacting survivors as we go.
+    for projectile in projectiles:
+        x = projectile.x + projectile.vx * dt
+        y = projectile.y + projectile.vy * dt
+        life = projectile.life + dt
+        projectile.x = x
+        projectile.y = y
+        projectile.life = life
+        if life > PROJECTILE_LIFETIME or x < -20 or x > max_x or y < -20 or y > max_y:
             continue
-        if room.decorations and any(
-            deco.get("type") == "tree"
-            and _circle_hit(
-                projectile["x"],
-                projectile["y"],
-                PROJECTILE_RADIUS,
-                deco["x"],
-                deco["y"],
-                _tree_radius(deco),
-            )
-            for deco in room.decorations
-        ):
+        if wall_grid and bx0 <= x <= bx1 and by0 <= y <= by1:
+            bucket = wall_grid.get((int(x // cell), int(y // cell)))
+            if bucket:
+                hit = False
+                for x0, y0, x1, y1 in bucket:
+                    if x0 <= x <= x1 and y0 <= y <= y1:
+                        hit = True
+                        break
+                if hit:
+                    continue
+        if deco_grid:
+            ty = y + scroll
+            bucket = deco_grid.get((int(x // cell), int(ty // cell)))
+            if bucket:
+                hit = False
+                for tree_x, tree_y, tree_radius in bucket:
+                    dx = x - tree_x
+                    dy = ty - tree_y
+                    if dx * dx + dy * dy <= (radius + tree_radius) ** 2:
+                        hit = True
+                        break
+                if hit:
+                    continue
+        if collide is not None and collide(room, projectile):
             continue
-        alive_projectiles.append(projectile)
-    room.projectiles = alive_projectiles
+        projectiles[kept] = projectile
+        kept += 1
+    del projectiles[kept:]
 
 
 def _remove_projectiles_on_player_hit(room):
     if not room.projectiles:
         return
-    remaining = []
-    for projectile in room.projectiles:
+    _rebuild_player_grid(room, room.players.values())
+    projectiles = room.projectiles
+    kept = 0
+    for projectile in projectiles:
         hit = False
-        for player in room.players.values():
-            if _circle_hit(projectile["x"], projectile["y"], PROJECTILE_RADIUS, player.x, player.y, PLAYER_RADIUS):
+        for player in _players_near(room, projectile.x, projectile.y, PROJECTILE_RADIUS):
+            if _hit_sq(projectile.x, projectile.y, player.x, player.y, PROJECTILE_HIT_SQ):
                 hit = True
                 break
         if not hit:
-            remaining.append(projectile)
-    room.projectiles = remaining
+            projectiles[kept] = projectile
+            kept += 1
+    del projectiles[kept:]
 
 
 def _add_trail_tile(room, player, tx, ty):
@@ -1469,19 +2179,31 @@ def _add_trail_tile(room, player, tx, ty):
     key = (tx, ty)
     if key in room.trail_map:
         return False
-    tile = {
-        "x": tx * size,
-        "y": ty * size,
-        "size": size,
-        "color": player.color,
-        "owner": player.sid,
-    }
+    tile = TrailTile(tx * size, ty * size, player.color, player.sid)
     room.trail_map[key] = tile
-    room.trails.append(tile)
+    cells = room.trail_cells
+    grid_w = room.trail_grid_w
+    if cells:
+        idx = ty * grid_w + tx
+        if 0 <= tx < grid_w and 0 <= idx < len(cells):
+            cells[idx] = tile
+    trails = room.trails
+    trails.append(tile)
     room.trails_dirty.append(tile)
-    if len(room.trails) > TRAIL_MAX_POINTS:
-        room.trails = room.trails[-TRAIL_MAX_POINTS:]
-        room.trail_map = {(int(t["x"] // size), int(t["y"] // size)): t for t in room.trails}
+    if len(trails) > TRAIL_MAX_POINTS:
+        # Evict the oldest tile from the map and cell list alongside the deque.
+        old = trails.popleft()
+        old_x = int(old.x // size)
+        old_y = int(old.y // size)
+        del room.trail_map[(old_x, old_y)]
+        if cells:
+            idx = old_y * grid_w + old_x
+            if 0 <= old_x < grid_w and 0 <= idx < len(cells):
+                cells[idx] = None
+        # Clients drop evicted tiles from the removal list; a cleared owner
+        # keeps a tile painted earlier this tick out of the updates.
+        old.owner = None
+        room.trails_removed.extend((old.x, old.y))
     return True
 
 
@@ -1495,10 +2217,10 @@ def _set_trail_tile(room, player, tx, ty):
     key = (tx, ty)
     existing = room.trail_map.get(key)
     if existing:
-        if existing["owner"] == player.sid:
+        if existing.owner == player.sid:
             return False
-        existing["color"] = player.color
-        existing["owner"] = player.sid
+        existing.color = player.color
+        existing.owner = player.sid
         room.trails_dirty.append(existing)
         return True
     return _add_trail_tile(room, player, tx, ty)
@@ -1536,8 +2258,7 @@ def _add_trail_path(room, player, start_x, start_y, end_x, end_y):
     return ex, ey, points > 0
 
 
-def _splash_trail(room, player):
-    now = time.time()
+def _splash_trail(room, player, now):
     if now < player.dash_ready_ts:
         return
     if room.round_elapsed < TRAIL_START_BUFFER:
@@ -1561,60 +2282,98 @@ def _splash_trail(room, player):
         player.round_score += points
 
 
-def _trail_region(room, start_x, start_y, grid_w, grid_h, visited):
+def _trail_cells(room):
+    # trail_map mirrored into a flat row-major list (None where empty), built
+    # on the first fill of a round and kept current by _add_trail_tile, so
+    # the fill search steps by index instead of hashing coordinate tuples.
+    if not room.trail_cells:
+        size = TRAIL_TILE_SIZE
+        grid_w = int(math.ceil(room.width / size))
+        grid_h = int(math.ceil(room.height / size))
+        cells = [None] * (grid_w * grid_h)
+        for (tx, ty), tile in room.trail_map.items():
+            if 0 <= tx < grid_w and 0 <= ty < grid_h:
+                cells[ty * grid_w + tx] = tile
+        room.trail_cells = cells
+        room.trail_grid_w = grid_w
+    return room.trail_cells
+
+
+@functools.lru_cache(maxsize=8)
+def _trail_edge_mask(grid_w, grid_h):
+    mask = bytearray(grid_w * grid_h)
+    for tx in range(grid_w):
+        mask[tx] = 1
+        mask[(grid_h - 1) * grid_w + tx] = 1
+    for ty in range(grid_h):
+        mask[ty * grid_w] = 1
+        mask[ty * grid_w + grid_w - 1] = 1
+    return bytes(mask)
+
+
+def _trail_region(cells, start, grid_w, edge, visited, escaped):
+    # Only enclosed regions get filled, so the search stops as soon as it
+    # reaches the map edge or a tile an earlier search already traced to the
+    # edge; those tiles go into escaped instead of visited. Border tiles stop
+    # the search before their neighbours are read, so indices never wrap.
     region = []
     boundary_owners = set()
-    touches_edge = False
-    stack = [(start_x, start_y)]
-    visited.add((start_x, start_y))
+    seen = {start}
+    stack = [start]
     while stack:
-        cx, cy = stack.pop()
-        region.append((cx, cy))
-        if cx == 0 or cy == 0 or cx == grid_w - 1 or cy == grid_h - 1:
-            touches_edge = True
-        for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1)):
-            nx = cx + dx
-            ny = cy + dy
-            if nx < 0 or ny < 0 or nx >= grid_w or ny >= grid_h:
-                touches_edge = True
-                continue
-            tile = room.trail_map.get((nx, ny))
+        idx = stack.pop()
+        region.append(idx)
+        if edge[idx]:
+            escaped.update(seen)
+            return region, True, boundary_owners
+        for key in (idx + 1, idx - 1, idx + grid_w, idx - grid_w):
+            tile = cells[key]
             if tile:
-                boundary_owners.add(tile["owner"])
+                boundary_owners.add(tile.owner)
                 continue
-            if (nx, ny) in visited:
+            if key in seen:
                 continue
-            visited.add((nx, ny))
-            stack.append((nx, ny))
-    return region, touches_edge, boundary_owners
+            if key in escaped:
+                escaped.update(seen)
+                return region, True, boundary_owners
+            seen.add(key)
+            stack.append(key)
+    visited.update(seen)
+    return region, False, boundary_owners
 
 
 def _fill_trail_loops(room, player, tx, ty):
-    size = TRAIL_TILE_SIZE
-    grid_w = int(math.ceil(room.width / size))
-    grid_h = int(math.ceil(room.height / size))
     same_neighbors = 0
     for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1)):
         tile = room.trail_map.get((tx + dx, ty + dy))
-        if tile and tile["owner"] == player.sid:
+        if tile and tile.owner == player.sid:
             same_neighbors += 1
     if same_neighbors < 2:
         return
+    cells = _trail_cells(room)
+    grid_w = room.trail_grid_w
+    grid_h = len(cells) // grid_w
+    edge = _trail_edge_mask(grid_w, grid_h)
     visited = set()
+    escaped = set()
     points = 0
     for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1)):
         nx = tx + dx
         ny = ty + dy
         if nx < 0 or ny < 0 or nx >= grid_w or ny >= grid_h:
             continue
-        if (nx, ny) in room.trail_map or (nx, ny) in visited:
+        start = ny * grid_w + nx
+        if cells[start] or start in visited or start in escaped:
             continue
-        region, touches_edge, boundary_owners = _trail_region(room, nx, ny, grid_w, grid_h, visited)
+        region, touches_edge, boundary_owners = _trail_region(
+            cells, start, grid_w, edge, visited, escaped
+        )
         if not region or touches_edge:
             continue
         if player.sid not in boundary_owners:
             continue
-        for rx, ry in region:
+        for idx in region:
+            ry, rx = divmod(idx, grid_w)
             if _add_trail_tile(room, player, rx, ry):
                 points += TRAIL_TILE_POINTS
     if points:
@@ -1622,10 +2381,11 @@ def _fill_trail_loops(room, player, tx, ty):
         player.round_score += points
 
 
-def _update_trails(room, dt):
-    for player in room.players.values():
-        if not player.alive:
-            continue
+def _update_trails(room, dt, now):
+    # One snapshot for every pass; players killed on the way are skipped by
+    # the alive checks.
+    players = _alive_players(room)
+    for player in players:
         prev_x = player.x
         prev_y = player.y
         _move_with_walls(room, player, dt, PLAYER_SPEED)
@@ -1637,26 +2397,27 @@ def _update_trails(room, dt):
     if room.round_elapsed < TRAIL_START_BUFFER or not room.trail_map:
         return
     size = TRAIL_TILE_SIZE
-    for player in room.players.values():
+    for player in players:
         if not player.alive:
             continue
         tx = int(player.x // size)
         ty = int(player.y // size)
         key = (tx, ty)
         tile = room.trail_map.get(key)
-        if tile and tile["owner"] != player.sid:
-            player.alive = False
+        if tile and tile.owner != player.sid:
+            _kill_player(room, player)
 
     _update_roaming_monsters(room, dt)
-    _handle_monster_collisions(room)
+    _handle_monster_collisions(room, players=players)
 
 
-def _update_hunt(room, dt):
+def _update_hunt(room, dt, now):
     _update_projectiles(room, dt)
     _handle_projectiles_on_hazard_monsters(room)
-    for player in room.players.values():
-        if not player.alive:
-            continue
+    # Snapshot once for every pass below; players killed along the way are
+    # still skipped by their alive checks.
+    alive_players = _alive_players(room)
+    for player in alive_players:
         _move_with_walls(room, player, dt, PLAYER_SPEED)
 
     difficulty = min(1.0, room.round_elapsed / max(1.0, room.round_duration))
@@ -1674,7 +2435,6 @@ def _update_hunt(room, dt):
     _handle_projectiles_on_hunt_monsters(room, HUNT_MONSTER_HIT_POINTS)
     _update_hunt_monsters(room, dt)
 
-    now = time.time()
     _update_snowball_boss(room, now)
 
     if not room.hazards:
@@ -1683,85 +2443,101 @@ def _update_hunt(room, dt):
     while room.gift_accum >= HUNT_SNOWBALL_INTERVAL:
         _spawn_big_snowball(room)
         room.gift_accum -= HUNT_SNOWBALL_INTERVAL
-    hazards = []
-    for hazard in room.hazards:
+    _rebuild_player_grid(room, alive_players)
+    width = room.width
+    height = room.height
+    hazards = room.hazards
+    kept = 0
+    for hazard in hazards:
         if hazard.get("type") != "big_snowball":
-            hazards.append(hazard)
+            hazards[kept] = hazard
+            kept += 1
             continue
-        hazard["x"] += hazard.get("vx", 0.0) * dt
-        hazard["y"] += hazard.get("vy", 0.0) * dt
+        x = hazard["x"] + hazard.get("vx", 0.0) * dt
+        y = hazard["y"] + hazard.get("vy", 0.0) * dt
+        hazard["x"] = x
+        hazard["y"] = y
         radius = hazard.get("radius", HAZARD_RADIUS)
-        if (
-            hazard["x"] < -radius
-            or hazard["x"] > room.width + radius
-            or hazard["y"] < -radius
-            or hazard["y"] > room.height + radius
-        ):
+        if x < -radius or x > width + radius or y < -radius or y > height + radius:
             continue
+        reach_sq = (radius + PLAYER_RADIUS) ** 2
         hit = False
-        for player in room.players.values():
-            if player.alive and _circle_hit(hazard["x"], hazard["y"], radius, player.x, player.y, PLAYER_RADIUS):
-                player.alive = False
+        for player in _players_near(room, x, y, radius):
+            if player.alive and _hit_sq(x, y, player.x, player.y, reach_sq):
+                _kill_player(room, player)
                 hit = True
                 break
         if not hit:
-            hazards.append(hazard)
-    room.hazards = hazards
+            hazards[kept] = hazard
+            kept += 1
+    del hazards[kept:]
 
-    boss = next((monster for monster in room.monsters if monster.get("type") == "boss"), None)
+    boss = room.snowball_boss
     if boss:
-        remaining = []
-        for projectile in room.projectiles:
-            if projectile.get("owner") == "boss":
-                for player in room.players.values():
+        projectiles = room.projectiles
+        kept = 0
+        for projectile in projectiles:
+            if projectile.owner == "boss":
+                for player in alive_players:
                     if not player.alive:
                         continue
-                    if _circle_hit(projectile["x"], projectile["y"], PROJECTILE_RADIUS, player.x, player.y, PLAYER_RADIUS):
-                        player.alive = False
+                    if _hit_sq(projectile.x, projectile.y, player.x, player.y, PROJECTILE_HIT_SQ):
+                        _kill_player(room, player)
                         break
                 else:
-                    remaining.append(projectile)
+                    projectiles[kept] = projectile
+                    kept += 1
                 continue
-            if _circle_hit(projectile["x"], projectile["y"], PROJECTILE_RADIUS, boss["x"], boss["y"], boss["radius"]):
-                shooter = room.players.get(projectile.get("owner"))
+            if _circle_hit(projectile.x, projectile.y, PROJECTILE_RADIUS, boss.x, boss.y, boss.radius):
+                shooter = room.players.get(projectile.owner)
                 if shooter:
                     shooter.score += 3
                     shooter.round_score += 3
-                boss["hp"] = max(0, boss.get("hp", SNOWBALL_BOSS_HP) - 1)
+                boss.hp = max(0, boss.hp - 1)
             else:
-                remaining.append(projectile)
-        room.projectiles = remaining
-        if boss.get("hp", 0) <= 0:
-            room.monsters = [monster for monster in room.monsters if monster.get("type") != "boss"]
+                projectiles[kept] = projectile
+                kept += 1
+        del projectiles[kept:]
+        if boss.hp <= 0:
+            room.monsters.remove(boss)
+            room.snowball_boss = None
             room.snowball_boss_active = False
             _announce(room, "Boss defeated! Bonus points!", duration=3.5)
 
+    # The player grid built above still holds: nobody has moved since.
     for monster in room.monsters:
-        radius = monster.get("radius", 16)
-        for player in room.players.values():
+        radius = monster.radius
+        reach = radius + PLAYER_RADIUS
+        mx = monster.x
+        my = monster.y
+        for player in _players_near(room, mx, my, radius):
             if not player.alive:
                 continue
-            if _circle_hit(monster["x"], monster["y"], radius, player.x, player.y, PLAYER_RADIUS):
-                player.alive = False
+            dx = mx - player.x
+            if dx > reach or dx < -reach:
+                continue
+            dy = my - player.y
+            if dx * dx + dy * dy <= reach * reach:
+                _kill_player(room, player)
 
 
-def _update_hill(room, dt):
+def _update_hill(room, dt, now):
     _update_projectiles(room, dt)
-    for player in room.players.values():
-        if not player.alive:
-            continue
-        if time.time() >= player.stun_until:
+    # Players only die in the monster pass at the end, so one alive snapshot
+    # serves every loop in this update.
+    alive_players = _alive_players(room)
+    for player in alive_players:
+        if now >= player.stun_until:
             _move_with_trees(room, player, dt, PLAYER_SPEED)
 
     hill = room.hill or {}
     hill_x = hill.get("x", room.width / 2)
     hill_y = hill.get("y", room.height * HILL_Y_OFFSET)
     hill_radius = hill.get("radius", HILL_RADIUS)
+    hill_reach_sq = (PLAYER_RADIUS + hill_radius) ** 2
 
-    for player in room.players.values():
-        if not player.alive:
-            continue
-        if _circle_hit(player.x, player.y, PLAYER_RADIUS, hill_x, hill_y, hill_radius):
+    for player in alive_players:
+        if _hit_sq(player.x, player.y, hill_x, hill_y, hill_reach_sq):
             player.score_accum += dt * HILL_POINTS_PER_SECOND
             while player.score_accum >= 1.0:
                 player.score += 1
@@ -1779,7 +2555,7 @@ def _update_hill(room, dt):
         room.hazard_accum -= spawn_interval
 
     if room.monsters:
-        room.monsters = []
+        room.monsters.clear()
 
     room.hill_snow_accum += dt
     while room.hill_snow_accum >= HILL_SNOWBALL_INTERVAL:
@@ -1791,30 +2567,31 @@ def _update_hill(room, dt):
         _spawn_hazard(room)
         room.hill_fall_accum -= HILL_FALLING_INTERVAL
 
-    hazards = []
-    for hazard in room.hazards:
+    hazards = room.hazards
+    kept = 0
+    width = room.width
+    height = room.height
+    for hazard in hazards:
+        x = hazard["x"]
         if hazard.get("type") == "big_snowball":
-            hazard["x"] += hazard.get("vx", 0.0) * dt
-            hazard["y"] += hazard.get("vy", 0.0) * dt
+            x += hazard.get("vx", 0.0) * dt
+            y = hazard["y"] + hazard.get("vy", 0.0) * dt
+            hazard["x"] = x
+            hazard["y"] = y
             radius = hazard.get("radius", HAZARD_RADIUS)
-            if (
-                hazard["x"] < -radius
-                or hazard["x"] > room.width + radius
-                or hazard["y"] < -radius
-                or hazard["y"] > room.height + radius
-            ):
+            if x < -radius or x > width + radius or y < -radius or y > height + radius:
                 continue
         else:
-            hazard["y"] += hazard.get("vy", 0.0) * dt
-            if hazard["y"] > room.height + 30:
+            y = hazard["y"] + hazard.get("vy", 0.0) * dt
+            hazard["y"] = y
+            if y > height + 30:
                 continue
             radius = HAZARD_RADIUS
+        reach_sq = (radius + PLAYER_RADIUS) ** 2
         hit = False
-        for player in room.players.values():
-            if not player.alive:
-                continue
-            if _circle_hit(hazard["x"], hazard["y"], radius, player.x, player.y, PLAYER_RADIUS):
-                if _circle_hit(player.x, player.y, PLAYER_RADIUS, hill_x, hill_y, hill_radius):
+        for player in alive_players:
+            if _hit_sq(x, y, player.x, player.y, reach_sq):
+                if _hit_sq(player.x, player.y, hill_x, hill_y, hill_reach_sq):
                     player.x, player.y = _hill_respawn_position(room)
                 else:
                     player.x, player.y = _move_entity(
@@ -1827,55 +2604,58 @@ def _update_hill(room, dt):
                         1.0,
                         PLAYER_RADIUS,
                     )
-                player.stun_until = time.time() + HILL_STUN_DURATION
+                player.stun_until = now + HILL_STUN_DURATION
                 hit = True
                 break
         if not hit:
-            hazards.append(hazard)
-    room.hazards = hazards
-
-    remaining_projectiles = []
-    for projectile in room.projectiles:
-        shooter = room.players.get(projectile.get("owner"))
+            hazards[kept] = hazard
+            kept += 1
+    del hazards[kept:]
+
+    projectiles = room.projectiles
+    kept = 0
+    for projectile in projectiles:
+        owner = projectile.owner
         hit = False
-        for player in room.players.values():
-            if player.sid == projectile.get("owner"):
+        for player in alive_players:
+            if player.sid == owner:
                 continue
-            if not player.alive:
-                continue
-            if _circle_hit(projectile["x"], projectile["y"], PROJECTILE_RADIUS, player.x, player.y, PLAYER_RADIUS):
-                if _circle_hit(player.x, player.y, PLAYER_RADIUS, hill_x, hill_y, hill_radius):
+            if _hit_sq(projectile.x, projectile.y, player.x, player.y, PROJECTILE_HIT_SQ):
+                if _hit_sq(player.x, player.y, hill_x, hill_y, hill_reach_sq):
                     player.x, player.y = _hill_respawn_position(room)
                 else:
+                    # Only hits need the shooter, so the lookup waits until here.
+                    shooter = room.players.get(owner)
                     if shooter:
                         dx = player.x - shooter.x
                         dy = player.y - shooter.y + 0.35
                     else:
-                        dx = projectile.get("vx", 0.0)
-                        dy = projectile.get("vy", 0.0) + 0.35
+                        dx = projectile.vx
+                        dy = projectile.vy + 0.35
                     mag = math.hypot(dx, dy) or 1.0
                     dx /= mag
                     dy /= mag
                     player.x, player.y = _move_entity(
                         room, player.x, player.y, dx, dy, HILL_KNOCKBACK_DISTANCE, 1.0, PLAYER_RADIUS
                     )
-                player.stun_until = time.time() + HILL_STUN_DURATION
+                player.stun_until = now + HILL_STUN_DURATION
                 hit = True
                 break
         if not hit:
-            remaining_projectiles.append(projectile)
-    room.projectiles = remaining_projectiles
+            projectiles[kept] = projectile
+            kept += 1
+    del projectiles[kept:]
 
     for monster in room.monsters:
-        radius = monster.get("radius", 16)
-        for player in room.players.values():
+        reach_sq = (monster.radius + PLAYER_RADIUS) ** 2
+        for player in alive_players:
             if not player.alive:
                 continue
-            if _circle_hit(monster["x"], monster["y"], radius, player.x, player.y, PLAYER_RADIUS):
-                player.alive = False
+            if _hit_sq(monster.x, monster.y, player.x, player.y, reach_sq):
+                _kill_player(room, player)
 
 
-def _update_thin_ice(room, dt):
+def _update_thin_ice(room, dt, now):
     for player in room.players.values():
         if not player.alive:
             continue
@@ -1884,7 +2664,7 @@ def _update_thin_ice(room, dt):
         ty = int(player.y // THIN_ICE_TILE_SIZE)
         key = (tx, ty)
         if key in room.thin_ice_broken and key != player.thin_ice_last_key:
-            player.alive = False
+            _kill_player(room, player)
             continue
         if key not in room.thin_ice_broken:
             room.thin_ice_broken.add(key)
@@ -1897,35 +2677,40 @@ def _update_thin_ice(room, dt):
             player.score_accum -= 1.0
 
 
-def _handle_light_projectiles(room):
+def _handle_light_projectiles(room, players=None):
     if not room.projectiles:
         return
+    if players is None:
+        players = list(room.players.values())
+    # Projectile hits in this round never change who is alive.
+    alive_players = [player for player in players if player.alive]
     light = room.light or {}
     holder_id = light.get("holder") if light else ""
-    remaining = []
-    for projectile in room.projectiles:
+    _rebuild_player_grid(room, alive_players)
+    projectiles = room.projectiles
+    kept = 0
+    for projectile in projectiles:
         hit_player = None
-        for player in room.players.values():
-            if not player.alive:
-                continue
-            if _circle_hit(projectile["x"], projectile["y"], PROJECTILE_RADIUS, player.x, player.y, PLAYER_RADIUS):
+        for player in _players_near(room, projectile.x, projectile.y, PROJECTILE_RADIUS):
+            if _hit_sq(projectile.x, projectile.y, player.x, player.y, PROJECTILE_HIT_SQ):
                 hit_player = player
                 break
         if not hit_player:
-            remaining.append(projectile)
+            projectiles[kept] = projectile
+            kept += 1
             continue
         if holder_id and hit_player.sid == holder_id:
-            shooter = room.players.get(projectile.get("owner"))
+            shooter = room.players.get(projectile.owner)
             if shooter and shooter.sid != holder_id and not shooter.has_light:
                 shooter.score += LIGHT_HIT_BONUS
                 shooter.round_score += LIGHT_HIT_BONUS
-                for player in room.players.values():
+                for player in players:
                     player.has_light = False
                 light["holder"] = ""
                 light["heldFor"] = 0.0
                 light["x"], light["y"] = _random_light_position(room)
                 holder_id = ""
-    room.projectiles = remaining
+    del projectiles[kept:]
 
 
 def _update_ai(room, now):
@@ -1933,27 +2718,31 @@ def _update_ai(room, now):
         return
     light = room.light or {}
     holder_id = light.get("holder") if light else ""
+    # Bot actions only set inputs and spawn projectiles, so nobody dies
+    # while this loop runs.
+    alive_players = _alive_players(room)
+    ice_tree_rows = {}
+    monsters_by_id = None
+    # Room fields and helpers read per bot are bound once; none of them
+    # change while bots pick inputs.
+    rand = room.rng.random
+    in_round = room.status == "in_round"
+    round_type = room.round_type
+    set_input = _set_bot_input
+    wander = _ai_wander
     for player in room.players.values():
         if not player.is_bot:
             continue
-        if room.status == "in_round" and not player.alive:
+        if not in_round or not player.alive:
             player.input_x = 0.0
             player.input_y = 0.0
             continue
-        if room.status in {"lobby", "between_rounds"}:
-            player.input_x = 0.0
-            player.input_y = 0.0
-            continue
-        if room.status != "in_round":
-            player.input_x = 0.0
-            player.input_y = 0.0
-            continue
-        if _ai_maybe_idle(player, now):
+        if _ai_maybe_idle(room, player, now):
             continue
 
-        if room.round_type == "survival":
-            if random.random() < AI_WANDER_CHANCE:
-                _ai_wander(room, player, now, speed=0.5)
+        if round_type == "survival":
+            if rand() < AI_WANDER_CHANCE:
+                wander(room, player, now, speed=0.5)
                 continue
             target_dx = 0.0
             nearest_hazard = None
@@ -1965,7 +2754,7 @@ def _update_ai(room, now):
                 if dist < nearest_dist:
                     nearest_dist = dist
                     nearest_hazard = hazard
-            if nearest_hazard and nearest_dist < 80 and random.random() > 0.25:
+            if nearest_hazard and nearest_dist < 80 and rand() > 0.25:
                 target_dx = -1.0 if nearest_hazard["x"] > player.x else 1.0
             else:
                 nearest_gift = None
@@ -1979,77 +2768,51 @@ def _update_ai(room, now):
                     target_dx = nearest_gift["x"] - player.x
                 else:
                     target_dx = room.width / 2 - player.x
-            _set_bot_input(player, target_dx, 0.0, speed_scale=0.7)
+            set_input(player, target_dx, 0.0, speed_scale=0.7)
             continue
 
-        if room.round_type == "snowball":
-            if random.random() < AI_WANDER_CHANCE:
-                _ai_wander(room, player, now, speed=0.6)
+        if round_type == "snowball":
+            if rand() < AI_WANDER_CHANCE:
+                wander(room, player, now, speed=0.6)
                 continue
-            target = None
-            best_dist = 1e9
-            for other in room.players.values():
-                if other.sid == player.sid or not other.alive:
-                    continue
-                if other.team == player.team:
-                    continue
-                dx = other.x - player.x
-                dy = other.y - player.y
-                dist = math.hypot(dx, dy)
-                if dist < best_dist:
-                    best_dist = dist
-                    target = other
+            target = _ai_player_target(room, player, alive_players, now, enemies_only=True)
             if target:
                 dx = target.x - player.x
                 dy = target.y - player.y
+                best_sq = dx * dx + dy * dy
                 aim_dx = dx
                 aim_dy = dy
-                if best_dist < 120 and random.random() > 0.35:
+                if best_sq < 120 * 120 and rand() > 0.35:
                     dx = -dx
                     dy = -dy
-                _set_bot_input(player, dx, dy, speed_scale=0.8)
-                if best_dist < AI_SNOWBALL_RANGE and _ai_ready_action(
-                    player, now, AI_ACTION_COOLDOWNS["snowball"]
+                set_input(player, dx, dy, speed_scale=0.8)
+                if best_sq < AI_SNOWBALL_RANGE_SQ and _ai_ready_action(
+                    room, player, now, AI_ACTION_COOLDOWNS["snowball"]
                 ):
-                    if random.random() >= AI_SHOT_HESITATE_CHANCE:
-                        aim_dx, aim_dy = _ai_aim_noise(aim_dx, aim_dy, AI_AIM_JITTER)
-                        aim_dx, aim_dy = _normalize_input(aim_dx, aim_dy)
-                        if abs(aim_dx) > 0.05 or abs(aim_dy) > 0.05:
-                            player.facing_x = aim_dx
-                            player.facing_y = aim_dy
-                        _perform_action(room, player)
+                    if rand() >= AI_SHOT_HESITATE_CHANCE:
+                        _ai_fire(room, player, now, aim_dx, aim_dy)
             else:
-                _ai_wander(room, player, now, speed=0.6)
+                wander(room, player, now, speed=0.6)
             continue
 
-        if room.round_type == "light":
+        if round_type == "light":
             if holder_id == player.sid:
-                if random.random() < AI_WANDER_CHANCE:
-                    _ai_wander(room, player, now, speed=0.6)
+                if rand() < AI_WANDER_CHANCE:
+                    wander(room, player, now, speed=0.6)
                     continue
-                nearest = None
-                best_dist = 1e9
-                for other in room.players.values():
-                    if other.sid == player.sid or not other.alive:
-                        continue
-                    dx = other.x - player.x
-                    dy = other.y - player.y
-                    dist = math.hypot(dx, dy)
-                    if dist < best_dist:
-                        best_dist = dist
-                        nearest = other
+                nearest = _ai_player_target(room, player, alive_players, now)
                 if nearest:
-                    _set_bot_input(
+                    set_input(
                         player,
                         player.x - nearest.x,
                         player.y - nearest.y,
                         speed_scale=0.85,
                     )
                 else:
-                    _ai_wander(room, player, now, speed=0.6)
+                    wander(room, player, now, speed=0.6)
             else:
-                if random.random() < AI_WANDER_CHANCE:
-                    _ai_wander(room, player, now, speed=0.6)
+                if rand() < AI_WANDER_CHANCE:
+                    wander(room, player, now, speed=0.6)
                     continue
                 target_x = None
                 target_y = None
@@ -2063,123 +2826,102 @@ def _update_ai(room, now):
                 if target_x is not None and target_y is not None:
                     dx = target_x - player.x
                     dy = target_y - player.y
-                    _set_bot_input(player, dx, dy, speed_scale=0.85)
-                    dist = math.hypot(dx, dy)
-                    if dist < AI_LIGHT_SHOT_RANGE and _ai_ready_action(
-                        player, now, AI_ACTION_COOLDOWNS["light"]
+                    set_input(player, dx, dy, speed_scale=0.85)
+                    if dx * dx + dy * dy < AI_LIGHT_SHOT_RANGE_SQ and _ai_ready_action(
+                        room, player, now, AI_ACTION_COOLDOWNS["light"]
                     ):
-                        if random.random() >= AI_SHOT_HESITATE_CHANCE:
-                            aim_dx, aim_dy = _ai_aim_noise(dx, dy, AI_AIM_JITTER)
-                            aim_dx, aim_dy = _normalize_input(aim_dx, aim_dy)
-                            if abs(aim_dx) > 0.05 or abs(aim_dy) > 0.05:
-                                player.facing_x = aim_dx
-                                player.facing_y = aim_dy
-                            _perform_action(room, player)
+                        if rand() >= AI_SHOT_HESITATE_CHANCE:
+                            _ai_fire(room, player, now, dx, dy)
                 else:
-                    _ai_wander(room, player, now, speed=0.6)
+                    wander(room, player, now, speed=0.6)
             continue
 
-        if room.round_type == "maze":
-            if random.random() < AI_WANDER_CHANCE:
-                _ai_wander(room, player, now, speed=0.6)
+        if round_type == "maze":
+            if rand() < AI_WANDER_CHANCE:
+                wander(room, player, now, speed=0.6)
                 continue
-            target = None
-            best_dist = 1e9
-            for monster in room.monsters:
-                dx = monster["x"] - player.x
-                dy = monster["y"] - player.y
-                dist = math.hypot(dx, dy)
-                if dist < best_dist:
-                    best_dist = dist
-                    target = monster
+            if monsters_by_id is None:
+                monsters_by_id = {monster.id: monster for monster in room.monsters}
+            target = _ai_monster_target(room, player, monsters_by_id, now)
             if target:
-                dx = target["x"] - player.x
-                dy = target["y"] - player.y
+                dx = target.x - player.x
+                dy = target.y - player.y
+                best_sq = dx * dx + dy * dy
                 aim_dx = dx
                 aim_dy = dy
-                if best_dist < 90 and random.random() > 0.35:
+                if best_sq < 90 * 90 and rand() > 0.35:
                     dx = -dx
                     dy = -dy
-                _set_bot_input(player, dx, dy, speed_scale=0.8)
-                if best_dist < AI_MAZE_SHOT_RANGE and _ai_ready_action(
-                    player, now, AI_ACTION_COOLDOWNS["maze"]
+                set_input(player, dx, dy, speed_scale=0.8)
+                if best_sq < AI_MAZE_SHOT_RANGE_SQ and _ai_ready_action(
+                    room, player, now, AI_ACTION_COOLDOWNS["maze"]
                 ):
-                    if random.random() >= AI_SHOT_HESITATE_CHANCE:
-                        aim_dx, aim_dy = _ai_aim_noise(aim_dx, aim_dy, AI_AIM_JITTER)
-                        aim_dx, aim_dy = _normalize_input(aim_dx, aim_dy)
-                        if abs(aim_dx) > 0.05 or abs(aim_dy) > 0.05:
-                            player.facing_x = aim_dx
-                            player.facing_y = aim_dy
-                        _perform_action(room, player)
+                    if rand() >= AI_SHOT_HESITATE_CHANCE:
+                        _ai_fire(room, player, now, aim_dx, aim_dy)
             else:
-                _ai_wander(room, player, now, speed=0.6)
+                wander(room, player, now, speed=0.6)
             continue
 
-        if room.round_type in {"hunt", "hill"}:
-            target = None
-            best_dist = 1e9
-            for monster in room.monsters:
-                dx = monster["x"] - player.x
-                dy = monster["y"] - player.y
-                dist = math.hypot(dx, dy)
-                if dist < best_dist:
-                    best_dist = dist
-                    target = monster
+        if round_type in {"hunt", "hill"}:
+            if monsters_by_id is None:
+                monsters_by_id = {monster.id: monster for monster in room.monsters}
+            target = _ai_monster_target(room, player, monsters_by_id, now)
             if target:
-                dx = target["x"] - player.x
-                dy = target["y"] - player.y
+                dx = target.x - player.x
+                dy = target.y - player.y
+                best_sq = dx * dx + dy * dy
                 aim_dx = dx
                 aim_dy = dy
-                if best_dist < 90 and random.random() > 0.35:
+                if best_sq < 90 * 90 and rand() > 0.35:
                     dx = -dx
                     dy = -dy
-                _set_bot_input(player, dx, dy, speed_scale=0.85)
-                if best_dist < AI_MAZE_SHOT_RANGE and _ai_ready_action(
-                    player, now, AI_ACTION_COOLDOWNS["hunt"]
+                set_input(player, dx, dy, speed_scale=0.85)
+                if best_sq < AI_MAZE_SHOT_RANGE_SQ and _ai_ready_action(
+                    room, player, now, AI_ACTION_COOLDOWNS["hunt"]
                 ):
-                    if random.random() >= AI_SHOT_HESITATE_CHANCE:
-                        aim_dx, aim_dy = _ai_aim_noise(aim_dx, aim_dy, AI_AIM_JITTER)
-                        aim_dx, aim_dy = _normalize_input(aim_dx, aim_dy)
-                        if abs(aim_dx) > 0.05 or abs(aim_dy) > 0.05:
-                            player.facing_x = aim_dx
-                            player.facing_y = aim_dy
-                        _perform_action(room, player)
-            elif room.round_type == "hill" and room.hill:
-                _set_bot_input(player, room.hill["x"] - player.x, room.hill["y"] - player.y, speed_scale=0.85)
+                    if rand() >= AI_SHOT_HESITATE_CHANCE:
+                        _ai_fire(room, player, now, aim_dx, aim_dy)
+            elif round_type == "hill" and room.hill:
+                set_input(player, room.hill["x"] - player.x, room.hill["y"] - player.y, speed_scale=0.85)
             else:
-                _ai_wander(room, player, now, speed=0.6)
+                wander(room, player, now, speed=0.6)
             continue
 
-        if room.round_type == "trails":
-            if random.random() < AI_WANDER_CHANCE:
-                _ai_wander(room, player, now, speed=0.6)
+        if round_type == "trails":
+            if rand() < AI_WANDER_CHANCE:
+                wander(room, player, now, speed=0.6)
             else:
                 _ai_target_point(room, player, now, speed=0.7)
             continue
 
-        if room.round_type == "thin_ice":
-            if random.random() < AI_WANDER_CHANCE:
-                _ai_wander(room, player, now, speed=0.6)
+        if round_type == "thin_ice":
+            if rand() < AI_WANDER_CHANCE:
+                wander(room, player, now, speed=0.6)
             else:
                 _ai_target_point(room, player, now, speed=0.65)
             continue
 
-        if room.round_type == "ice":
-            nearest_tree = None
+        if round_type == "ice":
+            # Skiers share one row, so every bot sees the same trees ahead.
+            tree_xs = ice_tree_rows.get(player.y)
+            if tree_xs is None:
+                track_y = player.y + room.ice_scroll
+                tree_xs = ice_tree_rows[player.y] = [
+                    deco["x"]
+                    for deco in room.decorations
+                    if deco.get("type") == "tree" and abs(deco["y"] - track_y) <= 90
+                ]
+            nearest_x = None
             nearest_dist = 1e9
-            for deco in room.decorations:
-                if deco.get("type") != "tree":
-                    continue
-                if abs(deco["y"] - player.y) > 90:
-                    continue
-                dist = abs(deco["x"] - player.x)
+            for tree_x in tree_xs:
+                dist = abs(tree_x - player.x)
                 if dist < nearest_dist:
                     nearest_dist = dist
-                    nearest_tree = deco
-            if nearest_tree and nearest_dist < 70 and random.random() > 0.25:
-                _set_bot_input(
+                    nearest_x = tree_x
+            if nearest_x is not None and nearest_dist < 70 and rand() > 0.25:
+                set_input(
                     player,
-                    -1.0 if nearest_tree["x"] > player.x else 1.0,
+                    -1.0 if nearest_x > player.x else 1.0,
                     0.0,
                     speed_scale=0.75,
                 )
@@ -2192,29 +2934,85 @@ def _update_ai(room, now):
                         gift_dist = dist
                         nearest_gift = gift
                 if nearest_gift:
-                    _set_bot_input(player, nearest_gift["x"] - player.x, 0.0, speed_scale=0.75)
+                    set_input(player, nearest_gift["x"] - player.x, 0.0, speed_scale=0.75)
                 else:
-                    _set_bot_input(player, room.width / 2 - player.x, 0.0, speed_scale=0.75)
+                    set_input(player, room.width / 2 - player.x, 0.0, speed_scale=0.75)
             continue
 
-        if room.round_type == "bonus":
+        if round_type == "bonus":
             player.input_x = 0.0
             player.input_y = 0.0
-            if _ai_ready_action(player, now, AI_ACTION_COOLDOWNS["bonus"]):
-                if random.random() < AI_SHOT_HESITATE_CHANCE:
+            if _ai_ready_action(room, player, now, AI_ACTION_COOLDOWNS["bonus"]):
+                if rand() < AI_SHOT_HESITATE_CHANCE:
                     continue
-                _perform_action(room, player)
+                _perform_action(room, player, now)
             continue
 
-        _ai_wander(room, player, now, speed=0.6)
+        wander(room, player, now, speed=0.6)
+
+
+def _room_idle(room):
+    # Outside a round nothing moves without input or snowballs in flight, and
+    # bots are held still, so the whole update can be skipped. A finished
+    # game is never stepped at all.
+    if room.status not in IDLE_STATUSES or room.projectiles:
+        return False
+    for player in room.players.values():
+        if player.input_x or player.input_y:
+            return False
+    return True
 
 
-def _update_lobby(room, dt):
+def _clamp_idle_players(room):
+    # Rounds resize the arena, and an idle room skips the movement step that
+    # would otherwise pull players left outside back in.
+    room.clamped_size = (room.width, room.height)
+    for player in room.players.values():
+        player.x, player.y = _player_bounds(room, player.x, player.y)
+
+
+def _idle_world_key(room):
+    # Only socket handlers change an idle room (joins, leaves, colors,
+    # purchases, host handoff, game start), so this stands in for its world
+    # payload. Round entities left over between rounds are frozen.
+    return (
+        room.static_dirty,
+        room.status,
+        room.host_sid,
+        room.round_type,
+        room.current_round,
+        room.max_rounds,
+        room.round_ends_at,
+        room.width,
+        room.height,
+        tuple(
+            (
+                player.payload_static,
+                player.x,
+                player.y,
+                player.alive,
+                player.has_light,
+                player.facing_x,
+                player.facing_y,
+                player.score,
+                player.round_score,
+                player.rings_left,
+                player.crowns,
+                tuple(player.items),
+                player.dash_ready_ts,
+            )
+            for player in room.players.values()
+        ),
+    )
+
+
+def _update_lobby(room, dt, now):
     for player in room.players.values():
         _move_with_walls(room, player, dt, PLAYER_SPEED)
 
 
-def _update_survival(room, dt):
+def _update_survival(room, dt, now):
+    players = _alive_players(room)
     room.hazard_accum += dt
     room.gift_accum += dt
     while room.hazard_accum >= 0.6:
@@ -2224,48 +3022,68 @@ def _update_survival(room, dt):
         _spawn_falling_gift(room)
         room.gift_accum -= 1.8
 
-    for player in room.players.values():
-        if not player.alive:
-            continue
+    player_row = room.height - 50
+    floor_y = room.height + 30
+    max_x = room.width - PLAYER_RADIUS
+    for player in players:
         speed = SURVIVAL_SPEED * _player_speed_multiplier(player)
-        player.x = _clamp(player.x + player.input_x * speed * dt, PLAYER_RADIUS, room.width - PLAYER_RADIUS)
-        player.y = room.height - 50
+        x = player.x + player.input_x * speed * dt
+        if x >= max_x:
+            x = max_x
+        if x <= PLAYER_RADIUS:
+            x = PLAYER_RADIUS
+        player.x = x
+        player.y = player_row
         player.score_accum += dt
         while player.score_accum >= 1.0:
             player.score += 1
             player.round_score += 1
             player.score_accum -= 1.0
 
-    hazards = []
-    for hazard in room.hazards:
-        hazard["y"] += hazard["vy"] * dt
-        if hazard["y"] > room.height + 30:
+    # Every survivor sits on player_row, so falling items can only touch
+    # someone once they are within reach of that row.
+    hazard_reach = HAZARD_RADIUS + PLAYER_RADIUS
+    hazards = room.hazards
+    kept = 0
+    for hazard in hazards:
+        y = hazard["y"] + hazard["vy"] * dt
+        hazard["y"] = y
+        if y > floor_y:
             continue
         hit = False
-        for player in room.players.values():
-            if player.alive and _circle_hit(hazard["x"], hazard["y"], HAZARD_RADIUS, player.x, player.y, PLAYER_RADIUS):
-                player.alive = False
-                hit = True
-                break
+        if abs(y - player_row) <= hazard_reach:
+            x = hazard["x"]
+            for player in players:
+                if player.alive and _hit_sq(x, y, player.x, player.y, HAZARD_HIT_SQ):
+                    _kill_player(room, player)
+                    hit = True
+                    break
         if not hit:
-            hazards.append(hazard)
-    room.hazards = hazards
-
-    gifts = []
-    for gift in room.gifts:
-        gift["y"] += gift["vy"] * dt
-        if gift["y"] > room.height + 30:
+            hazards[kept] = hazard
+            kept += 1
+    del hazards[kept:]
+
+    gift_reach = GIFT_RADIUS + PLAYER_RADIUS
+    gifts = room.gifts
+    kept = 0
+    for gift in gifts:
+        y = gift["y"] + gift["vy"] * dt
+        gift["y"] = y
+        if y > floor_y:
             continue
         collected = False
-        for player in room.players.values():
-            if player.alive and _circle_hit(gift["x"], gift["y"], GIFT_RADIUS, player.x, player.y, PLAYER_RADIUS):
-                player.score += SURVIVAL_GIFT_POINTS
-                player.round_score += SURVIVAL_GIFT_POINTS
-                collected = True
-                break
+        if abs(y - player_row) <= gift_reach:
+            x = gift["x"]
+            for player in players:
+                if player.alive and _hit_sq(x, y, player.x, player.y, GIFT_HIT_SQ):
+                    player.score += SURVIVAL_GIFT_POINTS
+                    player.round_score += SURVIVAL_GIFT_POINTS
+                    collected = True
+                    break
         if not collected:
-            gifts.append(gift)
-    room.gifts = gifts
+            gifts[kept] = gift
+            kept += 1
+    del gifts[kept:]
 
     _update_projectiles(room, dt)
     _handle_projectiles_on_hazard_monsters(room)
@@ -2273,11 +3091,9 @@ def _update_survival(room, dt):
     _handle_monster_collisions(room)
 
 
-def _update_snowball(room, dt):
-    now = time.time()
-    for player in room.players.values():
-        if not player.alive:
-            continue
+def _update_snowball(room, dt, now):
+    players = _alive_players(room)
+    for player in players:
         _move_with_walls(room, player, dt, PLAYER_SPEED)
 
     room.hazard_accum += dt
@@ -2285,68 +3101,67 @@ def _update_snowball(room, dt):
         _spawn_big_snowball(room)
         room.hazard_accum -= SNOWBALL_HAZARD_INTERVAL
 
-    hazards = []
-    for hazard in room.hazards:
-        hazard["x"] += hazard["vx"] * dt
-        hazard["y"] += hazard["vy"] * dt
+    _rebuild_player_grid(room, players)
+    width = room.width
+    height = room.height
+    hazards = room.hazards
+    kept = 0
+    for hazard in hazards:
+        x = hazard["x"] + hazard["vx"] * dt
+        y = hazard["y"] + hazard["vy"] * dt
+        hazard["x"] = x
+        hazard["y"] = y
         radius = hazard.get("radius", HAZARD_RADIUS)
-        if (
-            hazard["x"] < -radius
-            or hazard["x"] > room.width + radius
-            or hazard["y"] < -radius
-            or hazard["y"] > room.height + radius
-        ):
+        if x < -radius or x > width + radius or y < -radius or y > height + radius:
             continue
+        reach_sq = (radius + PLAYER_RADIUS) ** 2
         hit = False
-        for player in room.players.values():
+        for player in _players_near(room, x, y, radius):
             if not player.alive:
                 continue
-            if _circle_hit(hazard["x"], hazard["y"], radius, player.x, player.y, PLAYER_RADIUS):
-                player.alive = False
+            if _hit_sq(x, y, player.x, player.y, reach_sq):
+                _kill_player(room, player)
                 player.rings_left = 0
                 hit = True
                 break
         if not hit:
-            hazards.append(hazard)
-    room.hazards = hazards
+            hazards[kept] = hazard
+            kept += 1
+    del hazards[kept:]
 
-    _update_projectiles(room, dt)
+    _update_projectiles(room, dt, collide=_snowball_projectile_hit)
 
-    remaining = []
-    for projectile in room.projectiles:
-        hit = False
-        shooter = room.players.get(projectile["owner"])
-        if not shooter:
+
+def _snowball_projectile_hit(room, projectile):
+    shooter = room.players.get(projectile.owner)
+    if not shooter:
+        return True
+    for player in _players_near(room, projectile.x, projectile.y, PROJECTILE_RADIUS):
+        if player is shooter:
             continue
-        for player in room.players.values():
-            if player.sid == projectile["owner"]:
-                continue
-            if not player.alive:
-                continue
-            if player.team == shooter.team:
-                continue
-            if _circle_hit(projectile["x"], projectile["y"], PROJECTILE_RADIUS, player.x, player.y, PLAYER_RADIUS):
-                player.rings_left = max(0, player.rings_left - 1)
-                if player.rings_left == 0:
-                    player.alive = False
-                    shooter.score += 20
-                    shooter.round_score += 20
-                hit = True
-                break
-        if not hit:
-            remaining.append(projectile)
-    room.projectiles = remaining
+        if not player.alive:
+            continue
+        if player.team == shooter.team:
+            continue
+        if _hit_sq(projectile.x, projectile.y, player.x, player.y, PROJECTILE_HIT_SQ):
+            player.rings_left = max(0, player.rings_left - 1)
+            if player.rings_left == 0:
+                _kill_player(room, player)
+                shooter.score += 20
+                shooter.round_score += 20
+            return True
+    return False
 
 
-def _update_ice(room, dt):
+def _update_ice(room, dt, now):
     difficulty = _ice_difficulty(room)
     scroll_speed = ICE_SCROLL_SPEED + ICE_SCROLL_RAMP * difficulty
     scroll = scroll_speed * dt
     player_y = _ice_player_y(room)
+    players = _alive_players(room)
 
-    for player in room.players.values():
-        if not player.alive:
-            continue
+    max_x = room.width - PLAYER_RADIUS
+    for player in players:
         if player.input_x < -0.2:
             direction = -1.0
         elif player.input_x > 0.2:
@@ -2357,7 +3172,12 @@ def _update_ice(room, dt):
         player.facing_x = direction
         player.facing_y = 1.0
         speed = ICE_STRAFE_SPEED * _player_speed_multiplier(player)
-        player.x = _clamp(player.x + direction * speed * dt, PLAYER_RADIUS, room.width - PLAYER_RADIUS)
+        x = player.x + direction * speed * dt
+        if x >= max_x:
+            x = max_x
+        if x <= PLAYER_RADIUS:
+            x = PLAYER_RADIUS
+        player.x = x
         player.y = player_y
         player.score_accum += dt
         while player.score_accum >= 1.0:
@@ -2365,13 +3185,26 @@ def _update_ice(room, dt):
             player.round_score += ICE_SURVIVE_POINTS
             player.score_accum -= 1.0
 
-    if time.time() < room.ice_buffer_until:
-        room.decorations = []
-    else:
+    if now < room.ice_buffer_until:
         if room.decorations:
-            for deco in room.decorations:
-                deco["y"] -= scroll
-            room.decorations = [deco for deco in room.decorations if deco["y"] > -ICE_TREE_BUFFER]
+            room.decorations = []
+            room.decorations_dirty = True
+        room.deco_grid = {}
+    else:
+        # Trees keep their track y, so scrolling is just the offset; only the
+        # cull walks the list, and only a cull changes what clients hold.
+        room.ice_scroll += scroll
+        cutoff = room.ice_scroll - ICE_TREE_BUFFER
+        decorations = room.decorations
+        kept = 0
+        for deco in decorations:
+            if deco["y"] > cutoff:
+                decorations[kept] = deco
+                kept += 1
+        if kept < len(decorations):
+            del decorations[kept:]
+            room.decorations_dirty = True
+        _prune_ice_deco_grid(room)
         tree_ramp = max(
             1.0,
             min(room.round_duration - ICE_START_BUFFER, ICE_TREE_RAMP_TIME),
@@ -2384,31 +3217,42 @@ def _update_ice(room, dt):
         target_trees = int(base_target * (0.2 + 0.8 * density) * (1.0 + ICE_TREE_RAMP * difficulty))
         target_trees = max(6, min(200, target_trees))
         while len(room.decorations) < target_trees:
-            _spawn_ice_tree(room, room.height + ICE_TREE_BUFFER, room.height + ICE_TREE_BUFFER + room.height)
+            _spawn_ice_tree(
+                room, room.height + ICE_TREE_BUFFER, room.height + ICE_TREE_BUFFER + room.height, players
+            )
 
-    if room.gifts:
-        for gift in room.gifts:
-            gift["y"] -= scroll
-        room.gifts = [gift for gift in room.gifts if gift["y"] > -ICE_TREE_BUFFER]
+    gifts = room.gifts
+    kept = 0
+    for gift in gifts:
+        y = gift["y"] - scroll
+        gift["y"] = y
+        if y > -ICE_TREE_BUFFER:
+            gifts[kept] = gift
+            kept += 1
+    del gifts[kept:]
     target_flags = _ice_flag_target(room)
     while len(room.gifts) < target_flags:
-        _spawn_ice_flag(room, room.height + ICE_TREE_BUFFER, room.height + ICE_TREE_BUFFER + room.height)
+        _spawn_ice_flag(room, room.height + ICE_TREE_BUFFER, room.height + ICE_TREE_BUFFER + room.height, players)
 
+    # Every skier sits on player_y, so flags and hazards can only touch
+    # someone once they are within reach of that row.
+    gift_reach = GIFT_RADIUS + PLAYER_RADIUS
     if room.gifts:
-        remaining_gifts = []
-        for gift in room.gifts:
+        gifts = room.gifts
+        kept = 0
+        for gift in gifts:
             collected = False
-            for player in room.players.values():
-                if not player.alive:
-                    continue
-                if _circle_hit(gift["x"], gift["y"], GIFT_RADIUS, player.x, player.y, PLAYER_RADIUS):
-                    player.score += ICE_FLAG_POINTS
-                    player.round_score += ICE_FLAG_POINTS
-                    collected = True
-                    break
+            if abs(gift["y"] - player_y) <= gift_reach:
+                for player in players:
+                    if _hit_sq(gift["x"], gift["y"], player.x, player.y, GIFT_HIT_SQ):
+                        player.score += ICE_FLAG_POINTS
+                        player.round_score += ICE_FLAG_POINTS
+                        collected = True
+                        break
             if not collected:
-                remaining_gifts.append(gift)
-        room.gifts = remaining_gifts
+                gifts[kept] = gift
+                kept += 1
+        del gifts[kept:]
 
     room.ice_snow_accum += dt
     while room.ice_snow_accum >= ICE_SNOWFLAKE_INTERVAL:
@@ -2420,172 +3264,228 @@ def _update_ice(room, dt):
         _spawn_big_snowball(room)
         room.ice_snowball_accum -= ICE_SNOWBALL_INTERVAL
 
-    hazards = []
-    for hazard in room.hazards:
+    hazards = room.hazards
+    kept = 0
+    width = room.width
+    height = room.height
+    for hazard in hazards:
+        x = hazard["x"]
         if hazard.get("type") == "big_snowball":
-            hazard["x"] += hazard.get("vx", 0.0) * dt
-            hazard["y"] += hazard.get("vy", 0.0) * dt
+            x += hazard.get("vx", 0.0) * dt
+            y = hazard["y"] + hazard.get("vy", 0.0) * dt
+            hazard["x"] = x
+            hazard["y"] = y
             radius = hazard.get("radius", HAZARD_RADIUS)
-            if (
-                hazard["x"] < -radius
-                or hazard["x"] > room.width + radius
-                or hazard["y"] < -radius
-                or hazard["y"] > room.height + radius
-            ):
+            if x < -radius or x > width + radius or y < -radius or y > height + radius:
                 continue
         else:
-            hazard["y"] += hazard.get("vy", 0.0) * dt
-            if hazard["y"] > room.height + 30:
+            y = hazard["y"] + hazard.get("vy", 0.0) * dt
+            hazard["y"] = y
+            if y > height + 30:
                 continue
             radius = HAZARD_RADIUS
         hit = False
-        for player in room.players.values():
-            if not player.alive:
-                continue
-            if _circle_hit(hazard["x"], hazard["y"], radius, player.x, player.y, PLAYER_RADIUS):
-                player.alive = False
-                hit = True
-                break
+        if abs(y - player_y) <= radius + PLAYER_RADIUS:
+            reach_sq = (radius + PLAYER_RADIUS) ** 2
+            for player in players:
+                if not player.alive:
+                    continue
+                if _hit_sq(x, y, player.x, player.y, reach_sq):
+                    _kill_player(room, player)
+                    hit = True
+                    break
         if not hit:
-            hazards.append(hazard)
-    room.hazards = hazards
+            hazards[kept] = hazard
+            kept += 1
+    del hazards[kept:]
 
     if not room.ice_finish_line_spawned and room.round_elapsed >= room.round_duration - ICE_FINISH_LEAD:
         _spawn_ice_finish_line(room)
 
-    for player in room.players.values():
-        if not player.alive:
-            continue
-        for deco in room.decorations:
-            if time.time() < room.ice_buffer_until:
-                break
-            if _circle_hit(player.x, player.y, PLAYER_RADIUS, deco["x"], deco["y"], _tree_radius(deco)):
-                player.alive = False
-                break
-        if not player.alive:
-            continue
+    if now >= room.ice_buffer_until:
+        for player in players:
+            if not player.alive:
+                continue
+            if _trees_hit(room, player.x, player.y, PLAYER_RADIUS):
+                _kill_player(room, player)
 
     _update_projectiles(room, dt)
     _handle_projectiles_on_hazard_monsters(room)
     _update_ice_monsters(room, dt)
-    _handle_monster_collisions(room)
-
-
-def _update_maze(room, dt):
-    now = time.time()
-    _update_projectiles(room, dt)
+    _handle_monster_collisions(room, players=players)
 
-    for player in room.players.values():
-        if not player.alive:
-            continue
-        _move_with_walls(room, player, dt, PLAYER_SPEED)
 
-    remaining_projectiles = []
-    for projectile in room.projectiles:
+def _handle_projectiles_on_maze_monsters(room):
+    # Monsters go in with their shot reach so each projectile reads one cell,
+    # and buckets keep room.monsters order for the first hit.
+    grid = {}
+    reach = PROJECTILE_RADIUS + MAZE_MONSTER_RADIUS
+    for monster in room.monsters:
+        mx = monster.x
+        my = monster.y
+        _grid_insert(grid, monster, mx - reach, my - reach, mx + reach, my + reach)
+    projectiles = room.projectiles
+    players = room.players
+    kept = 0
+    for projectile in projectiles:
         hit = False
-        shooter = room.players.get(projectile["owner"])
-        for monster in room.monsters:
-            if _circle_hit(projectile["x"], projectile["y"], PROJECTILE_RADIUS, monster["x"], monster["y"], 16):
-                monster["hp"] -= 1
+        px = projectile.x
+        py = projectile.y
+        bucket = grid.get((int(px // GRID_CELL_SIZE), int(py // GRID_CELL_SIZE)))
+        for monster in bucket or ():
+            dx = px - monster.x
+            dy = py - monster.y
+            if dx * dx + dy * dy <= MAZE_MONSTER_SHOT_SQ:
+                monster.hp -= 1
+                shooter = players.get(projectile.owner)
                 if shooter:
-                    points = MONSTER_TYPES[monster["type"]]["points"]
+                    points = MONSTER_POINTS[monster.type]
                     shooter.score += points
                     shooter.round_score += points
                 hit = True
                 break
         if not hit:
-            remaining_projectiles.append(projectile)
-    room.projectiles = remaining_projectiles
+            projectiles[kept] = projectile
+            kept += 1
+    if kept == len(projectiles):
+        return
+    del projectiles[kept:]
+    # Only hits lower hp, so the cull can wait for one and compact in place.
+    monsters = room.monsters
+    kept = 0
+    for monster in monsters:
+        if monster.hp > 0:
+            monsters[kept] = monster
+            kept += 1
+    del monsters[kept:]
+
+
+def _update_maze(room, dt, now):
+    _update_projectiles(room, dt)
+    players = _alive_players(room)
 
-    room.monsters = [monster for monster in room.monsters if monster["hp"] > 0]
+    for player in players:
+        _move_with_walls(room, player, dt, PLAYER_SPEED)
+
+    if room.projectiles and room.monsters:
+        _handle_projectiles_on_maze_monsters(room)
 
+    # Players hold still for the rest of the tick, so one grid serves both
+    # the monster contact checks and the fireball pass.
+    _rebuild_player_grid(room, players)
+    uniform = room.rng.uniform
     for monster in room.monsters:
-        target = None
-        best_dist = 1e9
-        for player in room.players.values():
-            if not player.alive:
-                continue
-            dx = player.x - monster["x"]
-            dy = player.y - monster["y"]
-            dist = math.hypot(dx, dy)
-            if dist < best_dist:
-                best_dist = dist
-                target = player
-        if target and best_dist < 320:
-            dx = target.x - monster["x"]
-            dy = target.y - monster["y"]
-            mag = math.hypot(dx, dy) or 1.0
+        target, best_sq = _nearest_player(players, monster.x, monster.y)
+        if target and best_sq < 320 * 320:
+            dx = target.x - monster.x
+            dy = target.y - monster.y
+            # best_sq is already this squared distance; one sqrt normalizes.
+            mag = math.sqrt(best_sq) or 1.0
             dx /= mag
             dy /= mag
-            monster["dirX"] = dx
-            monster["dirY"] = dy
-            monster["x"], monster["y"] = _move_entity(
-                room, monster["x"], monster["y"], dx, dy, monster["speed"], dt, 16
+            monster.dir_x = dx
+            monster.dir_y = dy
+            monster.x, monster.y = _move_entity(
+                room, monster.x, monster.y, dx, dy, monster.speed, dt, MAZE_MONSTER_RADIUS
             )
-            if best_dist < 280 and now - monster["lastShot"] > 1.4:
+            if best_sq < 280 * 280 and now - monster.last_shot > 1.4:
                 _spawn_fireball(room, monster, target.x, target.y)
-                monster["lastShot"] = now
+                monster.last_shot = now
         else:
-            if now > monster["wanderUntil"]:
-                monster["dirX"] = random.uniform(-1, 1)
-                monster["dirY"] = random.uniform(-1, 1)
-                monster["wanderUntil"] = now + random.uniform(1.0, 2.5)
-            monster["x"], monster["y"] = _move_entity(
+            if now > monster.wander_until:
+                monster.dir_x = uniform(-1, 1)
+                monster.dir_y = uniform(-1, 1)
+                monster.wander_until = now + uniform(1.0, 2.5)
+            monster.x, monster.y = _move_entity(
                 room,
-                monster["x"],
-                monster["y"],
-                monster["dirX"],
-                monster["dirY"],
-                monster["speed"] * 0.6,
+                monster.x,
+                monster.y,
+                monster.dir_x,
+                monster.dir_y,
+                monster.speed * 0.6,
                 dt,
-                16,
+                MAZE_MONSTER_RADIUS,
             )
 
-        for player in room.players.values():
+        # A player returned twice is already stamped with last_hit_ts = now.
+        for player in _players_near(room, monster.x, monster.y, MAZE_MONSTER_RADIUS):
             if not player.alive:
                 continue
-            if _circle_hit(monster["x"], monster["y"], 16, player.x, player.y, PLAYER_RADIUS):
+            if _hit_sq(monster.x, monster.y, player.x, player.y, MAZE_MONSTER_HIT_SQ):
                 if now - player.last_hit_ts > 0.8:
                     player.energy = max(0.0, player.energy - FIREBALL_DAMAGE)
                     player.last_hit_ts = now
                     if player.energy <= 0:
-                        player.alive = False
+                        _kill_player(room, player)
 
-    monster_projectiles = []
-    for projectile in room.monster_projectiles:
-        projectile["x"] += projectile["vx"] * dt
-        projectile["y"] += projectile["vy"] * dt
-        projectile["life"] += dt
-        if (
-            projectile["life"] > 3.0
-            or projectile["x"] < -20
-            or projectile["x"] > room.width + 20
-            or projectile["y"] < -20
-            or projectile["y"] > room.height + 20
-        ):
-            continue
-        if any(_rect_collides_circle(wall, projectile["x"], projectile["y"], FIREBALL_RADIUS) for wall in room.walls):
+    monster_projectiles = room.monster_projectiles
+    if not monster_projectiles:
+        return
+    max_x = room.width + 20
+    max_y = room.height + 20
+    radius = FIREBALL_RADIUS
+    cell = GRID_CELL_SIZE
+    # Single-cell wall probe inlined as in _update_projectiles; fireballs are
+    # also within GRID_QUERY_PAD.
+    wall_grid = room.wall_grid
+    if wall_grid:
+        wall_grid = _inflated_wall_grid(room, radius)
+        bx0, by0, bx1, by1 = room.wall_bounds
+        bx0 -= radius
+        by0 -= radius
+        bx1 += radius
+        by1 += radius
+    player_grid = room.player_grid
+    kept = 0
+    # Integrate, cull, wall and player tests fused into one pass per fireball.
+    for projectile in monster_projectiles:
+        x = projectile.x + projectile.vx * dt
+        y = projectile.y + projectile.vy * dt
+        life = projectile.life + dt
+        projectile.x = x
+        projectile.y = y
+        projectile.life = life
+        if life > 3.0 or x < -20 or x > max_x or y < -20 or y > max_y:
             continue
+        if wall_grid and bx0 <= x <= bx1 and by0 <= y <= by1:
+            bucket = wall_grid.get((int(x // cell), int(y // cell)))
+            if bucket:
+                hit = False
+                for x0, y0, x1, y1 in bucket:
+                    if x0 <= x <= x1 and y0 <= y <= y1:
+                        hit = True
+                        break
+                if hit:
+                    continue
         hit = False
-        for player in room.players.values():
+        for player in _grid_query(player_grid, x - radius, y - radius, x + radius, y + radius):
             if not player.alive:
                 continue
-            if _circle_hit(projectile["x"], projectile["y"], FIREBALL_RADIUS, player.x, player.y, PLAYER_RADIUS):
+            dx = x - player.x
+            dy = y - player.y
+            if dx * dx + dy * dy <= FIREBALL_HIT_SQ:
                 player.energy = max(0.0, player.energy - FIREBALL_DAMAGE)
                 if player.energy <= 0:
-                    player.alive = False
+                    _kill_player(room, player)
                 hit = True
                 break
         if not hit:
-            monster_projectiles.append(projectile)
-    room.monster_projectiles = monster_projectiles
+            monster_projectiles[kept] = projectile
+            kept += 1
+    del monster_projectiles[kept:]
 
 
-def _update_light(room, dt):
+def _update_light(room, dt, now):
     _update_projectiles(room, dt)
     _handle_projectiles_on_hazard_monsters(room)
-    for player in room.players.values():
+    # Membership can't change while the room lock is held, so one snapshot
+    # serves every pass below.
+    players = list(room.players.values())
+    for player in players:
         _move_with_walls(room, player, dt, PLAYER_SPEED)
+    # Built from the settled positions for the steal test below;
+    # _handle_light_projectiles rebuilds it from the living players.
+    _rebuild_player_grid(room, players)
 
     light = room.light
     if not light:
@@ -2595,7 +3495,7 @@ def _update_light(room, dt):
     if holder_id and holder_id in room.players:
         holder = room.players[holder_id]
         if not holder.alive:
-            for player in room.players.values():
+            for player in players:
                 player.has_light = False
             light["holder"] = ""
             light["heldFor"] = 0.0
@@ -2607,30 +3507,39 @@ def _update_light(room, dt):
             light["y"] = holder.y
             light["heldFor"] = light.get("heldFor", 0.0) + dt
             if light["heldFor"] >= LIGHT_HOLD_DURATION:
-                for player in room.players.values():
+                for player in players:
                     player.has_light = False
                 light["holder"] = ""
                 light["heldFor"] = 0.0
                 light["x"], light["y"] = _random_light_position(room)
                 holder_id = ""
             if holder_id:
-                for player in room.players.values():
-                    if player.sid == holder_id:
-                        continue
-                    if _circle_hit(player.x, player.y, PLAYER_RADIUS, holder.x, holder.y, PLAYER_RADIUS):
-                        holder.has_light = False
-                        player.has_light = True
-                        light["holder"] = player.sid
-                        light["heldFor"] = 0.0
-                        player.score += 5
-                        player.round_score += 5
-                        holder_id = player.sid
-                        break
+                hx = holder.x
+                hy = holder.y
+                touching = [
+                    player
+                    for player in _players_near(room, hx, hy, PLAYER_RADIUS)
+                    if player is not holder and _hit_sq(player.x, player.y, hx, hy, PLAYER_TOUCH_SQ)
+                ]
+                if len(touching) > 1:
+                    # Grid order isn't join order; the first toucher in the
+                    # room still takes the light.
+                    touching_ids = {id(player) for player in touching}
+                    touching = [player for player in players if id(player) in touching_ids]
+                if touching:
+                    player = touching[0]
+                    holder.has_light = False
+                    player.has_light = True
+                    light["holder"] = player.sid
+                    light["heldFor"] = 0.0
+                    player.score += 5
+                    player.round_score += 5
+                    holder_id = player.sid
     else:
         light["holder"] = ""
         light["heldFor"] = 0.0
-        for player in room.players.values():
-            if _circle_hit(player.x, player.y, PLAYER_RADIUS, light["x"], light["y"], 16):
+        for player in players:
+            if _hit_sq(player.x, player.y, light["x"], light["y"], LIGHT_PICKUP_SQ):
                 light["holder"] = player.sid
                 player.has_light = True
                 light["heldFor"] = 0.0
@@ -2639,100 +3548,202 @@ def _update_light(room, dt):
 
     if holder_id and holder_id in room.players:
         holder = room.players[holder_id]
-        for player in room.players.values():
+        holder_x = holder.x
+        holder_y = holder.y
+        holder_gain = dt * LIGHT_HOLDER_POINTS
+        aura_gain = dt * LIGHT_AURA_POINTS
+        for player in players:
             if not player.alive:
                 continue
-            rate = 0.0
             if player.sid == holder_id:
-                rate = LIGHT_HOLDER_POINTS
-            elif _circle_hit(player.x, player.y, PLAYER_RADIUS, holder.x, holder.y, LIGHT_AURA_RADIUS):
-                rate = LIGHT_AURA_POINTS
-            if rate <= 0:
+                gain = holder_gain
+            else:
+                dx = player.x - holder_x
+                dy = player.y - holder_y
+                if dx * dx + dy * dy > LIGHT_AURA_SQ:
+                    continue
+                gain = aura_gain
+            if gain <= 0:
                 continue
-            player.score_accum += dt * rate
+            player.score_accum += gain
             while player.score_accum >= 1.0:
                 player.score += 1
                 player.round_score += 1
                 player.score_accum -= 1.0
 
-    _handle_light_projectiles(room)
+    _handle_light_projectiles(room, players)
     _update_roaming_monsters(room, dt)
-    _handle_monster_collisions(room)
+    _handle_monster_collisions(room, players=players)
 
 
-def _update_bonus(room, dt):
+def _update_bonus(room, dt, now):
+    center_x = room.width / 2
+    center_y = room.height / 2
     for player in room.players.values():
-        player.x = room.width / 2
-        player.y = room.height / 2
+        player.x = center_x
+        player.y = center_y
 
     _update_roaming_monsters(room, dt)
     _handle_monster_collisions(room)
 
 
+ROUND_UPDATERS = {
+    "survival": _update_survival,
+    "snowball": _update_snowball,
+    "hunt": _update_hunt,
+    "thin_ice": _update_thin_ice,
+    "ice": _update_ice,
+    "maze": _update_maze,
+    "light": _update_light,
+    "trails": _update_trails,
+    "hill": _update_hill,
+    "bonus": _update_bonus,
+}
+
+
+def _step_room(room, dt, now):
+    end_payload = None
+    end_finished = False
+    room.tick += 1
+    if room.status in IDLE_STATUSES and room.clamped_size != (room.width, room.height):
+        _clamp_idle_players(room)
+    if _room_idle(room):
+        # Nothing to simulate; the emit path in _world_loop still sends
+        # keyframes and drops repeats.
+        pass
+    elif room.status in {"lobby", "between_rounds"}:
+        _update_ai(room, now)
+        _update_lobby(room, dt, now)
+        _update_projectiles(room, dt)
+        _remove_projectiles_on_player_hit(room)
+    elif room.status == "in_round":
+        _update_ai(room, now)
+        room.round_elapsed += dt
+        updater = ROUND_UPDATERS.get(room.round_type)
+        if updater:
+            updater(room, dt, now)
+        if room.players and room.alive_count <= 0:
+            end_finished, end_payload = _finish_round(room)
+        elif room.round_type == "snowball":
+            alive_teams = {player.team for player in room.players.values() if player.alive}
+            if len(alive_teams) == 1:
+                end_finished, end_payload = _finish_round(room)
+    return end_finished, end_payload
+
+
+def _tick_room(room, steps, now):
+    # Steps one room under its lock and returns what _emit_room_tick needs,
+    # so all socket I/O happens after every room has been simulated.
+    with room.lock:
+        for _ in range(steps):
+            end_finished, end_payload = _step_room(room, WORLD_TICK_RATE, now)
+            if end_payload:
+                break
+
+        snapshot = None
+        if end_payload or len(room.players) <= WORLD_EMIT_SYNC_PLAYERS or now >= room.next_world_emit_ts:
+            room.next_world_emit_ts = now + WORLD_EMIT_INTERVAL
+            # An idle room whose key is unchanged would rebuild and re-encode
+            # the same frame only for the dedupe to drop it, so skip straight
+            # to the next keyframe.
+            idle_key = None
+            if not end_payload and _room_idle(room):
+                idle_key = _idle_world_key(room)
+            if (
+                idle_key is not None
+                and idle_key == room.idle_world_key
+                and (room.world_seq + 1) % WORLD_KEYFRAME_PAYLOADS != 0
+            ):
+                room.world_seq += 1
+            else:
+                snapshot = _world_snapshot(room)
+            room.idle_world_key = idle_key
+        announcements = list(room.announcements)
+        room.announcements = []
+    return room, snapshot, announcements, end_finished, end_payload
+
+
 def _world_loop():
-    tick_rate = 1.0 / 60.0
+    monotonic = time.monotonic
+    wall_time = time.time
+    sleep = socketio.sleep
+    list_rooms = state.list_rooms
+    next_tick = monotonic()
     while True:
-        socketio.sleep(tick_rate)
-        rooms = state.list_rooms()
-        now = time.time()
-        for room in rooms:
-            end_payload = None
-            end_finished = False
-            with room.lock:
-                dt = now - room.last_update_ts
-                if dt <= 0:
-                    continue
-                if dt > 0.2:
-                    dt = 0.2
-                room.last_update_ts = now
-                room.tick += 1
-                _update_ai(room, now)
-
-                if room.status in {"lobby", "between_rounds"}:
-                    _update_lobby(room, dt)
-                    _update_projectiles(room, dt)
-                    _remove_projectiles_on_player_hit(room)
-                elif room.status == "in_round":
-                    room.round_elapsed += dt
-                    if room.round_type == "survival":
-                        _update_survival(room, dt)
-                    elif room.round_type == "snowball":
-                        _update_snowball(room, dt)
-                    elif room.round_type == "hunt":
-                        _update_hunt(room, dt)
-                    elif room.round_type == "thin_ice":
-                        _update_thin_ice(room, dt)
-                    elif room.round_type == "ice":
-                        _update_ice(room, dt)
-                    elif room.round_type == "maze":
-                        _update_maze(room, dt)
-                    elif room.round_type == "light":
-                        _update_light(room, dt)
-                    elif room.round_type == "trails":
-                        _update_trails(room, dt)
-                    elif room.round_type == "hill":
-                        _update_hill(room, dt)
-                    elif room.round_type == "bonus":
-                        _update_bonus(room, dt)
-                    if room.players and not any(player.alive for player in room.players.values()):
-                        end_finished, end_payload = _finish_round(room)
-                    elif room.round_type == "snowball":
-                        alive_teams = {player.team for player in room.players.values() if player.alive}
-                        if len(alive_teams) == 1:
-                            end_finished, end_payload = _finish_round(room)
-
-                payload = _world_payload(room)
-                announcements = list(room.announcements)
-                room.announcements = []
-            socketio.emit("world_state", payload, to=room.code)
-            if announcements:
-                for announcement in announcements:
-                    socketio.emit("announcement", announcement, to=room.code)
-            if end_payload:
-                if end_finished:
-                    socketio.emit("game_over", end_payload, to=room.code)
-                else:
-                    socketio.emit("round_ended", end_payload, to=room.code)
+        # Sleep until the next fixed deadline so tick cost doesn't stretch the
+        # period; when behind, still yield so socket I/O isn't starved.
+        next_tick += WORLD_TICK_RATE
+        delay = next_tick - monotonic()
+        if delay > 0:
+            sleep(delay)
+        else:
+            sleep(0)
+        # Rooms advance in fixed WORLD_TICK_RATE steps. A late wake-up runs up
+        # to WORLD_MAX_CATCHUP_STEPS steps this pass and the rest on following
+        # passes; a backlog past WORLD_LOOP_MAX_LAG is dropped instead.
+        tick_ts = monotonic()
+        if tick_ts - next_tick > WORLD_LOOP_MAX_LAG:
+            next_tick = tick_ts
+        steps = 1
+        while steps < WORLD_MAX_CATCHUP_STEPS and next_tick + WORLD_TICK_RATE <= tick_ts:
+            next_tick += WORLD_TICK_RATE
+            steps += 1
+        rooms = list_rooms()
+        # now stays wall-clock because timestamps such as dashReadyAt and
+        # roundEndsAt are compared against the client's clock.
+        now = wall_time()
+        outbox = [_tick_room(room, steps, now) for room in rooms]
+        # Simulate every room before any socket I/O; emits can yield to other
+        # greenlets, which would otherwise push later rooms past the deadline.
+        for index, entry in enumerate(outbox, 1):
+            _emit_room_tick(*entry)
+            if index % WORLD_EMIT_YIELD_ROOMS == 0:
+                sleep(0)
+
+
+# Built once rather than per frame; only the world loop encodes with it.
+_world_packer = msgpack.Packer() if msgpack else None
+
+
+def _encode_world_frame(payload):
+    # world_state is float-heavy, so encode it once into a binary frame
+    # (MessagePack, else JSON bytes) that the room broadcast reuses for every
+    # client; other events stay JSON.
+    if _world_packer:
+        return _world_packer.pack(payload)
+    if orjson:
+        return orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(payload, separators=(",", ":")).encode()
+
+
+def _emit_room_tick(room, snapshot, announcements, end_finished, end_payload):
+    if snapshot:
+        payload = _expand_world_snapshot(snapshot)
+        if announcements:
+            # Ride along in this tick's world_state frame rather than sending
+            # a frame per announcement.
+            payload["announcements"] = announcements
+            announcements = None
+        frame = _encode_world_frame(payload)
+        # Idle rooms (lobby, everyone afk) produce the same frame tick after
+        # tick; only resend those as periodic keyframes. The snapshot shares
+        # the room's entity lists, so compare encoded bytes, not dicts.
+        if (
+            end_payload
+            or "announcements" in payload
+            or room.world_seq % WORLD_KEYFRAME_PAYLOADS == 0
+            or frame != room.last_world_frame
+        ):
+            room.last_world_frame = frame
+            socketio.emit("world_state", frame, to=room.code)
+    if announcements:
+        for announcement in announcements:
+            socketio.emit("announcement", announcement, to=room.code)
+    if end_payload:
+        if end_finished:
+            socketio.emit("game_over", end_payload, to=room.code)
+        else:
+            socketio.emit("round_ended", end_payload, to=room.code)
 
 
 def _ensure_world_loop():
@@ -2756,6 +3767,7 @@ def _finish_round(room):
             holder.round_score += 10
     room.round_ends_at = 0.0
     room.task_running = False
+    room.room_payload = None
     if room.current_round >= room.max_rounds:
         room.status = "finished"
         finished = True
@@ -2763,10 +3775,17 @@ def _finish_round(room):
         room.status = "between_rounds"
     if finished and room.players:
         max_score = max(player.score for player in room.players.values())
-        winners = [player for player in room.players.values() if player.score == max_score]
-        for winner in winners:
-            if winner.account_id:
-                winner.crowns = add_crowns(winner.account_id, CROWNS_PER_WIN)
+        winners = [
+            player
+            for player in room.players.values()
+            if player.score == max_score and player.account_id
+        ]
+        if winners:
+            balances = add_crowns_many([winner.account_id for winner in winners], CROWNS_PER_WIN)
+            for winner in winners:
+                # A missing account matched no row, so nothing was credited.
+                if winner.account_id in balances:
+                    winner.crowns = balances[winner.account_id]
     payload = _room_payload(room)
     return finished, payload
 
@@ -2781,9 +3800,10 @@ def _run_round_timer(room_code, round_number):
                 room.task_running = False
                 return
             end_at = room.round_ends_at
-        if time.time() >= end_at:
+        remaining = end_at - time.time()
+        if remaining <= 0:
             break
-        socketio.sleep(0.2)
+        socketio.sleep(min(remaining, 0.2))
 
     room = state.get_room(room_code)
     if not room:
@@ -2811,11 +3831,13 @@ def handle_create_room(data):
     if player and token:
         account_id = account_from_token(token)
         if account_id:
-            _apply_store_profile(player, account_id)
+            _apply_store_profile(room, player, account_id)
             add_account_name(account_id, player.name)
     join_room(room.code)
-    emit("room_joined", {"room": state.serialize_room(room), "youId": request.sid})
-    socketio.emit("room_update", _room_payload(room), to=room.code)
+    room.static_dirty = True
+    room_payload = _room_payload(room)
+    emit("room_joined", {"room": room_payload["room"], "youId": request.sid})
+    socketio.emit("room_update", room_payload, to=room.code)
 
 
 @socketio.on("join_room")
@@ -2837,11 +3859,13 @@ def handle_join_room(data):
     if player and token:
         account_id = account_from_token(token)
         if account_id:
-            _apply_store_profile(player, account_id)
+            _apply_store_profile(room, player, account_id)
             add_account_name(account_id, player.name)
     join_room(code)
-    emit("room_joined", {"room": state.serialize_room(room), "youId": request.sid})
-    socketio.emit("room_update", _room_payload(room), to=code)
+    room.static_dirty = True
+    room_payload = _room_payload(room)
+    emit("room_joined", {"room": room_payload["room"], "youId": request.sid})
+    socketio.emit("room_update", room_payload, to=code)
 
 
 @socketio.on("leave_room")
@@ -2919,6 +3943,8 @@ def handle_buy_item(data):
         if player:
             player.crowns = new_crowns
             player.items.add(item_id)
+            player.speed_scale = None
+            room.room_payload = None
     emit("store_data", _store_payload(account_id))
 
 
@@ -3008,18 +4034,20 @@ def handle_start_game(_data=None):
                 player.ai_dir_x = 0.0
                 player.ai_dir_y = 0.0
                 player.ai_idle_until = 0.0
+        room.alive_count = len(room.players)
+        room.room_payload = None
         room.status = "between_rounds"
         room.current_round = 0
         room.round_type = "lobby"
         order = list(ROUND_SEQUENCE)
-        if random.random() < BONUS_CHANCE:
+        if room.rng.random() < BONUS_CHANCE:
             order.append("bonus")
         if "thin_ice" in order:
             order = [round_name for round_name in order if round_name != "thin_ice"]
-            random.shuffle(order)
+            room.rng.shuffle(order)
             order.insert(0, "thin_ice")
         else:
-            random.shuffle(order)
+            room.rng.shuffle(order)
         room.round_order = order
         room.max_rounds = len(order)
         room.width = BASE_WIDTH
@@ -3050,15 +4078,16 @@ def handle_start_round(_data=None):
             emit("server_error", {"message": "Round already running"})
             return
         room.current_round += 1
-        order = room.round_order or list(ROUND_SEQUENCE)
+        order = room.round_order or ROUND_SEQUENCE
         if room.current_round > len(order):
             emit("server_error", {"message": "Round cannot start now"})
             return
         round_type = order[room.current_round - 1]
         room.round_duration = ROUND_DURATIONS.get(round_type, 45)
-        _setup_round(room, round_type)
+        now = time.time()
+        _setup_round(room, round_type, now)
         room.status = "in_round"
-        room.round_ends_at = time.time() + room.round_duration
+        room.round_ends_at = now + room.round_duration
         room.task_running = True
         payload = _room_payload(room)
         round_number = room.current_round
@@ -3081,6 +4110,7 @@ def handle_collect(_data=None):
 def handle_request_state(_data=None):
     room = state.get_room_by_player(request.sid)
     if room:
+        room.static_dirty = True
         emit("room_update", _room_payload(room))
 
 
@@ -2,14 +2,17 @@ import random
 import string
 import threading
 import time
+from collections import deque
 from dataclasses import dataclass, field
 from typing import Optional, Tuple
 
 MAX_PLAYERS = 16
 ROOM_WIDTH = 960
 ROOM_HEIGHT = 540
+ROOM_CODE_LETTERS = tuple(string.ascii_uppercase)
+ROOM_CODE_LENGTH = 4
 
-PLAYER_COLORS = [
+PLAYER_COLORS = (
     "red",
     "orange",
     "yellow",
@@ -26,7 +29,11 @@ PLAYER_COLORS = [
     "gray",
     "black",
     "white",
-]
+)
+PLAYER_COLORS_SET = frozenset(PLAYER_COLORS)
+HOLLY_COLOR = "black"
+# Fallback order when Holly claims her colour from another player.
+_COLORS_WITHOUT_HOLLY = tuple(color for color in PLAYER_COLORS if color != HOLLY_COLOR)
 
 
 def _is_holly(name):
@@ -34,14 +41,13 @@ def _is_holly(name):
 
 
 def _generate_room_code(existing_codes):
-    letters = string.ascii_uppercase
     while True:
-        code = "".join(random.choice(letters) for _ in range(4))
+        code = "".join(random.choices(ROOM_CODE_LETTERS, k=ROOM_CODE_LENGTH))
         if code not in existing_codes:
             return code
 
 
-@dataclass
+@dataclass(slots=True)
 class PlayerState:
     sid: str
     name: str
@@ -77,16 +83,92 @@ class PlayerState:
     ai_dir_x: float = 0.0
     ai_dir_y: float = 0.0
     ai_idle_until: float = 0.0
+    ai_retarget_ts: float = 0.0
+    ai_target_sid: str = ""
+    ai_target_monster: Optional[int] = None
     dash_ready_ts: float = 0.0
     stun_until: float = 0.0
     thin_ice_last_key: Optional[Tuple[int, int]] = None
+    # Cached _player_speed_multiplier; reset to None when items change.
+    speed_scale: Optional[float] = None
+    # Cached id/name/color/team slice of the world payload; reset to None
+    # whenever one of those fields changes.
+    payload_static: Optional[dict] = None
+    # World payload dict for this player, rebuilt with payload_static and
+    # refilled in place every tick.
+    payload_row: Optional[dict] = None
+
+
+@dataclass(slots=True)
+class Monster:
+    # One record for roaming hazards, ice skaters, the snowball boss and
+    # hunt/maze monsters; a kind leaves the fields it doesn't use at their
+    # defaults. Packed for the wire by _pack_monsters.
+    id: int
+    type: str
+    sprite: str
+    x: float
+    y: float
+    vx: float = 0.0
+    vy: float = 0.0
+    radius: float = 16
+    hp: int = 1
+    speed: float = 0.0
+    dir_x: float = 0.0
+    dir_y: float = 0.0
+    wander_until: float = 0.0
+    last_shot: float = 0.0
+    last_burst: float = 0.0
+
+
+@dataclass
+class MonsterProjectile:
+    # Slotted so the maze fireball loop reads plain attributes instead of
+    # dict keys; never sent as-is, see _pack_monster_projectiles.
+    __slots__ = ("id", "x", "y", "vx", "vy", "life")
+    id: int
+    x: float
+    y: float
+    vx: float
+    vy: float
+    life: float
+
+
+@dataclass
+class Projectile:
+    # Player and boss snowballs; packed by _pack_projectiles like the
+    # fireballs above.
+    __slots__ = ("id", "x", "y", "vx", "vy", "color", "owner", "life")
+    id: int
+    x: float
+    y: float
+    vx: float
+    vy: float
+    color: str
+    owner: str
+    life: float
 
 
 @dataclass
+class TrailTile:
+    # Trail rounds can paint thousands of tiles; slots keep each one small.
+    # Every tile is TRAIL_TILE_SIZE across, so the size is not stored.
+    __slots__ = ("x", "y", "color", "owner")
+    x: float
+    y: float
+    color: str
+    owner: str
+
+
+@dataclass(slots=True)
 class RoomState:
     code: str
     host_sid: str
     players: dict = field(default_factory=dict)
+    # Players per colour and the number named Holly, kept in step with
+    # players so colour checks don't rescan the room.
+    color_counts: dict = field(default_factory=dict)
+    holly_count: int = 0
     status: str = "lobby"
     current_round: int = 0
     round_duration: int = 20
@@ -95,6 +177,8 @@ class RoomState:
     round_ends_at: float = 0.0
     task_running: bool = False
     lock: threading.Lock = field(default_factory=threading.Lock)
+    # Per-room generator so spawns and bot decisions don't share global state.
+    rng: random.Random = field(default_factory=random.Random)
     width: int = ROOM_WIDTH
     height: int = ROOM_HEIGHT
     round_type: str = "lobby"
@@ -105,13 +189,33 @@ class RoomState:
     hazards: list = field(default_factory=list)
     gifts: list = field(default_factory=list)
     walls: list = field(default_factory=list)
+    wall_grid: dict = field(default_factory=dict)
+    wall_bounds: tuple = ()
+    # wall_grid with every box already grown by a probe radius, per radius.
+    wall_grids_inflated: dict = field(default_factory=dict)
+    player_grid: dict = field(default_factory=dict)
+    deco_grid: dict = field(default_factory=dict)
     light: dict = field(default_factory=dict)
     hill: dict = field(default_factory=dict)
-    trails: list = field(default_factory=list)
+    trails: deque = field(default_factory=deque)
     trail_map: dict = field(default_factory=dict)
+    trail_cells: list = field(default_factory=list)
+    trail_grid_w: int = 0
     trails_dirty: list = field(default_factory=list)
-    last_update_ts: float = field(default_factory=time.time)
+    # Pixel x, y pairs of tiles evicted since the last snapshot.
+    trails_removed: list = field(default_factory=list)
     tick: int = 0
+    world_seq: int = 0
+    next_world_emit_ts: float = 0.0
+    static_dirty: bool = True
+    decorations_dirty: bool = False
+    alive_count: int = 0
+    room_payload: Optional[dict] = None
+    room_payload_tick: int = -1
+    last_world_frame: Optional[bytes] = None
+    idle_world_key: Optional[tuple] = None
+    # (width, height) players were last clamped to while the room sat idle.
+    clamped_size: tuple = ()
     hazard_accum: float = 0.0
     gift_accum: float = 0.0
     hill_snow_accum: float = 0.0
@@ -129,6 +233,9 @@ class RoomState:
     round_elapsed: float = 0.0
     ice_finish_line_spawned: bool = False
     ice_buffer_until: float = 0.0
+    ice_scroll: float = 0.0
+    ice_grid_row: int = 0
+    snowball_boss: Optional[Monster] = None
     snowball_boss_active: bool = False
     snowball_boss_hp: int = 0
     snowball_boss_max_hp: int = 0
@@ -139,31 +246,67 @@ class RoomState:
 
 class GameState:
     def __init__(self):
+        # self.lock only guards membership changes. Readers use the sid index
+        # and the rooms tuple, which are replaced or updated in single
+        # assignments under that lock, so lookups never wait on it.
         self.rooms = {}
         self.lock = threading.Lock()
+        self._rooms_snapshot = ()
+        self._sid_rooms = {}
+
+    def _add_member(self, room, player):
+        room.players[player.sid] = player
+        room.color_counts[player.color] = room.color_counts.get(player.color, 0) + 1
+        if _is_holly(player.name):
+            room.holly_count += 1
+        room.alive_count += 1
+        room.room_payload = None
+
+    def _pop_member(self, room, sid):
+        player = room.players.pop(sid)
+        self._release_color(room, player.color)
+        if _is_holly(player.name):
+            room.holly_count -= 1
+        if player.alive:
+            room.alive_count -= 1
+        room.room_payload = None
+        return player
+
+    def _release_color(self, room, color):
+        count = room.color_counts.get(color, 0) - 1
+        if count > 0:
+            room.color_counts[color] = count
+        else:
+            room.color_counts.pop(color, None)
 
-    def _pick_available_color(self, room, exclude=None):
-        used = {player.color for player in room.players.values()}
-        for color in PLAYER_COLORS:
-            if exclude and color == exclude:
-                continue
+    def _recolor(self, room, player, color):
+        self._release_color(room, player.color)
+        room.color_counts[color] = room.color_counts.get(color, 0) + 1
+        player.color = color
+        player.payload_static = None
+
+    def _pick_available_color(self, room, exclude_holly=False):
+        used = room.color_counts
+        for color in _COLORS_WITHOUT_HOLLY if exclude_holly else PLAYER_COLORS:
             if color not in used:
                 return color
         return ""
 
     def _reserve_black_for_holly(self, room, holly_sid):
+        if HOLLY_COLOR not in room.color_counts:
+            return HOLLY_COLOR
         taken_by = next(
-            (player for player in room.players.values() if player.color == "black"),
+            (player for player in room.players.values() if player.color == HOLLY_COLOR),
             None,
         )
         if taken_by and taken_by.sid != holly_sid:
-            fallback = self._pick_available_color(room, exclude="black")
+            fallback = self._pick_available_color(room, exclude_holly=True)
             if fallback:
-                taken_by.color = fallback
-        return "black"
+                self._recolor(room, taken_by, fallback)
+        return HOLLY_COLOR
 
     def _color_taken(self, room, color):
-        return any(player.color == color for player in room.players.values())
+        return color in room.color_counts
 
     def _spawn_position(self, room, index=0):
         margin = 40
@@ -173,18 +316,20 @@ class GameState:
 
     def create_room(self, name, sid, color):
         with self.lock:
-            code = _generate_room_code(self.rooms.keys())
+            code = _generate_room_code(self.rooms)
             room = RoomState(code=code, host_sid=sid)
             if _is_holly(name):
-                chosen = "black"
+                chosen = HOLLY_COLOR
             else:
-                chosen = color if color in PLAYER_COLORS else ""
+                chosen = color if color in PLAYER_COLORS_SET else ""
             if not chosen:
                 chosen = self._pick_available_color(room)
             player = PlayerState(sid=sid, name=name, color=chosen)
             player.x, player.y = self._spawn_position(room, 0)
-            room.players[sid] = player
+            self._add_member(room, player)
             self.rooms[code] = room
+            self._rooms_snapshot = tuple(self.rooms.values())
+            self._sid_rooms[sid] = room
             return room
 
     def join_room(self, code, name, sid, color):
@@ -199,13 +344,12 @@ class GameState:
             if _is_holly(name):
                 chosen = self._reserve_black_for_holly(room, sid)
             else:
-                holly_active = any(_is_holly(player.name) for player in room.players.values())
-                if color == "black" and holly_active:
+                if color == HOLLY_COLOR and room.holly_count:
                     chosen = ""
                 else:
                     chosen = (
                         color
-                        if color in PLAYER_COLORS and not self._color_taken(room, color)
+                        if color in PLAYER_COLORS_SET and not self._color_taken(room, color)
                         else ""
                     )
                 if not chosen:
@@ -214,7 +358,8 @@ class GameState:
                 return None, "No colors available"
             player = PlayerState(sid=sid, name=name, color=chosen)
             player.x, player.y = self._spawn_position(room, len(room.players))
-            room.players[sid] = player
+            self._add_member(room, player)
+            self._sid_rooms[sid] = room
             return room, None
 
     def add_bot(self, room, name=None):
@@ -230,7 +375,9 @@ class GameState:
         sid = f"ai-{room.code}-{int(time.time() * 1000)}-{random.randint(1000, 9999)}"
         player = PlayerState(sid=sid, name=bot_name, color=chosen, ready=True, is_bot=True)
         player.x, player.y = self._spawn_position(room, len(room.players))
-        room.players[sid] = player
+        self._add_member(room, player)
+        with self.lock:
+            self._sid_rooms[sid] = room
         return room, None
 
     def remove_bot(self, room):
@@ -240,66 +387,64 @@ class GameState:
         if not bot_ids:
             return None, "No AI players to remove"
         remove_id = bot_ids[-1]
-        del room.players[remove_id]
+        self._pop_member(room, remove_id)
+        with self.lock:
+            self._sid_rooms.pop(remove_id, None)
         return room, None
 
     def get_room(self, code):
-        with self.lock:
-            return self.rooms.get(code)
+        return self.rooms.get(code)
 
     def get_room_by_player(self, sid):
-        with self.lock:
-            for room in self.rooms.values():
-                if sid in room.players:
-                    return room
-            return None
+        return self._sid_rooms.get(sid)
 
     def list_rooms(self):
-        with self.lock:
-            return list(self.rooms.values())
+        return self._rooms_snapshot
 
     def remove_player(self, sid):
         with self.lock:
-            for code, room in list(self.rooms.items()):
-                if sid in room.players:
-                    del room.players[sid]
-                    if room.host_sid == sid:
-                        next_host = ""
-                        for candidate in room.players.values():
-                            if not candidate.is_bot:
-                                next_host = candidate.sid
-                                break
-                        if not next_host and room.players:
-                            next_host = next(iter(room.players))
-                        room.host_sid = next_host
-                    if not room.players:
-                        del self.rooms[code]
-                        return None
-                    return room
-            return None
+            room = self._sid_rooms.pop(sid, None)
+            if room is None or sid not in room.players:
+                return None
+            self._pop_member(room, sid)
+            if room.host_sid == sid:
+                next_host = ""
+                for candidate in room.players.values():
+                    if not candidate.is_bot:
+                        next_host = candidate.sid
+                        break
+                if not next_host and room.players:
+                    next_host = next(iter(room.players))
+                room.host_sid = next_host
+            if not room.players:
+                del self.rooms[room.code]
+                self._rooms_snapshot = tuple(self.rooms.values())
+                return None
+            return room
 
     def serialize_room(self, room):
-        players = []
-        for player in room.players.values():
-            players.append(
-                {
-                    "id": player.sid,
-                    "name": player.name,
-                    "color": player.color,
-                    "x": player.x,
-                    "y": player.y,
-                    "score": player.score,
-                    "roundScore": player.round_score,
-                    "ready": player.ready,
-                    "team": player.team,
-                    "alive": player.alive,
-                    "ringsLeft": player.rings_left,
-                    "crowns": player.crowns,
-                    "items": list(player.items),
-                    "isBot": player.is_bot,
-                    "dashReadyAt": player.dash_ready_ts,
-                }
-            )
+        # Only called for room_update events (world ticks use the packed
+        # snapshot), so one comprehension over the players is enough.
+        players = [
+            {
+                "id": player.sid,
+                "name": player.name,
+                "color": player.color,
+                "x": player.x,
+                "y": player.y,
+                "score": player.score,
+                "roundScore": player.round_score,
+                "ready": player.ready,
+                "team": player.team,
+                "alive": player.alive,
+                "ringsLeft": player.rings_left,
+                "crowns": player.crowns,
+                "items": list(player.items),
+                "isBot": player.is_bot,
+                "dashReadyAt": player.dash_ready_ts,
+            }
+            for player in room.players.values()
+        ]
         return {
             "code": room.code,
             "status": room.status,
@@ -328,30 +473,41 @@ class GameState:
                 return room, "Too fast"
             player.last_collect_ts = now
             player.round_score += 1
+            room.room_payload = None
             return room, None
 
     def set_ready(self, sid, ready):
+        # Two plain stores, like set_input, so no room lock is needed.
         room = self.get_room_by_player(sid)
         if not room:
             return None
-        with room.lock:
-            player = room.players.get(sid)
-            if player:
-                player.ready = ready
+        player = room.players.get(sid)
+        if player:
+            player.ready = ready
+            room.room_payload = None
         return room
 
     def set_input(self, sid, input_x, input_y):
+        # Inputs arrive faster than the world ticks and only the latest one
+        # matters, so this overwrites the player's fields without the room
+        # lock; the tick reads whichever input landed last.
         room = self.get_room_by_player(sid)
         if not room:
             return None
-        with room.lock:
-            player = room.players.get(sid)
-            if player:
-                player.input_x = max(-1.0, min(1.0, float(input_x)))
-                player.input_y = max(-1.0, min(1.0, float(input_y)))
-                if abs(player.input_x) > 0.1 or abs(player.input_y) > 0.1:
-                    player.facing_x = player.input_x
-                    player.facing_y = player.input_y
+        player = room.players.get(sid)
+        if player:
+            # Chained comparisons skip the max/min/abs calls; NaN still clamps to 1.0.
+            input_x = float(input_x)
+            if not -1.0 <= input_x <= 1.0:
+                input_x = -1.0 if input_x < 0 else 1.0
+            input_y = float(input_y)
+            if not -1.0 <= input_y <= 1.0:
+                input_y = -1.0 if input_y < 0 else 1.0
+            player.input_x = input_x
+            player.input_y = input_y
+            if not (-0.1 <= input_x <= 0.1 and -0.1 <= input_y <= 0.1):
+                player.facing_x = input_x
+                player.facing_y = input_y
         return room
 
     def set_color(self, sid, color):
@@ -360,18 +516,19 @@ class GameState:
             return None, "Room not found"
         if room.status != "lobby":
             return room, "Game already started"
-        if color not in PLAYER_COLORS:
+        if color not in PLAYER_COLORS_SET:
             return room, "Pick a valid color"
         with room.lock:
             player = room.players.get(sid)
             if player:
                 if _is_holly(player.name):
-                    player.color = self._reserve_black_for_holly(room, sid)
+                    self._recolor(room, player, self._reserve_black_for_holly(room, sid))
+                    room.room_payload = None
                 else:
-                    holly_active = any(_is_holly(member.name) for member in room.players.values())
-                    if color == "black" and holly_active:
+                    if color == HOLLY_COLOR and room.holly_count:
                         return room, "Black is reserved for Holly"
                     if self._color_taken(room, color):
                         return room, "Color already taken"
-                    player.color = color
+                    self._recolor(room, player, color)
+                    room.room_payload = None
         return room, None
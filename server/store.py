@@ -1,7 +1,11 @@
+import hashlib
 import os
 import secrets
 import sqlite3
+import threading
 import time
+from collections import Counter
+from contextlib import contextmanager
 from typing import List, Optional, Set, Tuple
 
 
@@ -15,11 +19,36 @@ from werkzeug.security import check_password_hash, generate_password_hash
 
 DB_URL = os.getenv("DATABASE_URL", "").strip()
 SQLITE_PATH = os.getenv("SQLITE_PATH", "instance/dev.db")
+# Idle Postgres connections kept for reuse; extras are closed on release.
+PG_POOL_SIZE = 16
+
+# Connections are reused across calls instead of opened per call: SQLite
+# shares one connection behind a lock, Postgres keeps a small idle pool.
+_sqlite_conn = None
+_sqlite_lock = threading.Lock()
+_pg_idle = []
+_pg_lock = threading.Lock()
+# Recent failed logins, keyed by email and a password digest, so a retry
+# burst with the same credentials skips the DB and the password hasher.
+AUTH_FAIL_TTL = 2.0
+_auth_failures = {}
+_auth_lock = threading.Lock()
+# token -> (account_id, cached_at). Tokens never change owner and only
+# delete_session revokes them, so a short-lived cache is safe.
+TOKEN_CACHE_TTL = 60.0
+_token_cache = {}
+_token_lock = threading.Lock()
+# Bumped by every delete_session; a lookup that started before a revocation
+# doesn't cache its (possibly revoked) result.
+_token_epoch = 0
 
 
 def _connect_sqlite():
-    conn = sqlite3.connect(SQLITE_PATH)
+    conn = sqlite3.connect(SQLITE_PATH, check_same_thread=False)
     conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
     return conn
 
 
@@ -34,61 +63,98 @@ def _connect_postgres():
     return conn
 
 
+@contextmanager
+def _sqlite():
+    global _sqlite_conn
+    with _sqlite_lock:
+        if _sqlite_conn is None:
+            _sqlite_conn = _connect_sqlite()
+        try:
+            yield _sqlite_conn
+        except BaseException:
+            _sqlite_conn.rollback()
+            raise
+
+
+@contextmanager
+def _postgres():
+    with _pg_lock:
+        conn = _pg_idle.pop() if _pg_idle else None
+    if conn is None or conn.closed:
+        conn = _connect_postgres()
+    try:
+        yield conn
+        # Ends the implicit transaction a read-only call leaves open; a no-op
+        # after commit.
+        conn.rollback()
+    except BaseException:
+        try:
+            conn.rollback()
+        except Exception:
+            conn.close()
+        raise
+    finally:
+        if not conn.closed:
+            with _pg_lock:
+                if len(_pg_idle) < PG_POOL_SIZE:
+                    _pg_idle.append(conn)
+                    conn = None
+            if conn is not None:
+                conn.close()
+
+
 def _connect():
-    if DB_URL:
-        return _connect_postgres()
-    return _connect_sqlite()
+    return _postgres() if DB_URL else _sqlite()
 
 
 def init_db():
-    conn = _connect()
-    cur = conn.cursor()
-    if DB_URL:
-        cur.execute("CREATE SCHEMA IF NOT EXISTS xmas")
-        cur.execute("SET search_path TO xmas")
-    cur.execute(
-        """
-        CREATE TABLE IF NOT EXISTS accounts (
-            id TEXT PRIMARY KEY,
-            first_name TEXT NOT NULL,
-            last_name TEXT NOT NULL,
-            email TEXT NOT NULL UNIQUE,
-            password_hash TEXT NOT NULL,
-            crowns INTEGER NOT NULL,
-            created_at REAL NOT NULL,
-            updated_at REAL NOT NULL
+    with _connect() as conn:
+        cur = conn.cursor()
+        if DB_URL:
+            cur.execute("CREATE SCHEMA IF NOT EXISTS xmas")
+            cur.execute("SET search_path TO xmas")
+        cur.execute(
+            """
+            CREATE TABLE IF NOT EXISTS accounts (
+                id TEXT PRIMARY KEY,
+                first_name TEXT NOT NULL,
+                last_name TEXT NOT NULL,
+                email TEXT NOT NULL UNIQUE,
+                password_hash TEXT NOT NULL,
+                crowns INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            )
+            """
         )
-        """
-    )
-    cur.execute(
-        """
-        CREATE TABLE IF NOT EXISTS account_items (
-            account_id TEXT NOT NULL,
-            item_id TEXT NOT NULL,
-            PRIMARY KEY (account_id, item_id)
+        cur.execute(
+            """
+            CREATE TABLE IF NOT EXISTS account_items (
+                account_id TEXT NOT NULL,
+                item_id TEXT NOT NULL,
+                PRIMARY KEY (account_id, item_id)
+            )
+            """
         )
-        """
-    )
-    cur.execute(
-        """
-        CREATE TABLE IF NOT EXISTS account_names (
-            account_id TEXT NOT NULL,
-            name TEXT NOT NULL,
-            PRIMARY KEY (account_id, name)
+        cur.execute(
+            """
+            CREATE TABLE IF NOT EXISTS account_names (
+                account_id TEXT NOT NULL,
+                name TEXT NOT NULL,
+                PRIMARY KEY (account_id, name)
+            )
+            """
         )
-        """
-    )
-    cur.execute(
-        """
-        CREATE TABLE IF NOT EXISTS sessions (
-            token TEXT PRIMARY KEY,
-            account_id TEXT NOT NULL,
-            created_at REAL NOT NULL
+        cur.execute(
+            """
+            CREATE TABLE IF NOT EXISTS sessions (
+                token TEXT PRIMARY KEY,
+                account_id TEXT NOT NULL,
+                created_at REAL NOT NULL
+            )
+            """
         )
-        """
-    )
-    conn.commit()
-    conn.close()
+        conn.commit()
 
 
 def _placeholder(query):
@@ -96,125 +162,192 @@ def _placeholder(query):
 
 
 def create_account(first_name, last_name, email, password):
-    conn = _connect()
-    cur = conn.cursor()
     now = time.time()
     account_id = secrets.token_hex(16)
+    # Hash before taking a connection; it is by far the slowest step.
     password_hash = generate_password_hash(password)
-    cur.execute(
-        _placeholder(
-            "INSERT INTO accounts (id, first_name, last_name, email, password_hash, crowns, created_at, updated_at) "
-            "VALUES (%s, %s, %s, %s, %s, %s, %s, %s)"
-        ),
-        (account_id, first_name, last_name, email, password_hash, 0, now, now),
-    )
-    conn.commit()
-    conn.close()
+    with _connect() as conn:
+        cur = conn.cursor()
+        cur.execute(
+            _placeholder(
+                "INSERT INTO accounts (id, first_name, last_name, email, password_hash, crowns, created_at, updated_at) "
+                "VALUES (%s, %s, %s, %s, %s, %s, %s, %s)"
+            ),
+            (account_id, first_name, last_name, email, password_hash, 0, now, now),
+        )
+        conn.commit()
+    with _auth_lock:
+        for key in [key for key in _auth_failures if key[0] == email]:
+            del _auth_failures[key]
     return account_id
 
 
 def auth_account(email, password):
-    conn = _connect()
-    cur = conn.cursor()
-    cur.execute(_placeholder("SELECT id, password_hash FROM accounts WHERE email = %s"), (email,))
-    row = cur.fetchone()
+    key = (email, hashlib.sha256(password.encode()).digest()[:16])
+    now = time.time()
+    with _auth_lock:
+        failed_at = _auth_failures.get(key)
+    if failed_at is not None and now - failed_at < AUTH_FAIL_TTL:
+        return None
+    with _connect() as conn:
+        cur = conn.cursor()
+        cur.execute(_placeholder("SELECT id, password_hash FROM accounts WHERE email = %s"), (email,))
+        row = cur.fetchone()
     if not row or not check_password_hash(row[1], password):
-        conn.close()
+        with _auth_lock:
+            if len(_auth_failures) > 1024:
+                for stale in [k for k, ts in _auth_failures.items() if now - ts >= AUTH_FAIL_TTL]:
+                    del _auth_failures[stale]
+            _auth_failures[key] = now
         return None
-    conn.close()
     return row[0]
 
 
 def create_session(account_id):
     token = secrets.token_hex(24)
-    conn = _connect()
-    cur = conn.cursor()
-    cur.execute(
-        _placeholder("INSERT INTO sessions (token, account_id, created_at) VALUES (%s, %s, %s)"),
-        (token, account_id, time.time()),
-    )
-    conn.commit()
-    conn.close()
-    return token
+    with _connect() as conn:
+        cur = conn.cursor()
+        cur.execute(
+            _placeholder("INSERT INTO sessions (token, account_id, created_at) VALUES (%s, %s, %s)"),
+            (token, account_id, time.time()),
+        )
+        conn.commit()
+        return token
 
 
 def account_from_token(token):
-    conn = _connect()
-    cur = conn.cursor()
-    cur.execute(_placeholder("SELECT account_id FROM sessions WHERE token = %s"), (token,))
-    row = cur.fetchone()
-    conn.close()
-    return row[0] if row else None
+    now = time.time()
+    with _token_lock:
+        cached = _token_cache.get(token)
+        epoch = _token_epoch
+    if cached and now - cached[1] < TOKEN_CACHE_TTL:
+        return cached[0]
+    with _connect() as conn:
+        cur = conn.cursor()
+        cur.execute(_placeholder("SELECT account_id FROM sessions WHERE token = %s"), (token,))
+        row = cur.fetchone()
+    if not row:
+        return None
+    with _token_lock:
+        if epoch != _token_epoch:
+            return row[0]
+        if len(_token_cache) > 4096:
+            for stale in [k for k, entry in _token_cache.items() if now - entry[1] >= TOKEN_CACHE_TTL]:
+                del _token_cache[stale]
+        _token_cache[token] = (row[0], now)
+    return row[0]
 
 
 def get_account(account_id):
-    conn = _connect()
-    cur = conn.cursor()
-    cur.execute(_placeholder("SELECT crowns FROM accounts WHERE id = %s"), (account_id,))
-    row = cur.fetchone()
-    crowns = row[0] if row else 0
-    cur.execute(_placeholder("SELECT item_id FROM account_items WHERE account_id = %s"), (account_id,))
-    items = [r[0] for r in cur.fetchall()]
-    cur.execute(_placeholder("SELECT name FROM account_names WHERE account_id = %s"), (account_id,))
-    names = [r[0] for r in cur.fetchall()]
-    conn.close()
-    return crowns, set(items), names
+    # One round trip: crowns, items and names come back as tagged rows.
+    with _connect() as conn:
+        cur = conn.cursor()
+        cur.execute(
+            _placeholder(
+                "SELECT 0, NULL, crowns FROM accounts WHERE id = %s "
+                "UNION ALL SELECT 1, item_id, NULL FROM account_items WHERE account_id = %s "
+                "UNION ALL SELECT 2, name, NULL FROM account_names WHERE account_id = %s"
+            ),
+            (account_id, account_id, account_id),
+        )
+        rows = cur.fetchall()
+    crowns = 0
+    items = set()
+    names = []
+    for kind, value, amount in rows:
+        if kind == 0:
+            crowns = amount
+        elif kind == 1:
+            items.add(value)
+        else:
+            names.append(value)
+    return crowns, items, names
 
 
 def add_account_name(account_id, name):
-    conn = _connect()
-    cur = conn.cursor()
-    cur.execute(
-        _placeholder("INSERT INTO account_names (account_id, name) VALUES (%s, %s) ON CONFLICT DO NOTHING"),
-        (account_id, name),
-    )
-    conn.commit()
-    conn.close()
+    with _connect() as conn:
+        cur = conn.cursor()
+        cur.execute(
+            _placeholder("INSERT INTO account_names (account_id, name) VALUES (%s, %s) ON CONFLICT DO NOTHING"),
+            (account_id, name),
+        )
+        conn.commit()
 
 
 def add_crowns(account_id, amount):
-    conn = _connect()
-    cur = conn.cursor()
-    cur.execute(_placeholder("SELECT crowns FROM accounts WHERE id = %s"), (account_id,))
-    row = cur.fetchone()
-    crowns = (row[0] if row else 0) + amount
-    cur.execute(
-        _placeholder("UPDATE accounts SET crowns = %s, updated_at = %s WHERE id = %s"),
-        (crowns, time.time(), account_id),
-    )
-    conn.commit()
-    conn.close()
-    return crowns
+    with _connect() as conn:
+        cur = conn.cursor()
+        cur.execute(
+            _placeholder(
+                "UPDATE accounts SET crowns = crowns + %s, updated_at = %s WHERE id = %s RETURNING crowns"
+            ),
+            (amount, time.time(), account_id),
+        )
+        row = cur.fetchone()
+        conn.commit()
+        return row[0] if row else amount
+
+
+def add_crowns_many(account_ids, amount):
+    # One UPDATE per distinct award (normally just one) instead of a round
+    # trip per account; an id listed twice is credited twice.
+    by_award = {}
+    for account_id, count in Counter(account_ids).items():
+        by_award.setdefault(amount * count, []).append(account_id)
+    balances = {}
+    with _connect() as conn:
+        cur = conn.cursor()
+        now = time.time()
+        for award, ids in by_award.items():
+            marks = ", ".join(["%s"] * len(ids))
+            cur.execute(
+                _placeholder(
+                    "UPDATE accounts SET crowns = crowns + %s, updated_at = %s "
+                    f"WHERE id IN ({marks}) RETURNING id, crowns"
+                ),
+                (award, now, *ids),
+            )
+            for account_id, crowns in cur.fetchall():
+                balances[account_id] = crowns
+        conn.commit()
+    return balances
 
 
 def buy_item(account_id, item_id, cost):
-    conn = _connect()
-    cur = conn.cursor()
-    cur.execute(_placeholder("SELECT crowns FROM accounts WHERE id = %s"), (account_id,))
-    row = cur.fetchone()
-    crowns = row[0] if row else 0
-    if crowns < cost:
-        conn.close()
-        return False, crowns
-    cur.execute(
-        _placeholder(
-            "INSERT INTO account_items (account_id, item_id) VALUES (%s, %s) ON CONFLICT DO NOTHING"
-        ),
-        (account_id, item_id),
-    )
-    crowns -= cost
-    cur.execute(
-        _placeholder("UPDATE accounts SET crowns = %s, updated_at = %s WHERE id = %s"),
-        (crowns, time.time(), account_id),
-    )
-    conn.commit()
-    conn.close()
-    return True, crowns
+    # The balance check lives in the UPDATE so two purchases can't both spend
+    # the same crowns.
+    with _connect() as conn:
+        cur = conn.cursor()
+        cur.execute(
+            _placeholder(
+                "UPDATE accounts SET crowns = crowns - %s, updated_at = %s "
+                "WHERE id = %s AND crowns >= %s RETURNING crowns"
+            ),
+            (cost, time.time(), account_id, cost),
+        )
+        row = cur.fetchone()
+        if not row:
+            conn.rollback()
+            cur.execute(_placeholder("SELECT crowns FROM accounts WHERE id = %s"), (account_id,))
+            row = cur.fetchone()
+            return False, row[0] if row else 0
+        cur.execute(
+            _placeholder(
+                "INSERT INTO account_items (account_id, item_id) VALUES (%s, %s) ON CONFLICT DO NOTHING"
+            ),
+            (account_id, item_id),
+        )
+        conn.commit()
+        return True, row[0]
 
 
 def delete_session(token):
-    conn = _connect()
-    cur = conn.cursor()
-    cur.execute(_placeholder("DELETE FROM sessions WHERE token = %s"), (token,))
-    conn.commit()
-    conn.close()
+    global _token_epoch
+    with _connect() as conn:
+        cur = conn.cursor()
+        cur.execute(_placeholder("DELETE FROM sessions WHERE token = %s"), (token,))
+        conn.commit()
+    # Evict only once the DELETE is visible, and retire lookups still in flight.
+    with _token_lock:
+        _token_cache.pop(token, None)
+        _token_epoch += 1